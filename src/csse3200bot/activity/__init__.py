@@ -0,0 +1 @@
+"""Repo activity module."""
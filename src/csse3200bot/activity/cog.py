@@ -0,0 +1,245 @@
+"""Repo activity cog."""
+
+import asyncio
+import datetime as dt
+import logging
+from collections import defaultdict
+from collections.abc import Awaitable, Callable
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+from github.GithubException import GithubException
+
+from csse3200bot import constants
+from csse3200bot.activity.models import ActivityChannelModel, ActivitySource
+from csse3200bot.activity.report import render_digest
+from csse3200bot.activity.service import (
+    claim_digest_channels,
+    delete_items_before,
+    get_activity_channels,
+    get_cursors,
+    get_items_since,
+    release_digest_channels,
+    save_cursor,
+    save_items,
+    set_activity_channel,
+)
+from csse3200bot.activity.utils import fetch_activity
+from csse3200bot.bot import CACHE_SWEEP_INTERVAL, CSSEBot
+from csse3200bot.enums import RateLimitScope
+from csse3200bot.interactions import auto_defer, rate_limit, respond
+from csse3200bot.studio.utils import studio_required
+from csse3200bot.utils import AsyncCache, as_utc
+
+log = logging.getLogger(__name__)
+
+DIGEST_NAMESPACE = "activity.digest"
+
+DIGEST_DAYS = 7
+ITEM_RETENTION = dt.timedelta(days=30)
+DIGEST_POST_INTERVAL = dt.timedelta(days=1)
+
+# Background job intervals (seconds)
+ACTIVITY_REFRESH_INTERVAL = 900
+DIGEST_POST_CHECK_INTERVAL = 3600
+
+
+class ActivityCog(commands.GroupCog, name="activity"):
+    """Repo activity cog."""
+
+    _bot: CSSEBot
+
+    _digest_cache: AsyncCache[str, discord.Embed]  # keyed by repo name
+    _refresh_locks: defaultdict[str, asyncio.Lock]
+
+    def __init__(self, bot: CSSEBot) -> None:
+        """Constructor."""
+        self._bot = bot
+        self._digest_cache = AsyncCache[str, discord.Embed](self._get_digest_wrapper(), ttl=bot.cache_ttl)
+        self._refresh_locks = defaultdict(asyncio.Lock)
+
+    async def cog_load(self) -> None:
+        """Load cog."""
+        await super().cog_load()
+        self._bot.invalidation_bus.subscribe(DIGEST_NAMESPACE, self._digest_cache.remove, self._digest_cache.clear)
+
+        scheduler = self._bot.scheduler
+        scheduler.add_job("activity.refresh", self._refresh_studio_repos, ACTIVITY_REFRESH_INTERVAL)
+        scheduler.add_job("activity.post_digests", self._post_digests, DIGEST_POST_CHECK_INTERVAL)
+        scheduler.add_job("activity.sweep_caches", self._sweep_caches, CACHE_SWEEP_INTERVAL)
+
+    async def cog_unload(self) -> None:
+        """Unload cog."""
+        self._bot.invalidation_bus.unsubscribe(DIGEST_NAMESPACE, self._digest_cache.remove)
+        for job in ("activity.refresh", "activity.post_digests", "activity.sweep_caches"):
+            self._bot.scheduler.remove_job(job)
+        await super().cog_unload()
+
+    def _get_digest_wrapper(self) -> Callable[[str], Awaitable[discord.Embed | None]]:
+        """A wrapper for rendering a repo's digest, fetching its activity first if it hasn't been recently."""
+
+        async def fetch(repo_name: str) -> discord.Embed | None:
+            await self.refresh_repo(repo_name, max_age=dt.timedelta(seconds=ACTIVITY_REFRESH_INTERVAL))
+            since = dt.datetime.now(dt.UTC) - dt.timedelta(days=DIGEST_DAYS)
+            async with self._bot.get_db() as session:
+                items = await get_items_since(session, repo_name, since)
+            return render_digest(repo_name, DIGEST_DAYS, items)
+
+        return fetch
+
+    async def _sweep_caches(self) -> None:
+        self._digest_cache.purge_expired()
+
+    async def refresh_repo(self, repo_name: str, max_age: dt.timedelta | None = None) -> bool:
+        """Fetch the repo's new activity, returning whether any was found.
+
+        Sources polled within `max_age` are skipped.
+        """
+        async with self._refresh_locks[repo_name]:
+            async with self._bot.get_db() as session:
+                cursors = await get_cursors(session, repo_name)
+
+            now = dt.datetime.now(dt.UTC)
+            changed = False
+            for source in ActivitySource:
+                cursor = cursors.get(source)
+                if cursor is not None and max_age is not None and now - as_utc(cursor.polled_at) < max_age:
+                    continue
+
+                since = as_utc(cursor.since) if cursor is not None else now - dt.timedelta(days=DIGEST_DAYS)
+                etag = cursor.etag if cursor is not None else None
+                try:
+                    result = await asyncio.to_thread(
+                        fetch_activity,
+                        self._bot.github_client.requester,
+                        f"{constants.GH_ORG_NAME}/{repo_name}",
+                        source,
+                        since,
+                        etag,
+                    )
+                except GithubException:
+                    log.exception(f"Couldn't fetch {source} of repo '{repo_name}'")
+                    continue
+
+                new_since = max((item["occurred_at"] for item in result["items"]), default=since)
+                async with self._bot.get_db() as session:
+                    changed |= await save_items(session, result["items"]) > 0
+                    # the etag is only good for requests with the same since
+                    await save_cursor(
+                        session, repo_name, source, new_since, result["etag"] if new_since == since else None
+                    )
+
+            if changed:
+                log.info(f"Found new activity in repo '{repo_name}'")
+                async with self._bot.get_db() as session:
+                    await self._bot.invalidation_bus.publish(session, DIGEST_NAMESPACE, repo_name)
+                self._digest_cache.remove(repo_name)
+            return changed
+
+    async def _studio_repos(self) -> dict[discord.Guild, str]:
+        """Repo of each guild this process serves that has a studio."""
+        repos = {}
+        for guild in self._bot.guilds:
+            studio = await self._bot.get_studio(guild)
+            if studio is not None:
+                repos[guild] = studio.repo_name
+        return repos
+
+    async def _refresh_studio_repos(self) -> None:
+        """Fetch the new activity of every studio's repo, and drop items too old to be in a digest."""
+        for repo_name in set((await self._studio_repos()).values()):
+            await self.refresh_repo(repo_name)
+
+        async with self._bot.get_db() as session:
+            await delete_items_before(session, dt.datetime.now(dt.UTC) - ITEM_RETENTION)
+
+    async def _post_digests(self) -> None:
+        """Post the digest to the channels of every guild linked to the studios here, that haven't had one for a day.
+
+        Each repo's digest is rendered once and posted to its studio's guilds at once, including guilds served by
+        other processes. Channels are claimed before posting, so processes serving the same studio don't both post.
+        """
+        studios = {}
+        for guild in self._bot.guilds:
+            studio = await self._bot.get_studio(guild)
+            if studio is not None:
+                studios[studio.studio_id] = studio
+        repos = {link.guild_id: studio.repo_name for studio in studios.values() for link in studio.guild_links}
+        async with self._bot.get_db() as session:
+            channels = await get_activity_channels(session, list(repos))
+
+        now = dt.datetime.now(dt.UTC)
+        due: defaultdict[str, list[ActivityChannelModel]] = defaultdict(list)  # by repo name
+        for activity_channel in channels:
+            if (
+                activity_channel.posted_at is not None
+                and now - as_utc(activity_channel.posted_at) < DIGEST_POST_INTERVAL
+            ):
+                continue
+            due[repos[activity_channel.guild_id]].append(activity_channel)
+
+        for repo_name, repo_channels in due.items():
+            digest = await self._digest_cache.get(repo_name)
+            if digest is None:
+                continue
+            async with self._bot.get_db() as session:
+                claimed = await claim_digest_channels(
+                    session, [channel.guild_id for channel in repo_channels], now, DIGEST_POST_INTERVAL
+                )
+            posted = await self._bot.broadcast(
+                {channel.guild_id: channel.channel_id for channel in claimed}, embed=digest
+            )
+            failed = [channel.guild_id for channel in claimed if channel.guild_id not in posted]
+            if failed:
+                async with self._bot.get_db() as session:
+                    await release_digest_channels(session, failed)
+
+    @app_commands.command(name="digest", description="Recent commits, pull requests and issues in the studio's repo")
+    @rate_limit(1, 5.0, RateLimitScope.guild)
+    @auto_defer()
+    @studio_required
+    async def digest(self, interaction: discord.Interaction) -> None:
+        """Show the activity digest of the studio's repo."""
+        guild = interaction.guild
+        studio = await self._bot.get_studio(guild) if guild is not None else None
+        if studio is None:
+            log.error("This should not occur as caught by 'studio_required' decorator")
+            await respond(interaction, "Studio not fully setup yet", ephemeral=True)
+            return
+
+        digest = await self._digest_cache.get(studio.repo_name)
+        if digest is None:
+            await respond(interaction, f"Unable to get the activity of '{studio.repo_name}'", ephemeral=True)
+            return
+        await respond(interaction, embed=digest)
+
+    @app_commands.command(name="channel", description="Post the activity digest to a channel daily - Staff Only")
+    @app_commands.describe(channel="Channel to post to, leave empty to stop posting")
+    @app_commands.checks.has_permissions(manage_guild=True)
+    @studio_required
+    async def set_channel(self, interaction: discord.Interaction, channel: discord.TextChannel | None = None) -> None:
+        """Set (or unset) the channel the activity digest is posted to."""
+        guild = interaction.guild
+        if guild is None:
+            await respond(interaction, "Must be used in a server.", ephemeral=True)
+            return
+
+        async with self._bot.get_db() as session:
+            await set_activity_channel(session, str(guild.id), str(channel.id) if channel is not None else None)
+
+        if channel is None:
+            await respond(interaction, "The activity digest will no longer be posted.", ephemeral=True)
+            return
+        await respond(interaction, f"The activity digest will be posted to {channel.mention} daily.", ephemeral=True)
+
+    @digest.error
+    async def on_digest_error(self, interaction: discord.Interaction, error: app_commands.AppCommandError) -> None:
+        """On error for digest command."""
+        if isinstance(error, app_commands.CommandOnCooldown):
+            await respond(interaction, str(error), ephemeral=True)
+
+
+async def setup(bot: CSSEBot) -> None:
+    """Extension entry point."""
+    await bot.add_cog(ActivityCog(bot))
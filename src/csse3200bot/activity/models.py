@@ -0,0 +1,69 @@
+"""Repo activity db models."""
+
+import datetime as dt
+
+from sqlalchemy import DateTime as SQLDatetime
+from sqlalchemy import Index, PrimaryKeyConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from csse3200bot.database.base import BaseDBModel
+from csse3200bot.enums import CsseEnum
+
+
+class ActivitySource(CsseEnum):
+    """Github endpoints activity is fetched from."""
+
+    commits = "commits"
+    issues = "issues"  # includes pull requests
+
+
+class ActivityKind(CsseEnum):
+    """Kinds of repo activity."""
+
+    commit = "commit"
+    pull_request = "pull_request"
+    issue = "issue"
+
+
+class ActivityCursorModel(BaseDBModel):
+    """DB Model for how far a repo's activity has been fetched from a source, so refreshes only get new items."""
+
+    __tablename__ = "repo_activity_cursor"
+    __table_args__ = (PrimaryKeyConstraint("repo_name", "source"),)
+
+    repo_name: Mapped[str]
+    source: Mapped[ActivitySource]
+
+    since: Mapped[dt.datetime] = mapped_column(SQLDatetime(timezone=True))  # newest item fetched
+    etag: Mapped[str | None]  # of the last response for `since`, so unchanged sources respond 304
+    polled_at: Mapped[dt.datetime] = mapped_column(SQLDatetime(timezone=True))
+
+
+class ActivityItemModel(BaseDBModel):
+    """DB Model for a commit, pull request or issue in a repo."""
+
+    __tablename__ = "repo_activity_item"
+    __table_args__ = (
+        PrimaryKeyConstraint("repo_name", "kind", "item_id"),
+        Index("ix_repo_activity_item_repo_name_occurred_at", "repo_name", "occurred_at"),
+    )
+
+    repo_name: Mapped[str]
+    kind: Mapped[ActivityKind]
+    item_id: Mapped[str]  # sha of commits, number of issues/pull requests
+
+    title: Mapped[str]
+    author: Mapped[str | None]
+    url: Mapped[str]
+    state: Mapped[str | None]  # open, closed or merged, None for commits
+    occurred_at: Mapped[dt.datetime] = mapped_column(SQLDatetime(timezone=True))  # committed/last updated
+
+
+class ActivityChannelModel(BaseDBModel):
+    """DB Model for the channel a guild's activity digest is posted to."""
+
+    __tablename__ = "repo_activity_channel"
+
+    guild_id: Mapped[str] = mapped_column(primary_key=True)
+    channel_id: Mapped[str]
+    posted_at: Mapped[dt.datetime | None] = mapped_column(SQLDatetime(timezone=True))
@@ -0,0 +1,58 @@
+"""Repo activity digest rendering."""
+
+from collections.abc import Sequence
+
+import discord
+
+from csse3200bot.activity.models import ActivityItemModel, ActivityKind
+from csse3200bot.teams.report import FIELD_VALUE_LIMIT
+
+TITLE_LIMIT = 80
+
+DIGEST_COLOUR = 0x2DA44E
+
+_SECTIONS = {
+    ActivityKind.commit: "📝 Commits",
+    ActivityKind.pull_request: "🔀 Pull Requests",
+    ActivityKind.issue: "🐛 Issues",
+}
+
+
+def _format_item(item: ActivityItemModel) -> str:
+    title = item.title if len(item.title) <= TITLE_LIMIT else item.title[: TITLE_LIMIT - 1] + "…"
+    label = item.item_id[:7] if item.kind is ActivityKind.commit else f"#{item.item_id}"
+    line = f"[`{label}`]({item.url}) {discord.utils.escape_markdown(title)}"
+    if item.state is not None:
+        line += f" ({item.state})"
+    if item.author is not None:
+        line += f" - {discord.utils.escape_markdown(item.author)}"
+    return line
+
+
+def _section(items: Sequence[ActivityItemModel]) -> str:
+    """Items, newest first, cut off with a count of the rest before going over the field limit."""
+    lines: list[str] = []
+    size = 0
+    for i, item in enumerate(items):
+        line = _format_item(item)
+        more = f"…and {len(items) - i} more"
+        if size + len(line) + len(more) + 2 > FIELD_VALUE_LIMIT:
+            lines.append(more)
+            break
+        lines.append(line)
+        size += len(line) + 1
+    return "\n".join(lines)
+
+
+def render_digest(repo_name: str, days: int, items: Sequence[ActivityItemModel]) -> discord.Embed:
+    """Render a repo's recent commits, pull requests and issues, which must be newest first."""
+    embed = discord.Embed(
+        title=f"{repo_name} - last {days} days",
+        description=None if items else "No activity.",
+        color=DIGEST_COLOUR,
+    )
+    for kind, name in _SECTIONS.items():
+        section = [item for item in items if item.kind is kind]
+        if section:
+            embed.add_field(name=f"{name} ({len(section)})", value=_section(section), inline=False)
+    return embed
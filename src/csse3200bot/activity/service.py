@@ -0,0 +1,148 @@
+"""Repo activity services."""
+
+import datetime as dt
+from collections.abc import Sequence
+
+from sqlalchemy import delete, or_, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from csse3200bot.activity.models import (
+    ActivityChannelModel,
+    ActivityCursorModel,
+    ActivityItemModel,
+    ActivitySource,
+)
+from csse3200bot.activity.utils import ActivityItem
+from csse3200bot.utils import as_utc
+
+
+async def get_cursors(session: AsyncSession, repo_name: str) -> dict[ActivitySource, ActivityCursorModel]:
+    """Get the cursors of a repo, by source."""
+    stmt = select(ActivityCursorModel).where(ActivityCursorModel.repo_name == repo_name)
+    result = await session.execute(stmt)
+    return {cursor.source: cursor for cursor in result.scalars().all()}
+
+
+async def save_cursor(
+    session: AsyncSession, repo_name: str, source: ActivitySource, since: dt.datetime, etag: str | None
+) -> None:
+    """Create or update the cursor of a repo's source, as polled now."""
+    polled_at = dt.datetime.now(dt.UTC)
+    existing = await session.get(ActivityCursorModel, (repo_name, source))
+    if existing:
+        existing.since = since
+        existing.etag = etag
+        existing.polled_at = polled_at
+        session.add(existing)
+    else:
+        session.add(
+            ActivityCursorModel(repo_name=repo_name, source=source, since=since, etag=etag, polled_at=polled_at)
+        )
+    await session.commit()
+
+
+async def save_items(session: AsyncSession, items: Sequence[ActivityItem]) -> int:
+    """Create or update items, returning how many were new or changed."""
+    if not items:
+        return 0
+
+    keys = [(item["repo_name"], item["kind"], item["item_id"]) for item in items]
+    stmt = select(ActivityItemModel).where(
+        tuple_(ActivityItemModel.repo_name, ActivityItemModel.kind, ActivityItemModel.item_id).in_(keys)
+    )
+    result = await session.execute(stmt)
+    existing = {(model.repo_name, model.kind, model.item_id): model for model in result.scalars().all()}
+
+    changed = 0
+    for key, item in zip(keys, items, strict=True):
+        model = existing.get(key)
+        if model is None:
+            model = ActivityItemModel(**item)
+            existing[key] = model
+            session.add(model)
+            changed += 1
+        elif (model.title, model.state, as_utc(model.occurred_at)) != (
+            item["title"],
+            item["state"],
+            item["occurred_at"],
+        ):
+            model.title = item["title"]
+            model.state = item["state"]
+            model.occurred_at = item["occurred_at"]
+            changed += 1
+    await session.commit()
+    return changed
+
+
+async def get_items_since(session: AsyncSession, repo_name: str, since: dt.datetime) -> list[ActivityItemModel]:
+    """Get a repo's items that happened since the given time, newest first."""
+    stmt = (
+        select(ActivityItemModel)
+        .where(ActivityItemModel.repo_name == repo_name, ActivityItemModel.occurred_at >= since)
+        .order_by(ActivityItemModel.occurred_at.desc())
+    )
+    result = await session.execute(stmt)
+    return list(result.scalars().all())
+
+
+async def delete_items_before(session: AsyncSession, before: dt.datetime) -> None:
+    """Delete every repo's items that happened before the given time."""
+    await session.execute(delete(ActivityItemModel).where(ActivityItemModel.occurred_at < before))
+    await session.commit()
+
+
+async def get_activity_channels(session: AsyncSession, guild_ids: Sequence[str]) -> list[ActivityChannelModel]:
+    """Get the digest channels of the guilds, guilds without one are left out."""
+    if not guild_ids:
+        return []
+    stmt = select(ActivityChannelModel).where(ActivityChannelModel.guild_id.in_(guild_ids))
+    result = await session.execute(stmt)
+    return list(result.scalars().all())
+
+
+async def set_activity_channel(session: AsyncSession, guild_id: str, channel_id: str | None) -> None:
+    """Set the digest channel of a guild, or stop posting digests if `channel_id` is None."""
+    existing = await session.get(ActivityChannelModel, guild_id)
+    if channel_id is None:
+        if existing:
+            await session.delete(existing)
+    elif existing:
+        existing.channel_id = channel_id
+        existing.posted_at = None
+        session.add(existing)
+    else:
+        session.add(ActivityChannelModel(guild_id=guild_id, channel_id=channel_id, posted_at=None))
+    await session.commit()
+
+
+async def claim_digest_channels(
+    session: AsyncSession, guild_ids: Sequence[str], now: dt.datetime, interval: dt.timedelta
+) -> list[ActivityChannelModel]:
+    """Mark the digest as posted now to the guilds' channels that haven't had one in the interval, returning them.
+
+    Claimed in a single statement, so when several processes post a studio's digest each channel is only claimed once.
+    """
+    if not guild_ids:
+        return []
+    stmt = (
+        update(ActivityChannelModel)
+        .where(
+            ActivityChannelModel.guild_id.in_(guild_ids),
+            or_(ActivityChannelModel.posted_at.is_(None), ActivityChannelModel.posted_at <= now - interval),
+        )
+        .values(posted_at=now)
+        .returning(ActivityChannelModel)
+    )
+    result = await session.execute(stmt)
+    claimed = list(result.scalars().all())
+    await session.commit()
+    return claimed
+
+
+async def release_digest_channels(session: AsyncSession, guild_ids: Sequence[str]) -> None:
+    """Make the guilds' channels due a digest again, after failing to post the one they were claimed for."""
+    if not guild_ids:
+        return
+    stmt = update(ActivityChannelModel).where(ActivityChannelModel.guild_id.in_(guild_ids)).values(posted_at=None)
+    await session.execute(stmt)
+    await session.commit()
@@ -0,0 +1,116 @@
+"""Repo activity utils, fetching commits, issues and pull requests from github."""
+
+import datetime as dt
+import json
+import logging
+from typing import Any, TypedDict
+
+from github.GithubException import GithubException
+from github.Requester import Requester
+
+from csse3200bot.activity.models import ActivityKind, ActivitySource
+from csse3200bot.utils import as_utc
+
+log = logging.getLogger(__name__)
+
+PER_PAGE = 100
+MAX_PAGES = 10
+
+_NOT_MODIFIED = 304
+_FIRST_ERROR_STATUS = 400
+
+
+class ActivityItem(TypedDict):
+    """A commit, pull request or issue, named like the `ActivityItemModel` columns."""
+
+    repo_name: str
+    kind: ActivityKind
+    item_id: str
+    title: str
+    author: str | None
+    url: str
+    state: str | None
+    occurred_at: dt.datetime
+
+
+class FetchResult(TypedDict):
+    """Items fetched since a cursor."""
+
+    modified: bool  # False when github responded 304 Not Modified
+    etag: str | None
+    items: list[ActivityItem]
+
+
+def _parse_timestamp(value: str) -> dt.datetime:
+    return as_utc(dt.datetime.fromisoformat(value))
+
+
+def parse_commit(repo_name: str, data: dict[str, Any]) -> ActivityItem:
+    """Item of a commit from the commits endpoint."""
+    commit = data["commit"]
+    author = (data.get("author") or {}).get("login") or commit["author"]["name"]
+    return {
+        "repo_name": repo_name,
+        "kind": ActivityKind.commit,
+        "item_id": data["sha"],
+        "title": commit["message"].split("\n", 1)[0],
+        "author": author,
+        "url": data["html_url"],
+        "state": None,
+        "occurred_at": _parse_timestamp(commit["committer"]["date"]),
+    }
+
+
+def parse_issue(repo_name: str, data: dict[str, Any]) -> ActivityItem:
+    """Item of an issue or pull request from the issues endpoint."""
+    pull_request = data.get("pull_request")
+    state = data["state"]
+    if pull_request is not None and pull_request.get("merged_at"):
+        state = "merged"
+    return {
+        "repo_name": repo_name,
+        "kind": ActivityKind.pull_request if pull_request is not None else ActivityKind.issue,
+        "item_id": str(data["number"]),
+        "title": data["title"],
+        "author": (data.get("user") or {}).get("login"),
+        "url": data["html_url"],
+        "state": state,
+        "occurred_at": _parse_timestamp(data["updated_at"]),
+    }
+
+
+def fetch_activity(
+    requester: Requester, repo_full_name: str, source: ActivitySource, since: dt.datetime, etag: str | None
+) -> FetchResult:
+    """Fetch the items of a source updated since the cursor, blocking.
+
+    The first page is requested with the etag of the last response, so if nothing has changed github responds
+    with a 304 (which doesn't count towards the rate limit) and nothing else is fetched. `since` is inclusive,
+    so the newest item of the last fetch is fetched again.
+    """
+    repo_name = repo_full_name.split("/", 1)[1]
+    parse = parse_commit if source is ActivitySource.commits else parse_issue
+    url = f"/repos/{repo_full_name}/{source}"
+    parameters: dict[str, Any] = {"since": since.isoformat(), "per_page": PER_PAGE}
+    if source is ActivitySource.issues:
+        parameters |= {"state": "all", "sort": "updated", "direction": "asc"}
+
+    result: FetchResult = {"modified": True, "etag": None, "items": []}
+    for page in range(1, MAX_PAGES + 1):
+        headers = {"If-None-Match": etag} if page == 1 and etag is not None else None
+        status, response_headers, body = requester.requestJson("GET", url, parameters | {"page": page}, headers)
+        if status == _NOT_MODIFIED:
+            return {"modified": False, "etag": etag, "items": []}
+        if status >= _FIRST_ERROR_STATUS:
+            raise GithubException(status, body, response_headers)
+
+        if page == 1:
+            result["etag"] = response_headers.get("etag")
+        data = json.loads(body)
+        result["items"].extend(parse(repo_name, item) for item in data)
+        if len(data) < PER_PAGE:
+            break
+    else:
+        log.warning(f"Stopped fetching {source} of '{repo_name}' after {MAX_PAGES} pages")
+
+    return result
@@ -1,51 +1,275 @@
 """Bot Module."""
 
+import asyncio
+import datetime as dt
 import logging
-from collections.abc import AsyncGenerator, Awaitable, Callable
+import math
+import resource
+from collections.abc import AsyncGenerator, Awaitable, Callable, Mapping, Sequence
 from contextlib import asynccontextmanager
-from typing import Any
+from time import perf_counter
+from typing import Any, TypedDict
 
 import discord
+from discord import app_commands
 from discord.ext import commands
 from github import Auth, Github
 from github.Organization import Organization
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from csse3200bot.database.notify import CacheInvalidationBus
+from csse3200bot.database.profiling import QueryStats, track_task_queries
+from csse3200bot.enums import BotExtension, CommandSyncMode
 from csse3200bot.studio.models import StudioModel
 from csse3200bot.studio.service import (
     create_studio,
+    get_broadcast_channels,
     get_studio_by_details,
     get_studio_by_guild,
     link_guild_to_studio,
     unlink_guild,
+    update_studio,
 )
-from csse3200bot.utils import AsyncCache
+from csse3200bot.sync import (
+    GLOBAL_SCOPE,
+    CommandDiff,
+    describe_diff,
+    diff_commands,
+    get_synced_hashes,
+    has_synced,
+    hash_commands,
+    is_empty,
+    save_synced_hashes,
+    scope_name,
+)
+from csse3200bot.teams.utils import GuildRoleIndex
+from csse3200bot.utils import (
+    AsyncCache,
+    MemoryRateLimiter,
+    ProfileInProgressError,
+    RateLimiter,
+    Scheduler,
+    ShutdownCoordinator,
+    profile,
+)
+from csse3200bot.utils.collections import DEFAULT_CACHE_TTL
 
 log = logging.getLogger(__name__)
 
+STUDIO_NAMESPACE = "studio.guild"
+
+# Background job intervals (seconds)
+CACHE_SWEEP_INTERVAL = 600
+
+MAX_PROFILE_SECONDS = 300
+
+# Seconds background jobs are given to finish on shutdown, after the commands
+JOB_SHUTDOWN_GRACE_PERIOD = 5.0
+
+# Guilds messaged at once when broadcasting to a studio's guilds
+BROADCAST_CONCURRENCY = 4
+
 
 @commands.command(name="sync")
 @commands.is_owner()
-async def sync_command(ctx: commands.Context) -> None:
-    """Sync Command."""
+async def sync_command(ctx: commands.Context, force: bool = False) -> None:  # noqa: FBT001, FBT002
+    """Sync Command, only syncs the scopes whose commands changed unless forced."""
     guild = ctx.guild
     if guild is None:
         await ctx.send("Not allowed to be used outside of guild", ephemeral=True)
         return
 
-    synced = await ctx.bot.tree.sync()
+    diffs = await ctx.bot.sync_commands(force=force)
+
+    lines = [f"- {scope}: {describe_diff(diff)}" for scope, diff in diffs.items()]
+    await ctx.send("\n".join(["Synced commands", *lines]) if lines else "Commands are already up to date")
+
+
+@commands.command(name="reload")
+@commands.is_owner()
+async def reload_command(ctx: commands.Context, extension: str) -> None:
+    """Reload (or load) an extension, to ship a fix to it without reconnecting."""
+    try:
+        bot_extension = BotExtension(extension.upper())
+    except ValueError:
+        await ctx.send(f"No extension '{extension}', expected one of {', '.join(e.name for e in BotExtension)}")
+        return
+
+    try:
+        await ctx.bot.reload_extension(bot_extension.module)
+    except commands.ExtensionNotLoaded:
+        await ctx.bot.load_extension(bot_extension.module)
+    except commands.ExtensionError as e:
+        log.exception(f"Couldn't reload extension '{bot_extension.name}'")
+        await ctx.send(f"Couldn't reload '{bot_extension.name}', the old version is still loaded: {e}")
+        return
+    await ctx.send(f"Reloaded '{bot_extension.name}', `!sync` if its commands changed")
+
+
+@commands.command(name="shards")
+@commands.is_owner()
+async def shards_command(ctx: commands.Context) -> None:
+    """Shard health command."""
+    lines = [
+        f"Shard {shard['shard_id']}: "
+        f"{'closed' if shard['closed'] else 'open'}, "
+        f"{'?' if shard['latency_ms'] is None else shard['latency_ms']}ms, "
+        f"{shard['guilds']} guild(s)"
+        for shard in ctx.bot.shard_health()
+    ]
+    await ctx.send("\n".join(lines) or "No shards running")
+
+
+@commands.command(name="memory")
+@commands.is_owner()
+async def memory_command(ctx: commands.Context, top: int = 10) -> None:
+    """Memory report command, shows what is cached for the guilds with the most cached members."""
+    usage = sorted(ctx.bot.guild_cache_usage(), key=lambda guild: guild["cached_members"], reverse=True)
+    summary = (
+        f"RSS: {_resident_memory_mb():.1f}MB, "
+        f"{sum(guild['cached_members'] for guild in usage)} member(s) cached across {len(usage)} guild(s), "
+        f"{len(ctx.bot.users)} user(s), {len(ctx.bot.cached_messages)} message(s)"
+    )
+    lines = [summary]
+    lines.extend(
+        f"- {guild['name']} ({guild['guild_id']}): {guild['cached_members']}/{guild['member_count']} members, "
+        f"{guild['roles']} roles, {guild['channels']} channels{', chunked' if guild['chunked'] else ''}"
+        for guild in usage[:top]
+    )
+    await ctx.send("\n".join(lines))
+
+
+def _resident_memory_mb() -> float:
+    """Current resident memory, falls back to the peak if /proc isn't around."""
+    try:
+        with open("/proc/self/statm") as statm:  # noqa: PTH123
+            pages = int(statm.read().split()[1])
+        return pages * resource.getpagesize() / 1024 / 1024
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+@commands.command(name="jobs")
+@commands.is_owner()
+async def jobs_command(ctx: commands.Context) -> None:
+    """Background job stats command."""
+    lines = []
+    for name, stats in ctx.bot.scheduler.stats().items():
+        line = f"- {name}: {stats.runs} run(s), {stats.failures} failure(s), {stats.skipped} skipped"
+        if stats.average_duration is not None:
+            line += f", avg {stats.average_duration:.2f}s"
+        if stats.last_run_at is not None:
+            line += f", last ran <t:{int(stats.last_run_at)}:R>"
+        lines.append(line)
+    await ctx.send("\n".join(lines) or "No jobs scheduled")
+
+
+@commands.command(name="profile")
+@commands.is_owner()
+async def profile_command(ctx: commands.Context, seconds: float = 30) -> None:
+    """Sampling profile command, replies with the folded stacks to render as a flamegraph."""
+    seconds = min(seconds, MAX_PROFILE_SECONDS)
+    await ctx.send(f"Profiling for {seconds:.0f}s")
+    try:
+        path = await profile(seconds)
+    except ProfileInProgressError:
+        await ctx.send("A profile is already running")
+        return
+
+    limit = ctx.guild.filesize_limit if ctx.guild is not None else discord.utils.DEFAULT_FILE_SIZE_LIMIT_BYTES
+    if path.stat().st_size > limit:
+        await ctx.send(f"Profile is too big to upload, it was written to `{path}`")
+        return
+    await ctx.send(f"Profile written to `{path}`", file=discord.File(path))
+
+
+class GuildCacheUsage(TypedDict):
+    """What the bot has cached for a guild."""
+
+    guild_id: int
+    name: str
+    member_count: int
+    cached_members: int
+    roles: int
+    channels: int
+    chunked: bool
+
+
+class ShardHealth(TypedDict):
+    """Health of a single shard."""
+
+    shard_id: int
+    latency_ms: int | None
+    closed: bool
+    guilds: int
+
+
+def _latency_ms(latency: float) -> int | None:
+    """Latency is nan/inf until the first heartbeat."""
+    return round(latency * 1000) if math.isfinite(latency) else None
+
+
+async def admit_interaction(interaction: discord.Interaction) -> bool:
+    """Turn the interaction away once shutting down, otherwise track it until it has been handled.
+
+    For interaction checks (the command tree's and `BotView`'s), which run in the task that goes on to handle the
+    interaction. The shutdown waits for that task, and the queries it runs are kept in the interaction's extras.
+    """
+    bot = interaction.client
+    if not isinstance(bot, CSSEBot):
+        return True
+
+    coordinator = bot.shutdown_coordinator
+    if not coordinator.accepting:
+        # autocompletes can only be answered with choices
+        if interaction.type is discord.InteractionType.autocomplete:
+            await interaction.response.autocomplete([])
+        else:
+            await interaction.response.send_message("The bot is restarting, try again in a moment.", ephemeral=True)
+        return False
+
+    coordinator.track_current_task()
+    stats = track_task_queries()
+    interaction.extras["query_stats"] = stats
+    task = asyncio.current_task()
+    if task is not None:
+        start = perf_counter()
+        task.add_done_callback(lambda _: _log_interaction_queries(interaction, stats, perf_counter() - start))
+    return True
+
 
-    for com in synced:
-        log.info(f"Synced: {com}")
+def _log_interaction_queries(interaction: discord.Interaction, stats: QueryStats, elapsed: float) -> None:
+    if interaction.command is not None:
+        name = f"/{interaction.command.qualified_name}"
+    else:
+        data: Mapping[str, object] = interaction.data or {}
+        custom_id = data.get("custom_id")
+        name = f"{interaction.type.name} {custom_id}" if custom_id else interaction.type.name
+    log.debug(
+        f"{name} ran {stats.queries} queries ({stats.round_trips} round trips, "
+        f"{stats.duration * 1000:.1f}ms) in {elapsed * 1000:.1f}ms"
+    )
 
-    await ctx.send(f"Synced {len(synced)} commands globally")
+
+class CSSECommandTree(app_commands.CommandTree):
+    """Command tree that tracks the db queries run by each interaction, and turns them away once shutting down."""
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        """Admit the interaction unless the bot is shutting down, see `admit_interaction`."""
+        return await admit_interaction(interaction)
 
 
 class CSSEBot(commands.Bot):
     """Custom csse bot."""
 
     _sessionmaker: async_sessionmaker
+    _invalidation_bus: CacheInvalidationBus
+    _scheduler: Scheduler
+    _rate_limiter: RateLimiter
     _guilds: list[discord.abc.Snowflake]
+    _command_sync: CommandSyncMode
+    _enabled_extensions: list[BotExtension]
+    _shutdown_coordinator: ShutdownCoordinator
 
     # Github stuff - yes I know, this ideally should be in cog, but used everywhere and referencing
     # cogs by strings is yuck!!!
@@ -53,28 +277,174 @@ class CSSEBot(commands.Bot):
     _gh_client: Github
 
     # studio info
+    _cache_ttl: int
+    _sprint_starts: list[dt.date]  # first day of each sprint
     _studio_cache: AsyncCache[str, StudioModel]  # guild_id -> StudioModel
 
-    def __init__(
+    # role info
+    _role_indexes: dict[int, GuildRoleIndex]  # guild_id -> GuildRoleIndex
+
+    def __init__(  # noqa: PLR0913
         self,
         guild_ids: list[int],
         db_sessionmaker: async_sessionmaker,
+        invalidation_bus: CacheInvalidationBus,
         gh_org_name: str,
         gh_token: str,
         *args: Any,  # noqa: ANN401
+        cache_ttl: int = DEFAULT_CACHE_TTL,
+        sprint_starts: Sequence[dt.date] = (),
+        rate_limiter: RateLimiter | None = None,
+        command_sync: CommandSyncMode = CommandSyncMode.none,
+        extensions: Sequence[BotExtension] = (),
         **kwargs: Any,  # noqa: ANN401
     ) -> None:
         """Creates a csse bot."""
+        kwargs.setdefault("tree_cls", CSSECommandTree)
         super().__init__(*args, **kwargs)
         self._guilds = [discord.Object(id=guild_id) for guild_id in guild_ids]
+        self._command_sync = command_sync
+        self._enabled_extensions = list(extensions)
         self._sessionmaker = db_sessionmaker
+        self._invalidation_bus = invalidation_bus
+        self._scheduler = Scheduler()
+        self._rate_limiter = rate_limiter or MemoryRateLimiter()
+        self._shutdown_coordinator = ShutdownCoordinator()
+        # the first hook, so jobs aren't writing while the other hooks flush
+        self._shutdown_coordinator.add_hook("scheduler", self._stop_jobs)
+        self._scheduler.add_job("rate_limits.purge", self._purge_rate_limits, CACHE_SWEEP_INTERVAL)
 
         self._gh_client = Github(auth=Auth.Token(gh_token), per_page=100)
         self._org = self._gh_client.get_organization(gh_org_name)
 
-        self._studio_cache = AsyncCache(self._fetch_studio_by_guild_wrapper())
+        self._cache_ttl = cache_ttl
+        self._sprint_starts = sorted(sprint_starts)
+        self._studio_cache = AsyncCache(self._fetch_studio_by_guild_wrapper(), ttl=cache_ttl)
+        self._invalidation_bus.subscribe(STUDIO_NAMESPACE, self._studio_cache.remove, self._studio_cache.clear)
+        # refresh studios before they expire, so commands don't wait on the db
+        self._scheduler.add_job("studio.warm_cache", self._warm_studio_cache, cache_ttl * 0.8)
+        self._scheduler.add_job("studio.sweep_cache", self._sweep_studio_cache, CACHE_SWEEP_INTERVAL)
+        self._role_indexes = {}
 
         self.add_command(sync_command)
+        self.add_command(reload_command)
+        self.add_command(shards_command)
+        self.add_command(memory_command)
+        self.add_command(jobs_command)
+        self.add_command(profile_command)
+
+    async def setup_hook(self) -> None:
+        """Setup run after login, before connecting to the gateway."""
+        await self._invalidation_bus.start()
+        self._scheduler.start()
+        failed = await self.load_enabled_extensions()
+        if self._command_sync is CommandSyncMode.none:
+            return
+        if failed:
+            # syncing now would delete the commands of the extensions that failed from discord
+            log.error(
+                f"Not syncing commands, extension(s) {', '.join(e.name for e in failed)} failed to load. "
+                "Fix and `!reload` them, then `!sync`"
+            )
+            return
+        try:
+            await self.sync_commands()
+        except discord.HTTPException:
+            log.exception("Couldn't sync application commands")
+
+    async def load_enabled_extensions(self) -> list[BotExtension]:
+        """Load the enabled extensions at once, one failing to load doesn't stop the others.
+
+        Returns the extensions that failed to load.
+        """
+
+        async def load(extension: BotExtension) -> bool:
+            try:
+                await self.load_extension(extension.module)
+            except commands.ExtensionError:
+                log.exception(f"Couldn't load extension '{extension.name}'")
+                return False
+            log.info(f"Loaded extension '{extension.name}'")
+            return True
+
+        loaded = await asyncio.gather(*(load(extension) for extension in self._enabled_extensions))
+        return [extension for extension, ok in zip(self._enabled_extensions, loaded, strict=True) if not ok]
+
+    async def close(self) -> None:
+        """Close the bot."""
+        await self._invalidation_bus.stop()
+        await super().close()
+
+    async def shutdown(self, grace_period: float) -> None:
+        """Shut down without dropping commands, then close the bot.
+
+        New commands are turned away (and the bot reports as not ready) straight away. Commands in progress are given
+        up to `grace_period` seconds to finish, then background jobs are stopped and the shutdown hooks flush pending
+        writes, all before the gateway is closed.
+        """
+        if not self._shutdown_coordinator.accepting:
+            return
+        log.info(f"Shutting down, draining in progress commands for up to {grace_period}s")
+        if not await self._shutdown_coordinator.shutdown(grace_period):
+            log.warning("Not every command finished before the shutdown grace period")
+        await self.close()
+
+    async def sync_commands(self, *, force: bool = False) -> dict[str, CommandDiff]:
+        """Sync the application commands of each scope that changed since it was last synced, or every scope if forced.
+
+        Commands are synced globally, or copied to and synced with each configured guild in `GUILDS` mode, where
+        the global scope is cleared once. Returns what changed in each scope that was synced. Syncing counts towards
+        a tight daily rate limit, which is why unchanged scopes are skipped.
+        """
+        scopes: list[discord.abc.Snowflake | None] = [None]
+        if self._command_sync is CommandSyncMode.guilds:
+            scopes = list(self._guilds)
+            for target in self._guilds:
+                self.tree.copy_global_to(guild=target)
+
+        diffs: dict[str, CommandDiff] = {}
+        for guild in scopes:
+            scope = scope_name(guild)
+            command_hashes = hash_commands(self.tree, guild)
+            async with self.get_db() as session:
+                diff = diff_commands(await get_synced_hashes(session, scope), command_hashes)
+            if is_empty(diff) and not force:
+                log.debug(f"Commands of scope '{scope}' are unchanged, not syncing")
+                continue
+
+            synced = await self.tree.sync(guild=guild)
+            log.info(f"Synced {len(synced)} commands to scope '{scope}': {describe_diff(diff)}")
+            async with self.get_db() as session:
+                await save_synced_hashes(session, scope, command_hashes)
+            diffs[scope] = diff
+
+        if self._command_sync is CommandSyncMode.guilds:
+            cleared = await self._clear_global_commands(force=force)
+            if cleared is not None:
+                diffs[GLOBAL_SCOPE] = cleared
+        return diffs
+
+    async def _clear_global_commands(self, *, force: bool = False) -> CommandDiff | None:
+        """Remove the commands synced globally (e.g. before switching to `GUILDS`), else they show up twice.
+
+        Only done once, the empty global scope is saved like any other. Returns what was removed, if anything was.
+        """
+        async with self.get_db() as session:
+            synced = await get_synced_hashes(session, GLOBAL_SCOPE)
+            already_cleared = await has_synced(session, GLOBAL_SCOPE) and not synced
+        if already_cleared and not force:
+            log.debug(f"Commands of scope '{GLOBAL_SCOPE}' are already cleared, not syncing")
+            return None
+
+        if self.application_id is None:
+            raise app_commands.MissingApplicationID
+        # synced empty rather than cleared from the tree, as the global commands are what's copied to each guild
+        await self.http.bulk_upsert_global_commands(self.application_id, payload=[])
+        diff = diff_commands(synced, {})
+        log.info(f"Cleared the commands of scope '{GLOBAL_SCOPE}': {describe_diff(diff)}")
+        async with self.get_db() as session:
+            await save_synced_hashes(session, GLOBAL_SCOPE, {})
+        return diff
 
     @asynccontextmanager
     async def get_db(self) -> AsyncGenerator[AsyncSession]:
@@ -102,10 +472,38 @@ class CSSEBot(commands.Bot):
 
         return fetch
 
+    async def _warm_studio_cache(self) -> None:
+        """Refetch the studios that are in use, so they don't expire."""
+        for guild_id in self._studio_cache.cached_keys():
+            await self._studio_cache.refresh(guild_id)
+
+    async def _sweep_studio_cache(self) -> None:
+        removed = self._studio_cache.purge_expired()
+        log.debug(f"Removed {removed} expired studio(s) from cache")
+
+    async def _stop_jobs(self) -> None:
+        await self._scheduler.shutdown(JOB_SHUTDOWN_GRACE_PERIOD)
+
+    async def _purge_rate_limits(self) -> None:
+        removed = await self._rate_limiter.purge_expired()
+        log.debug(f"Removed {removed} full rate limit bucket(s)")
+
     async def get_studio(self, guild: discord.Guild) -> StudioModel | None:
         """Get studio from given guild, using the cache."""
         return await self._studio_cache.get(str(guild.id))
 
+    async def _cache_studio(self, session: AsyncSession, studio: StudioModel) -> None:
+        """Cache the studio for every guild linked to it, dropping it from other processes' caches."""
+        for link in studio.guild_links:
+            await self._invalidation_bus.publish(session, STUDIO_NAMESPACE, link.guild_id)
+            self._studio_cache.set(link.guild_id, studio)
+
+    async def _uncache_studio(self, session: AsyncSession, studio: StudioModel) -> None:
+        """Drop the studio from the cache of every guild linked to it, here and in other processes."""
+        for link in studio.guild_links:
+            await self._invalidation_bus.publish(session, STUDIO_NAMESPACE, link.guild_id)
+            self._studio_cache.remove(link.guild_id)
+
     async def create_or_update_studio(
         self,
         guild_id: str,
@@ -113,7 +511,11 @@ class CSSEBot(commands.Bot):
         studio_year: int,
         repo_name: str,
     ) -> StudioModel:
-        """Create or update studio ."""
+        """Create or update studio .
+
+        Every guild of the studios the guild joins or leaves has its cached studio replaced, so the cached links
+        stay complete for broadcasting.
+        """
         async with self.get_db() as session:
             # check if guild has studio
             existing_guild_studio = await get_studio_by_guild(session, guild_id)
@@ -127,7 +529,10 @@ class CSSEBot(commands.Bot):
                 new_studio = await create_studio(session, studio_number, studio_year, repo_name)
                 await unlink_guild(session, guild_id)
                 await link_guild_to_studio(session, new_studio.studio_id, guild_id)
-                self._studio_cache.set(guild_id, new_studio)
+                await session.refresh(new_studio, ["guild_links"])
+                if existing_guild_studio:
+                    await self._uncache_studio(session, existing_guild_studio)
+                await self._cache_studio(session, new_studio)
                 return new_studio
 
             # Guild is not a part of a studio, but that studio does exist
@@ -140,14 +545,187 @@ class CSSEBot(commands.Bot):
                 log.info(f"NOTE: Not updating studio {studio_number} - {studio_year} as guild is just joining")
                 # NOT UPDATING INFO, IN CASE OF MISINPUT!!!
                 await link_guild_to_studio(session, existing_studio.studio_id, guild_id)
-                self._studio_cache.set(guild_id, existing_studio)
+                await session.refresh(existing_studio, ["guild_links"])
+                if existing_guild_studio:
+                    await self._uncache_studio(session, existing_guild_studio)
+                await self._cache_studio(session, existing_studio)
                 return existing_studio
 
             # Otherwise same studio
             log.info("Guild wants to modify its own studio")
-            new_studio = await create_studio(session, studio_number, studio_year, repo_name)
-            self._studio_cache.set(guild_id, new_studio)
-            return new_studio
+            updated_studio = await update_studio(session, existing_studio, repo_name)
+            # every guild in the studio has it cached
+            await self._cache_studio(session, updated_studio)
+            return updated_studio
+
+    async def broadcast(self, channels: Mapping[str, str], **kwargs: Any) -> list[str]:  # noqa: ANN401
+        """Send a message to each guild's channel at once, returning the guilds it was sent to.
+
+        `channels` maps guild ids to channel ids. Channels are messaged by id, so guilds served by other processes
+        are messaged too, and a guild that can't be messaged doesn't stop the others.
+        """
+        semaphore = asyncio.Semaphore(BROADCAST_CONCURRENCY)
+
+        async def send(guild_id: str, channel_id: str) -> bool:
+            channel = self.get_partial_messageable(int(channel_id), guild_id=int(guild_id))
+            async with semaphore:
+                try:
+                    await channel.send(**kwargs)
+                except discord.HTTPException:
+                    log.exception(f"Couldn't broadcast to channel {channel_id} of guild {guild_id}")
+                    return False
+            return True
+
+        sent = await asyncio.gather(*(send(guild_id, channel_id) for guild_id, channel_id in channels.items()))
+        return [guild_id for guild_id, ok in zip(channels, sent, strict=True) if ok]
+
+    async def broadcast_to_studio(self, studio: StudioModel, **kwargs: Any) -> list[str]:  # noqa: ANN401
+        """Send a message to the broadcast channel of each of the studio's guilds that has one, see `broadcast`.
+
+        The guilds are taken from the links of the studio as it was cached.
+        """
+        async with self.get_db() as session:
+            channels = await get_broadcast_channels(session, [link.guild_id for link in studio.guild_links])
+        if not channels:
+            return []
+        log.debug(f"Broadcasting to {len(channels)} guild(s) of studio {studio.studio_id}")
+        return await self.broadcast(channels, **kwargs)
+
+    def shard_health(self) -> list[ShardHealth]:
+        """Health of the shards run by this process, a single unsharded bot counts as shard 0."""
+        return [
+            {
+                "shard_id": self.shard_id or 0,
+                "latency_ms": _latency_ms(self.latency),
+                "closed": self.is_closed() or self.ws is None,
+                "guilds": len(self.guilds),
+            }
+        ]
+
+    def guild_cache_usage(self) -> list[GuildCacheUsage]:
+        """What is cached for each guild, for working out where the memory is going."""
+        return [
+            {
+                "guild_id": guild.id,
+                "name": guild.name,
+                "member_count": guild.member_count or 0,
+                "cached_members": len(guild.members),
+                "roles": len(guild.roles),
+                "channels": len(guild.channels),
+                "chunked": guild.chunked,
+            }
+            for guild in self.guilds
+        ]
+
+    async def get_guild_members(self, guild: discord.Guild) -> Sequence[discord.Member]:
+        """Get every member of a guild, requesting them from discord if they haven't all been cached.
+
+        The members are only kept afterwards if the member cache policy keeps chunked members.
+        """
+        if guild.chunked:
+            return guild.members
+
+        log.info(f"Chunking guild {guild.id} for {guild.member_count} members")
+        return await guild.chunk(cache=self._connection.member_cache_flags.joined)
+
+    async def find_member(self, guild: discord.Guild, user_id: int) -> discord.Member | None:
+        """Find a member of the guild, even if they aren't cached."""
+        member = guild.get_member(user_id)
+        if member is not None:
+            return member
+        try:
+            return await guild.fetch_member(user_id)
+        except discord.NotFound:
+            return None
+
+    async def has_left(self, user_id: int) -> bool:
+        """Whether the user deleted their account or isn't in any of the bot's guilds anymore.
+
+        Anything that can't be confirmed, e.g. because discord errored, counts as not having left.
+        """
+        try:
+            if self.get_user(user_id) is None:
+                await self.fetch_user(user_id)
+            for guild in self.guilds:
+                if await self.find_member(guild, user_id) is not None:
+                    return False
+        except discord.NotFound:
+            return True
+        except discord.HTTPException:
+            log.exception(f"Failed to check whether user {user_id} has left")
+            return False
+        return True
+
+    def get_role_index(self, guild: discord.Guild) -> GuildRoleIndex:
+        """Get the role index for the given guild, building it if the roles have changed since last use."""
+        index = self._role_indexes.get(guild.id)
+        if index is None:
+            log.debug(f"Building role index for guild: {guild.id}")
+            index = GuildRoleIndex(guild)
+            self._role_indexes[guild.id] = index
+        return index
+
+    def invalidate_role_index(self, guild: discord.Guild) -> None:
+        """Drop the role index for the given guild."""
+        self._role_indexes.pop(guild.id, None)
+
+    async def on_guild_role_create(self, role: discord.Role) -> None:
+        """Invalidate role index when a role is created."""
+        self.invalidate_role_index(role.guild)
+
+    async def on_guild_role_update(self, _: discord.Role, after: discord.Role) -> None:
+        """Invalidate role index when a role is renamed or moved."""
+        self.invalidate_role_index(after.guild)
+
+    async def on_guild_role_delete(self, role: discord.Role) -> None:
+        """Invalidate role index when a role is deleted."""
+        self.invalidate_role_index(role.guild)
+
+    async def on_guild_remove(self, guild: discord.Guild) -> None:
+        """Forget the role index of guilds the bot has left."""
+        self.invalidate_role_index(guild)
+
+    def get_sprint_window(self, sprint_number: int) -> tuple[dt.datetime, dt.datetime | None] | None:
+        """Start and (exclusive) end of a sprint in UTC, None if its dates aren't configured.
+
+        The last configured sprint has no end.
+        """
+        if not 1 <= sprint_number <= len(self._sprint_starts):
+            return None
+        start = dt.datetime.combine(self._sprint_starts[sprint_number - 1], dt.time(), dt.UTC)
+        if sprint_number == len(self._sprint_starts):
+            return start, None
+        return start, dt.datetime.combine(self._sprint_starts[sprint_number], dt.time(), dt.UTC)
+
+    @property
+    def cache_ttl(self) -> int:
+        """TTL for caches that are kept consistent with the invalidation bus."""
+        return self._cache_ttl
+
+    @property
+    def scheduler(self) -> Scheduler:
+        """Background job scheduler."""
+        return self._scheduler
+
+    @property
+    def rate_limiter(self) -> RateLimiter:
+        """Command rate limiter, see `csse3200bot.interactions.rate_limit`."""
+        return self._rate_limiter
+
+    @property
+    def shutdown_coordinator(self) -> ShutdownCoordinator:
+        """Tracks in progress commands, add hooks to it to flush pending writes on shutdown."""
+        return self._shutdown_coordinator
+
+    @property
+    def accepting_interactions(self) -> bool:
+        """Whether new commands are run, False once the bot starts shutting down."""
+        return self._shutdown_coordinator.accepting
+
+    @property
+    def invalidation_bus(self) -> CacheInvalidationBus:
+        """Cross process cache invalidation bus."""
+        return self._invalidation_bus
 
     @property
     def github_org(self) -> Organization:
@@ -158,3 +736,39 @@ class CSSEBot(commands.Bot):
     def github_client(self) -> Github:
         """Github client property."""
         return self._gh_client
+
+
+class ShardedCSSEBot(CSSEBot, commands.AutoShardedBot):
+    """Csse bot that runs several gateway shards in one process.
+
+    Which shards a process runs is set with the `shard_ids` and `shard_count` kwargs, see `launcher.py` for
+    running several of these across processes.
+    """
+
+    def shard_health(self) -> list[ShardHealth]:
+        """Health of the shards run by this process."""
+        guild_counts: dict[int, int] = {}
+        for guild in self.guilds:
+            guild_counts[guild.shard_id] = guild_counts.get(guild.shard_id, 0) + 1
+
+        return [
+            {
+                "shard_id": shard.id,
+                "latency_ms": _latency_ms(shard.latency),
+                "closed": shard.is_closed(),
+                "guilds": guild_counts.get(shard.id, 0),
+            }
+            for shard in sorted(self.shards.values(), key=lambda shard: shard.id)
+        ]
+
+    async def on_shard_connect(self, shard_id: int) -> None:
+        """Log shard connections."""
+        log.info(f"Shard {shard_id} connected")
+
+    async def on_shard_disconnect(self, shard_id: int) -> None:
+        """Log shard disconnections."""
+        log.warning(f"Shard {shard_id} disconnected")
+
+    async def on_shard_resumed(self, shard_id: int) -> None:
+        """Log shard resumes."""
+        log.info(f"Shard {shard_id} resumed")
@@ -1,9 +1,15 @@
 """App config module."""
 
+import datetime as dt
+
 from pydantic import Field
 from pydantic_settings import BaseSettings
 
-from csse3200bot.enums import LogLevel
+from csse3200bot.database.profiling import DEFAULT_SLOW_QUERY_MS
+from csse3200bot.enums import BotExtension, CommandSyncMode, LogLevel, MemberCachePolicy, RateLimitBackend
+from csse3200bot.greetings.utils import DEFAULT_WELCOME_BATCH_SIZE, DEFAULT_WELCOME_DELAY, DEFAULT_WELCOME_TEMPLATE
+from csse3200bot.utils.collections import DEFAULT_CACHE_TTL
+from csse3200bot.utils.shutdown import DEFAULT_SHUTDOWN_TIMEOUT
 
 
 class GeneralSettings(BaseSettings):
@@ -14,6 +20,46 @@ class GeneralSettings(BaseSettings):
     log_level: LogLevel = Field(default=LogLevel.debug)
     gh_token: str = Field()
     guild_ids: list[int] = Field()
+    # TTL for caches kept consistent across processes by the invalidation bus, can be long
+    cache_ttl: int = Field(default=DEFAULT_CACHE_TTL)
+    # First day of each sprint, e.g. ["2025-08-11", "2025-09-01"], for per sprint stats
+    sprint_starts: list[dt.date] = Field(default=[])
+    # Application commands are synced at startup when they've changed, GUILDS syncs them to each of guild_ids
+    command_sync: CommandSyncMode = Field(default=CommandSyncMode.global_)
+    # Features to enable, e.g. ["GH","STUDIO","TEAMS"], anything left out is never imported
+    extensions: list[BotExtension] = Field(default=list(BotExtension))
+
+    # Command rate limits, kept in the database to share them between processes and keep them over restarts
+    rate_limit_backend: RateLimitBackend = Field(default=RateLimitBackend.memory)
+
+    # Members joining together are welcomed in one message, sent this many seconds after the first join or once
+    # the batch is full. The template must contain {mentions}
+    welcome_template: str = Field(default=DEFAULT_WELCOME_TEMPLATE)
+    welcome_delay: float = Field(default=DEFAULT_WELCOME_DELAY)
+    welcome_batch_size: int = Field(default=DEFAULT_WELCOME_BATCH_SIZE)
+
+    # Sharding - opt in, shard_count/shard_ids are left to discord when not set
+    sharded: bool = Field(default=False)
+    shard_count: int | None = Field(default=None)
+    shard_ids: list[int] | None = Field(default=None)
+
+    # Member caching - guilds are chunked when a bulk command needs their members, unless chunked at startup
+    member_cache: MemberCachePolicy = Field(default=MemberCachePolicy.all)
+    chunk_guilds_at_startup: bool = Field(default=False)
+
+    # Queries slower than this (milliseconds) are logged with their parameters
+    slow_query_ms: int = Field(default=DEFAULT_SLOW_QUERY_MS)
+    # Event loop stalls longer than this (milliseconds) are logged with the blocking stack, disabled when not set
+    loop_stall_ms: int | None = Field(default=None)
+
+    # Embedded http server (health checks), disabled when not set
+    http_port: int | None = Field(default=None)
+    # Secret of the github webhook served on /github/webhook by the http server, disabled when not set
+    github_webhook_secret: str | None = Field(default=None)
+
+    # Seconds in progress commands are given to finish on SIGTERM, before pending writes are flushed and the bot
+    # disconnects
+    shutdown_timeout: float = Field(default=DEFAULT_SHUTDOWN_TIMEOUT)
 
 
 CONFIG = GeneralSettings()  # type: ignore[call-arg]
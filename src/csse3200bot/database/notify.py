@@ -0,0 +1,177 @@
+"""Cross process cache invalidation using Postgres LISTEN/NOTIFY."""
+
+import asyncio
+import json
+import logging
+import os
+from collections import defaultdict
+from collections.abc import Callable
+from typing import NamedTuple
+from uuid import uuid4
+
+import asyncpg
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+log = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "csse3200bot_cache_invalidation"
+RECONNECT_DELAY = 5
+MAX_RECONNECT_DELAY = 60
+
+type InvalidationCallback = Callable[[str], object]
+type ResetCallback = Callable[[], None]
+
+
+class _Subscription(NamedTuple):
+    invalidate: InvalidationCallback
+    reset: ResetCallback
+
+
+class CacheInvalidationBus:
+    """Publishes cache key invalidations to every bot process sharing the database.
+
+    Invalidations are sent with `pg_notify` on the writer's session after the write has been committed, so are
+    delivered when that session next commits, and other processes can't refetch the old value after hearing about
+    them. If that commit fails the invalidation is lost, and other processes serve the old value until it expires.
+    Notifications sent by this process are ignored, as the local caches have already been updated by the writer.
+    If the listening connection drops, notifications may have been missed, so every subscriber is reset once
+    the connection is back.
+    Only does anything on Postgres, other databases (e.g. sqlite for local testing) get a local-only bus.
+    """
+
+    _engine: AsyncEngine
+    _origin: str
+    _subscribers: defaultdict[str, list[_Subscription]]  # namespace -> subscriptions
+    _connection: asyncpg.Connection | None
+    _reconnect_task: asyncio.Task[None] | None
+    _stopping: bool
+
+    def __init__(self, engine: AsyncEngine) -> None:
+        """Creates an invalidation bus for the database behind the given engine."""
+        self._engine = engine
+        self._origin = f"{os.getpid()}-{uuid4().hex}"
+        self._subscribers = defaultdict(list)
+        self._connection = None
+        self._reconnect_task = None
+        self._stopping = False
+
+    @property
+    def enabled(self) -> bool:
+        """Whether invalidations are shared with other processes."""
+        return self._engine.dialect.name == "postgresql"
+
+    def subscribe(self, namespace: str, invalidate: InvalidationCallback, reset: ResetCallback) -> None:
+        """Subscribe to invalidations of keys in the namespace.
+
+        Args:
+            namespace (str): namespace of the keys, usually one per cache
+            invalidate (InvalidationCallback): called with the key when another process invalidates it
+            reset (ResetCallback): called when invalidations may have been missed, should drop everything
+        """
+        self._subscribers[namespace].append(_Subscription(invalidate, reset))
+
+    def unsubscribe(self, namespace: str, invalidate: InvalidationCallback) -> None:
+        """Remove the subscription with the given invalidate callback."""
+        self._subscribers[namespace] = [sub for sub in self._subscribers[namespace] if sub.invalidate != invalidate]
+
+    async def publish(self, session: AsyncSession, namespace: str, key: str) -> None:
+        """Tell other processes to drop the key, once the session's transaction commits."""
+        if not self.enabled:
+            return
+        payload = json.dumps({"origin": self._origin, "namespace": namespace, "key": key})
+        await session.execute(select(func.pg_notify(INVALIDATION_CHANNEL, payload)))
+
+    async def start(self) -> None:
+        """Start listening for invalidations from other processes."""
+        if not self.enabled:
+            log.info(f"Cache invalidation bus disabled for '{self._engine.dialect.name}' database")
+            return
+
+        self._stopping = False
+        await self._listen()
+
+    async def stop(self) -> None:
+        """Stop listening and close the connection."""
+        self._stopping = True
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            self._reconnect_task = None
+        if self._connection is None:
+            return
+        connection, self._connection = self._connection, None
+        await connection.close()
+
+    async def _listen(self) -> None:
+        dsn = self._engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+        connection = await asyncpg.connect(dsn)
+        await connection.add_listener(INVALIDATION_CHANNEL, self._on_notification)
+        connection.add_termination_listener(self._on_connection_lost)
+        self._connection = connection
+        log.info(f"Listening for cache invalidations on '{INVALIDATION_CHANNEL}'")
+
+    async def _reconnect(self) -> None:
+        delay = RECONNECT_DELAY
+        while not self._stopping:
+            try:
+                await self._listen()
+            except Exception:
+                # whatever went wrong, giving up would leave this process' caches stale until restarted
+                log.exception(f"Failed to reconnect invalidation bus, retrying in {delay}s")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, MAX_RECONNECT_DELAY)
+                continue
+
+            # anything could have changed while we weren't listening
+            self._reset_all()
+            return
+
+    def _reset_all(self) -> None:
+        for namespace, subscriptions in self._subscribers.items():
+            for subscription in subscriptions:
+                try:
+                    subscription.reset()
+                except Exception:
+                    log.exception(f"Failed to reset '{namespace}'")
+
+    def _dispatch(self, namespace: str, key: str) -> None:
+        for subscription in self._subscribers.get(namespace, []):
+            try:
+                subscription.invalidate(key)
+            except Exception:
+                log.exception(f"Failed to invalidate '{key}' in '{namespace}'")
+
+    def _on_connection_lost(self, _: object) -> None:
+        """Termination listener callback, see `asyncpg.Connection.add_termination_listener`."""
+        self._connection = None
+        if self._stopping or self._reconnect_task is not None:
+            return
+        log.warning("Lost invalidation bus connection, reconnecting")
+        self._reconnect_task = asyncio.create_task(self._reconnect())
+        self._reconnect_task.add_done_callback(self._on_reconnected)
+
+    def _on_reconnected(self, _: asyncio.Task[None]) -> None:
+        self._reconnect_task = None
+
+    def _on_notification(self, _: object, __: int, ___: str, payload: str) -> None:
+        """Listener callback, see `asyncpg.Connection.add_listener`."""
+        try:
+            data = json.loads(payload)
+        except json.JSONDecodeError:
+            log.warning(f"Ignoring malformed invalidation: {payload}")
+            return
+
+        if not isinstance(data, dict):
+            log.warning(f"Ignoring malformed invalidation: {payload}")
+            return
+
+        if data.get("origin") == self._origin:
+            return
+
+        namespace, key = data.get("namespace"), data.get("key")
+        if not isinstance(namespace, str) or not isinstance(key, str):
+            log.warning(f"Ignoring invalidation without a namespace and key: {payload}")
+            return
+
+        log.debug(f"Got invalidation for '{key}' in '{namespace}'")
+        self._dispatch(namespace, key)
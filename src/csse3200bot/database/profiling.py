@@ -0,0 +1,107 @@
+"""Query counting and slow query logging, using SQLAlchemy engine events."""
+
+import logging
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Any
+from weakref import WeakKeyDictionary
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, ExecutionContext
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+log = logging.getLogger(__name__)
+
+DEFAULT_SLOW_QUERY_MS = 200
+
+# When each statement started executing, gone with its execution context (even if the statement raises)
+_start_times: WeakKeyDictionary[ExecutionContext, float] = WeakKeyDictionary()
+
+# Stats of every enclosing `track_queries`, innermost last
+_current_stats: ContextVar[tuple["QueryStats", ...]] = ContextVar("query_stats", default=())
+
+
+class QueryStats:
+    """Statements run while tracking, see `track_queries`."""
+
+    queries: int
+    round_trips: int  # queries plus begins, commits and rollbacks
+    duration: float  # seconds spent executing queries
+    statements: list[str]
+
+    def __init__(self) -> None:
+        """No queries."""
+        self.queries = 0
+        self.round_trips = 0
+        self.duration = 0.0
+        self.statements = []
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Count the queries run in this context, including tasks it starts.
+
+    Can be nested, queries count towards every enclosing tracker. Only counts queries run on engines with the
+    hooks installed, see `install_query_hooks`.
+    """
+    stats = QueryStats()
+    token = _current_stats.set((*_current_stats.get(), stats))
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+def track_task_queries() -> QueryStats:
+    """Count the queries run by the rest of the current task, including tasks it starts.
+
+    For work that can't be wrapped in `track_queries`, e.g. when tracking starts from a check run before it.
+    """
+    stats = QueryStats()
+    _current_stats.set((*_current_stats.get(), stats))
+    return stats
+
+
+def install_query_hooks(engine: AsyncEngine, slow_query_ms: int = DEFAULT_SLOW_QUERY_MS) -> None:
+    """Count queries for `track_queries`, and log statements slower than the threshold with their parameters."""
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_cursor_execute(
+        _: Connection,
+        __: Any,  # noqa: ANN401
+        ___: str,
+        ____: Any,  # noqa: ANN401
+        context: ExecutionContext,
+        _____: bool,  # noqa: FBT001
+    ) -> None:
+        _start_times[context] = perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_cursor_execute(
+        _: Connection,
+        __: Any,  # noqa: ANN401
+        statement: str,
+        parameters: Any,  # noqa: ANN401
+        context: ExecutionContext,
+        executemany: bool,  # noqa: FBT001
+    ) -> None:
+        elapsed = perf_counter() - _start_times.pop(context)
+        for stats in _current_stats.get():
+            stats.queries += 1
+            stats.round_trips += 1
+            stats.duration += elapsed
+            stats.statements.append(statement)
+
+        if elapsed * 1000 >= slow_query_ms:
+            kind = "executemany" if executemany else "query"
+            log.warning(f"Slow {kind} ({elapsed * 1000:.0f}ms): {statement} with {parameters}")
+
+    def count_round_trip(*_: Any) -> None:  # noqa: ANN401
+        for stats in _current_stats.get():
+            stats.round_trips += 1
+
+    for name in ("begin", "commit", "rollback"):
+        event.listen(sync_engine, name, count_round_trip)
@@ -0,0 +1,67 @@
+"""Rate limiting shared by every bot process using the database."""
+
+from collections.abc import Callable
+from time import time
+
+from sqlalchemy import case, delete, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Mapped, mapped_column
+
+from csse3200bot.database.base import BaseDBModel
+from csse3200bot.utils.ratelimit import TOLERANCE, Budget, RateLimiter, retry_after
+
+
+class RateLimitModel(BaseDBModel):
+    """DB Model for a rate limit bucket, see `csse3200bot.utils.ratelimit.next_arrival`."""
+
+    __tablename__ = "rate_limit"
+
+    key: Mapped[str] = mapped_column(primary_key=True)
+    arrival: Mapped[float]  # unix time the bucket is full
+
+
+class DatabaseRateLimiter(RateLimiter):
+    """Rate limiter keeping its buckets in the database, limiting uses across every process sharing it.
+
+    A token is taken with a single upsert that only updates the bucket if it has one, so concurrent uses from
+    different processes can't both take the last token. Processes tell the time with their own clocks, which
+    are assumed to be in sync. Works on Postgres and sqlite.
+    """
+
+    _engine: AsyncEngine
+    _clock: Callable[[], float]
+
+    def __init__(self, engine: AsyncEngine, clock: Callable[[], float] = time) -> None:
+        """Creates a rate limiter on the database behind the given engine."""
+        self._engine = engine
+        self._clock = clock
+
+    async def acquire(self, key: str, budget: Budget) -> float:
+        """See `RateLimiter.acquire`."""
+        now = self._clock()
+        insert = postgresql.insert if self._engine.dialect.name == "postgresql" else sqlite.insert
+        # mirrors `next_arrival`, in the database
+        arrival = case((RateLimitModel.arrival > now, RateLimitModel.arrival), else_=now) + budget.interval
+        stmt = (
+            insert(RateLimitModel)
+            .values(key=key, arrival=now + budget.interval)
+            .on_conflict_do_update(
+                index_elements=[RateLimitModel.key],
+                set_={"arrival": arrival},
+                where=arrival - now <= budget.per + TOLERANCE,
+            )
+            .returning(RateLimitModel.arrival)
+        )
+        async with self._engine.begin() as connection:
+            if (await connection.execute(stmt)).first() is not None:
+                return 0.0
+            # the bucket wasn't updated as it's empty
+            current = await connection.scalar(select(RateLimitModel.arrival).where(RateLimitModel.key == key))
+        return retry_after(current if current is not None else now, now, budget)
+
+    async def purge_expired(self) -> int:
+        """See `RateLimiter.purge_expired`."""
+        async with self._engine.begin() as connection:
+            result = await connection.execute(delete(RateLimitModel).where(RateLimitModel.arrival <= self._clock()))
+        return result.rowcount
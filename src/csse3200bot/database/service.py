@@ -12,10 +12,23 @@ log = logging.getLogger(__name__)
 async def initialise_database(engine: AsyncEngine) -> None:
     """Initialise database."""
     # Importing as now sqlalchemy will know about them when creating the schema
+    from csse3200bot.activity.models import ActivityChannelModel, ActivityCursorModel, ActivityItemModel
     from csse3200bot.database.base import BaseDBModel
-    from csse3200bot.gh.models import DiscordUserModel
-    from csse3200bot.studio.models import StudioGuildModel, StudioModel
-    from csse3200bot.teams.models import TeamSprintModel
+    from csse3200bot.database.ratelimit import RateLimitModel
+    from csse3200bot.gh.models import DiscordUserModel, RepoStateModel
+    from csse3200bot.studio.models import (
+        StudioBroadcastChannelModel,
+        StudioGuildModel,
+        StudioModel,
+        StudioSetupModel,
+    )
+    from csse3200bot.sync import CommandSyncModel
+    from csse3200bot.teams.models import (
+        ContributionCursorModel,
+        ContributionWeekModel,
+        PullRequestModel,
+        TeamSprintModel,
+    )
 
     async with engine.begin() as conn:
         await conn.run_sync(BaseDBModel.metadata.create_all)
@@ -3,6 +3,8 @@
 import logging
 from enum import StrEnum
 
+import discord
+
 
 class CsseEnum(StrEnum):
     """All enums should inherit from this one."""
@@ -26,3 +28,78 @@ class LogLevel(CsseEnum):
             LogLevel.debug: logging.DEBUG,
         }
         return mapping[self]
+
+
+class MemberCachePolicy(CsseEnum):
+    """Which guild members the bot keeps in memory."""
+
+    all = "ALL"  # every member seen
+    joined = "JOINED"  # members that joined while the bot was online, or were chunked
+    none = "NONE"  # only members needed for the current interaction/event
+
+    def get_flags(self) -> discord.MemberCacheFlags:
+        """Map the policy to discord's member cache flags."""
+        if self is MemberCachePolicy.all:
+            return discord.MemberCacheFlags.all()
+
+        flags = discord.MemberCacheFlags.none()
+        flags.joined = self is MemberCachePolicy.joined
+        return flags
+
+
+class RateLimitBackend(CsseEnum):
+    """Where command rate limits are kept."""
+
+    memory = "MEMORY"  # per process, lost on restart
+    database = "DATABASE"  # shared by every process using the database
+
+
+class RateLimitScope(CsseEnum):
+    """Who shares a command's rate limit."""
+
+    user = "USER"
+    guild = "GUILD"
+    global_ = "GLOBAL"
+
+
+class CommandSyncMode(CsseEnum):
+    """Where application commands are synced to at startup, only if they changed since last synced."""
+
+    none = "NONE"  # only synced with the !sync command
+    global_ = "GLOBAL"  # can take a while to show up in every guild
+    guilds = "GUILDS"  # copied to each of the configured guilds, show up straight away
+
+
+class BotExtension(CsseEnum):
+    """Features that can be enabled per deployment, each loaded as a discord.py extension."""
+
+    activity = "ACTIVITY"
+    gh = "GH"
+    greetings = "GREETINGS"
+    studio = "STUDIO"
+    teams = "TEAMS"
+
+    @property
+    def module(self) -> str:
+        """Module of the extension, its cog module."""
+        return f"csse3200bot.{self.value.lower()}.cog"
+
+
+class ExportTable(CsseEnum):
+    """Studio data that can be exported."""
+
+    sprints = "SPRINTS"  # features each team is doing each sprint
+    users = "USERS"  # github accounts linked to discord users
+    studios = "STUDIOS"  # studios, with a row for each of their guilds
+
+
+class ExportFormat(CsseEnum):
+    """File format of an export."""
+
+    csv = "CSV"
+    json = "JSON"
+
+    @property
+    def extension(self) -> str:
+        """File extension of the format."""
+        return self.value.lower()
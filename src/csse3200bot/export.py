@@ -0,0 +1,209 @@
+"""Exports of studio data as CSV or JSON, streamed from the database so a table is never loaded whole.
+
+Usage:
+    python src/csse3200bot/export.py sprints [--year 2025] [--studio 3] [--format json] [--output sprints.json]
+
+The database is the one in `DB_URL`, unless `--db-url` is given. Exports are written to stdout without `--output`.
+"""
+
+import argparse
+import asyncio
+import csv
+import datetime as dt
+import io
+import json
+import os
+import sys
+import time
+from collections.abc import AsyncIterable, AsyncIterator, Collection
+from pathlib import Path
+from typing import Any, TextIO
+from uuid import uuid4
+
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from csse3200bot.enums import ExportFormat, ExportTable
+from csse3200bot.gh.models import DiscordUserModel
+from csse3200bot.studio.models import StudioGuildModel, StudioModel
+from csse3200bot.teams.models import TeamSprintModel
+
+# Rows fetched from the cursor, and written, at a time
+EXPORT_CHUNK_SIZE = 500
+DEFAULT_EXPORT_DIR = Path("exports")
+
+EXPORT_COLUMNS: dict[ExportTable, list[str]] = {
+    ExportTable.sprints: ["studio_year", "studio_number", "team_number", "sprint_number", "description"],
+    ExportTable.users: ["discord_user_id", "gh_id", "updated_at"],
+    ExportTable.studios: ["studio_year", "studio_number", "repo_name", "guild_id", "created_at"],
+}
+
+ExportChunk = list[dict[str, Any]]
+
+
+def _export_statement(table: ExportTable, studio_year: int | None, studio_number: int | None) -> Select:
+    """Query for the rows of an export, users aren't linked to a studio so can't be filtered by one."""
+    if table is ExportTable.users:
+        return select(DiscordUserModel.discord_user_id, DiscordUserModel.gh_id, DiscordUserModel.updated_at).order_by(
+            DiscordUserModel.discord_user_id
+        )
+
+    stmt: Select
+    if table is ExportTable.sprints:
+        stmt = (
+            select(
+                StudioModel.studio_year,
+                StudioModel.studio_number,
+                TeamSprintModel.team_number,
+                TeamSprintModel.sprint_number,
+                TeamSprintModel.description,
+            )
+            .join(StudioModel, TeamSprintModel.studio_id == StudioModel.studio_id)
+            .order_by(
+                StudioModel.studio_year,
+                StudioModel.studio_number,
+                TeamSprintModel.sprint_number,
+                TeamSprintModel.team_number,
+            )
+        )
+    else:
+        stmt = (
+            select(
+                StudioModel.studio_year,
+                StudioModel.studio_number,
+                StudioModel.repo_name,
+                StudioGuildModel.guild_id,
+                StudioModel.created_at,
+            )
+            .outerjoin(StudioGuildModel, StudioGuildModel.studio_id == StudioModel.studio_id)
+            .order_by(StudioModel.studio_year, StudioModel.studio_number, StudioGuildModel.guild_id)
+        )
+    if studio_year is not None:
+        stmt = stmt.where(StudioModel.studio_year == studio_year)
+    if studio_number is not None:
+        stmt = stmt.where(StudioModel.studio_number == studio_number)
+    return stmt
+
+
+def _export_value(value: Any) -> Any:  # noqa: ANN401
+    return value.isoformat() if isinstance(value, dt.datetime) else value
+
+
+async def stream_export(
+    session: AsyncSession, table: ExportTable, studio_year: int | None = None, studio_number: int | None = None
+) -> AsyncIterator[ExportChunk]:
+    """Rows of an export in chunks, read from a server side cursor so only a chunk is in memory at once.
+
+    Only columns are selected, so the rows aren't tracked by the session either.
+    """
+    stmt = _export_statement(table, studio_year, studio_number).execution_options(yield_per=EXPORT_CHUNK_SIZE)
+    result = await session.stream(stmt)
+    async for partition in result.mappings().partitions():
+        yield [{key: _export_value(value) for key, value in row.items()} for row in partition]
+
+
+async def write_export(
+    chunks: AsyncIterable[ExportChunk], file: TextIO, table: ExportTable, export_format: ExportFormat
+) -> int:
+    """Write the chunks of an export to the file as they come, a chunk per write, returning the number of rows."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS[table])
+    if export_format is ExportFormat.csv:
+        writer.writeheader()
+    else:
+        buffer.write("[")
+
+    rows = 0
+    async for chunk in chunks:
+        if export_format is ExportFormat.csv:
+            writer.writerows(chunk)
+        else:
+            buffer.writelines(f"{',' if rows or i else ''}\n{json.dumps(row)}" for i, row in enumerate(chunk))
+        rows += len(chunk)
+        await _flush(buffer, file)
+    if export_format is ExportFormat.json:
+        buffer.write("\n]\n" if rows else "]\n")
+    await _flush(buffer, file)
+    return rows
+
+
+async def _flush(buffer: io.StringIO, file: TextIO) -> None:
+    """Write out the buffer in a thread, so a slow disk doesn't block the loop."""
+    await asyncio.to_thread(file.write, buffer.getvalue())
+    buffer.seek(0)
+    buffer.truncate()
+
+
+def export_path(
+    table: ExportTable, export_format: ExportFormat, guild_id: str | None = None, directory: Path = DEFAULT_EXPORT_DIR
+) -> Path:
+    """Path of a new export file, unique even when exports of the same table are made at once."""
+    scope = f"-{guild_id}" if guild_id is not None else ""
+    name = f"{table.value.lower()}{scope}-{time.strftime('%Y%m%d-%H%M%S')}-{uuid4().hex[:8]}"
+    return directory / f"{name}.{export_format.extension}"
+
+
+async def only_users(chunks: AsyncIterable[ExportChunk], user_ids: Collection[str]) -> AsyncIterator[ExportChunk]:
+    """Only the rows of a users export for the given users, e.g. the members of a studio's guild."""
+    async for chunk in chunks:
+        yield [row for row in chunk if row["discord_user_id"] in user_ids]
+
+
+async def export_to_file(  # noqa: PLR0913
+    session: AsyncSession,
+    path: Path,
+    table: ExportTable,
+    export_format: ExportFormat,
+    *,
+    studio_year: int | None = None,
+    studio_number: int | None = None,
+    user_ids: Collection[str] | None = None,
+) -> int:
+    """Export a table to a file, returning the number of rows.
+
+    Users exports are limited to `user_ids` when given, as users aren't linked to a studio.
+    """
+    chunks = stream_export(session, table, studio_year, studio_number)
+    if table is ExportTable.users and user_ids is not None:
+        chunks = only_users(chunks, user_ids)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", newline="", encoding="utf-8") as file:
+        return await write_export(chunks, file, table, export_format)
+
+
+async def _export(args: argparse.Namespace) -> None:
+    engine = create_async_engine(args.db_url)
+    try:
+        async with AsyncSession(engine) as session:
+            if args.output is not None:
+                rows = await export_to_file(
+                    session, args.output, args.table, args.format, studio_year=args.year, studio_number=args.studio
+                )
+                print(f"Exported {rows} row(s) to {args.output}", file=sys.stderr)  # noqa: T201
+                return
+            chunks = stream_export(session, args.table, args.year, args.studio)
+            await write_export(chunks, sys.stdout, args.table, args.format)
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    """Export entry point."""
+    parser = argparse.ArgumentParser(description="Export studio data as CSV or JSON")
+    parser.add_argument("table", type=lambda value: ExportTable(value.upper()), help="sprints, users or studios")
+    parser.add_argument("--year", type=int, help="only export studios of this year")
+    parser.add_argument("--studio", type=int, help="only export studios with this number")
+    parser.add_argument(
+        "--format", type=lambda value: ExportFormat(value.upper()), default=ExportFormat.csv, help="csv or json"
+    )
+    parser.add_argument("--output", type=Path, help="file to write to, defaults to stdout")
+    parser.add_argument("--db-url", default=os.environ.get("DB_URL"), help="defaults to DB_URL")
+    args = parser.parse_args()
+    if args.db_url is None:
+        parser.error("--db-url or DB_URL must be set")
+
+    asyncio.run(_export(args))
+
+
+if __name__ == "__main__":
+    main()
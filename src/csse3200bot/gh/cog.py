@@ -1,8 +1,10 @@
 """GitHub Repository Cog."""
 
 import asyncio
+import io
 import logging
-from collections.abc import Awaitable, Callable
+from collections.abc import Awaitable, Callable, Iterable, Sequence
+from typing import Any
 
 import discord
 from discord import app_commands
@@ -11,16 +13,54 @@ from github.GithubException import GithubException
 from github.NamedUser import NamedUser
 from github.Repository import Repository
 
-from csse3200bot.bot import CSSEBot
-from csse3200bot.gh.models import DiscordUserModel
-from csse3200bot.gh.service import create_or_update_user_model, get_user_model, get_user_model_by_gh
+from csse3200bot.bot import CACHE_SWEEP_INTERVAL, CSSEBot
+from csse3200bot.enums import RateLimitScope
+from csse3200bot.gh.models import DiscordUserModel, RepoStateModel
+from csse3200bot.gh.report import LinkedAccount, render_linked_accounts, render_roster_plan, render_roster_result
+from csse3200bot.gh.roster import (
+    RosterChange,
+    RosterFormatError,
+    RosterPlan,
+    RosterResult,
+    diff_roster,
+    parse_roster,
+    resolve_roster,
+)
+from csse3200bot.gh.service import (
+    create_or_update_user_model,
+    get_linked_user_models,
+    get_repo_state,
+    get_user_model,
+    get_user_model_by_gh,
+    get_user_models,
+    save_repo_state,
+    save_user_links,
+)
+from csse3200bot.gh.views import RosterImportView
+from csse3200bot.gh.webhooks import REPO_EVENTS, repo_state_from_payload, repo_state_from_repository
+from csse3200bot.interactions import auto_defer, rate_limit, respond
 from csse3200bot.studio.utils import studio_required
+from csse3200bot.teams.views import PaginatorView
 from csse3200bot.utils import AsyncCache, SyncCache
 
 # Ref guide for Github Python Lib - https://pygithub.readthedocs.io/en/stable/reference.html
 
 log = logging.getLogger(__name__)
 
+USERS_NAMESPACE = "gh.users"
+REPOS_NAMESPACE = "gh.repos"
+
+# Background job intervals (seconds)
+MEMBERS_REFRESH_INTERVAL = 1800
+REPOS_REFRESH_INTERVAL = 600
+
+# Github lookups in flight at once when resolving many users
+GH_LOOKUP_CONCURRENCY = 8
+
+# Members having their team role updated at once by a roster import, discord.py waits out the rate limits
+ROLE_UPDATE_CONCURRENCY = 4
+MAX_ROSTER_BYTES = 1024 * 1024
+
 
 class GitHubCog(commands.GroupCog, name="gh"):
     """GitHub cog."""
@@ -29,9 +69,11 @@ class GitHubCog(commands.GroupCog, name="gh"):
 
     # Repos
     _repo_cache: SyncCache[str, Repository]
+    _repo_state_cache: AsyncCache[str, RepoStateModel]  # from webhooks, preferred over the API
 
     # Users
     _gh_users: dict[str, str]  # (name, id)
+    _gh_logins: dict[str, str]  # (id, name)
     _user_cache: AsyncCache[str, DiscordUserModel]
 
     def __init__(self, bot: CSSEBot) -> None:
@@ -40,10 +82,12 @@ class GitHubCog(commands.GroupCog, name="gh"):
 
         # Repos
         self._repo_cache = SyncCache[str, Repository](self._get_repo_wrapper())
+        self._repo_state_cache = AsyncCache[str, RepoStateModel](self._get_repo_state_wrapper(), ttl=bot.cache_ttl)
 
         # Users
         self._gh_users = {}
-        self._user_cache = AsyncCache[str, DiscordUserModel](self._get_user_wrapper())
+        self._gh_logins = {}
+        self._user_cache = AsyncCache[str, DiscordUserModel](self._get_user_wrapper(), ttl=bot.cache_ttl)
         self._gh_user_cache = SyncCache[str, NamedUser](self._get_gh_user_wrapper())
 
     def _get_repo_wrapper(self) -> Callable[[str], Repository | None]:
@@ -58,6 +102,15 @@ class GitHubCog(commands.GroupCog, name="gh"):
 
         return fetch
 
+    def _get_repo_state_wrapper(self) -> Callable[[str], Awaitable[RepoStateModel | None]]:
+        """A wrapper for getting a repo's state."""
+
+        async def fetch(repository_name: str) -> RepoStateModel | None:
+            async with self._bot.get_db() as session:
+                return await get_repo_state(session, repository_name)
+
+        return fetch
+
     def _get_user_wrapper(self) -> Callable[[str], Awaitable[DiscordUserModel | None]]:
         """A wrapper for getting a user model."""
 
@@ -82,31 +135,171 @@ class GitHubCog(commands.GroupCog, name="gh"):
     async def cog_load(self) -> None:
         """Load cog."""
         await super().cog_load()
+        self._bot.invalidation_bus.subscribe(USERS_NAMESPACE, self._user_cache.remove, self._user_cache.clear)
+        self._bot.invalidation_bus.subscribe(
+            REPOS_NAMESPACE, self._repo_state_cache.remove, self._repo_state_cache.clear
+        )
         await self._load_members()
 
+        scheduler = self._bot.scheduler
+        scheduler.add_job("gh.refresh_members", self._load_members, MEMBERS_REFRESH_INTERVAL)
+        scheduler.add_job("gh.refresh_repos", self._refresh_repos, REPOS_REFRESH_INTERVAL)
+        scheduler.add_job("gh.sweep_caches", self._sweep_caches, CACHE_SWEEP_INTERVAL)
+
+    async def cog_unload(self) -> None:
+        """Unload cog."""
+        self._bot.invalidation_bus.unsubscribe(USERS_NAMESPACE, self._user_cache.remove)
+        self._bot.invalidation_bus.unsubscribe(REPOS_NAMESPACE, self._repo_state_cache.remove)
+        for job in ("gh.refresh_members", "gh.refresh_repos", "gh.sweep_caches"):
+            self._bot.scheduler.remove_job(job)
+        await super().cog_unload()
+
+    async def _refresh_repos(self) -> None:
+        """Refetch the repos that are in use, so repo_info doesn't have to."""
+        for repo_name in self._repo_cache.cached_keys():
+            await asyncio.to_thread(self._repo_cache.refresh, repo_name)
+
+    async def _sweep_caches(self) -> None:
+        self._repo_cache.purge_expired()
+        self._repo_state_cache.purge_expired()
+        self._user_cache.purge_expired()
+        self._gh_user_cache.purge_expired()
+
     async def _load_members(self) -> None:
         try:
-            users = await asyncio.to_thread(self._bot.github_org.get_members)
+            # the paginated list only makes requests when iterated, so do that in the thread too
+            users = await asyncio.to_thread(lambda: list(self._bot.github_org.get_members()))
             self._gh_users = {str(user.login): str(user.id) for user in users}
+            self._gh_logins = {gh_id: login for login, gh_id in self._gh_users.items()}
             log.info(f"Loaded {len(self._gh_users)} github users")
         except GithubException:
             log.exception("Couldn't find members for github org'")
             return
 
+    @commands.Cog.listener()
+    async def on_github_webhook(self, event: str, payload: dict[str, Any]) -> None:
+        """Listener for github webhook deliveries, dispatched by the http server."""
+        await self.handle_webhook(event, payload)
+
+    async def handle_webhook(self, event: str, payload: dict[str, Any]) -> None:
+        """Update the state of the repo from a github webhook delivery."""
+        if event not in REPO_EVENTS or "repository" not in payload:
+            log.debug(f"Ignoring github '{event}' event")
+            return
+
+        async with self._bot.get_db() as session:
+            state = await save_repo_state(session, repo_state_from_payload(payload["repository"]))
+            await self._bot.invalidation_bus.publish(session, REPOS_NAMESPACE, state.repo_name)
+        self._repo_state_cache.set(state.repo_name, state)
+        log.info(f"Updated state of repo '{state.repo_name}' from '{event}' event")
+
+    async def _get_repo_state(self, repo_name: str) -> RepoStateModel | None:
+        """State of the repo, from webhooks if they have been received for it, otherwise from the API."""
+        state = await self._repo_state_cache.get(repo_name)
+        if state is not None:
+            return state
+
+        repo = await asyncio.to_thread(self._repo_cache.get, repo_name)
+        return RepoStateModel(**repo_state_from_repository(repo)) if repo is not None else None
+
+    async def _resolve_logins(self, gh_ids: Sequence[str]) -> dict[str, str]:
+        """Logins of the github users, taken from the org's members where possible.
+
+        Users who aren't in the org (anymore) are looked up with a bounded number of requests in parallel,
+        ids that can't be found are left out.
+        """
+        logins = {gh_id: self._gh_logins[gh_id] for gh_id in gh_ids if gh_id in self._gh_logins}
+        missing = [gh_id for gh_id in gh_ids if gh_id not in logins]
+        semaphore = asyncio.Semaphore(GH_LOOKUP_CONCURRENCY)
+
+        async def lookup(gh_id: str) -> None:
+            async with semaphore:
+                gh_user = await asyncio.to_thread(self._gh_user_cache.get, gh_id)
+            if gh_user is not None:
+                logins[gh_id] = gh_user.login
+
+        if missing:
+            log.info(f"Looking up {len(missing)} github users outside the org")
+            await asyncio.gather(*(lookup(gh_id) for gh_id in missing))
+        return logins
+
+    async def plan_roster(self, guild: discord.Guild, lines: Iterable[str]) -> RosterPlan:
+        """Dry run of importing a CSV roster into the guild, parsing the lines as they're read.
+
+        Raises:
+            RosterFormatError: when the roster isn't a CSV with the expected columns
+        """
+        role_index = self._bot.get_role_index(guild)
+        members = await self._bot.get_guild_members(guild)
+        rows, errors = resolve_roster(parse_roster(lines), members, role_index, self._gh_users)
+
+        user_ids = [str(row["member"].id) for row in rows]
+        gh_ids = [row["gh_id"] for row in rows if row["gh_id"] is not None]
+        async with self._bot.get_db() as session:
+            models = await get_linked_user_models(session, user_ids, gh_ids)
+        plan = diff_roster(rows, role_index, {model.discord_user_id: model.gh_id for model in models})
+        plan["errors"] = errors + plan["errors"]
+        return plan
+
+    async def apply_roster(self, guild: discord.Guild, plan: RosterPlan) -> RosterResult:
+        """Import a roster into the guild, linking the github users in one transaction then updating team roles.
+
+        Each member's roles are updated with a single request, a bounded number at a time so a large roster doesn't
+        hog the guild's rate limits.
+        """
+        links = {
+            str(change["member_id"]): change["new_gh_id"]
+            for change in plan["changes"]
+            if change["new_gh_id"] is not None
+        }
+        async with self._bot.get_db() as session:
+            await save_user_links(session, links)
+            for user_id in links:
+                await self._bot.invalidation_bus.publish(session, USERS_NAMESPACE, user_id)
+        for user_id in links:
+            self._user_cache.remove(user_id)
+
+        failures: list[str] = []
+        semaphore = asyncio.Semaphore(ROLE_UPDATE_CONCURRENCY)
+
+        async def assign(change: RosterChange) -> bool:
+            async with semaphore:
+                member = await self._bot.find_member(guild, change["member_id"])
+                team = guild.get_role(change["new_team_id"]) if change["new_team_id"] is not None else None
+                if member is None or team is None:
+                    failures.append(f"Line {change['line']}: <@{change['member_id']}> or their team has gone")
+                    return False
+                # the first role is @everyone, which members can't be given
+                roles = [role for role in member.roles[1:] if role.id != change["old_team_id"]]
+                try:
+                    await member.edit(roles=[*roles, team], reason="Assigned to a team by a roster import")
+                except discord.HTTPException:
+                    log.exception(f"Couldn't assign member {member.id} to '{team.name}'")
+                    failures.append(f"Line {change['line']}: couldn't assign {member.mention} to {team.mention}")
+                    return False
+                return True
+
+        assigned = await asyncio.gather(
+            *(assign(change) for change in plan["changes"] if change["new_team_id"] is not None)
+        )
+        log.info(f"Imported roster into guild {guild.id}: {len(links)} linked, {sum(assigned)} assigned")
+        return {"linked": len(links), "assigned": sum(assigned), "failures": failures}
+
     @app_commands.command(name="get")
-    @app_commands.checks.cooldown(1, 5.0, key=lambda i: (i.user.id))
+    @rate_limit(1, 5.0)
+    @auto_defer()
     async def get_gh(self, interaction: discord.Interaction) -> None:
         """Get the github account linked to your discord account."""
         user_id: str = str(interaction.user.id)
         existing = await self._user_cache.get(user_id)
 
         if existing is None or existing.gh_id is None:
-            await interaction.response.send_message("You haven't added your github yet with `/set_gh`.")
+            await respond(interaction, "You haven't added your github yet with `/set_gh`.")
             return
 
-        gh_user = self._gh_user_cache.get(existing.gh_id)
+        gh_user = await asyncio.to_thread(self._gh_user_cache.get, existing.gh_id)
         if gh_user is None:
-            await interaction.response.send_message("The linked github account cannot be found.")
+            await respond(interaction, "The linked github account cannot be found.")
             return
 
         embed = discord.Embed(
@@ -124,7 +317,7 @@ class GitHubCog(commands.GroupCog, name="gh"):
 
         embed.set_footer(text=f"GitHub since {gh_user.created_at.strftime('%B %Y')} 🚀")
 
-        await interaction.response.send_message(embed=embed)
+        await respond(interaction, embed=embed)
 
     @app_commands.command(name="set")
     async def set_gh(self, interaction: discord.Interaction, gh_username: str) -> None:
@@ -154,21 +347,23 @@ class GitHubCog(commands.GroupCog, name="gh"):
         # Github user is already linked
         if existing_gh is not None:
             log.info("Github user is already linked")
-            gh_holder = self._bot.get_user(int(existing_gh.discord_user_id))
-            if gh_holder is not None:
+            # links are shared by every studio, so the holder may be in another of the bot's guilds
+            holder_id = int(existing_gh.discord_user_id)
+            if not await self._bot.has_left(holder_id):
                 await interaction.followup.send(
-                    f"That github user is already associated with {gh_holder.mention}", ephemeral=True
+                    f"That github user is already associated with <@{holder_id}>", ephemeral=True
                 )
                 return
 
-            # They don't exist in the server anymore
+            # They aren't in any of the bot's servers anymore
             await interaction.followup.send(
                 "That github user is associated with a user who has left - unsetting them now, try again in a bit",
                 ephemeral=True,
             )
             async with self._bot.get_db() as session:  # opening this again is yuck
                 result = await create_or_update_user_model(session, existing_gh.discord_user_id, None)
-                self._user_cache.set(user_id, result)
+                await self._bot.invalidation_bus.publish(session, USERS_NAMESPACE, existing_gh.discord_user_id)
+                self._user_cache.set(existing_gh.discord_user_id, result)
             return
 
         # they've already got a github user set
@@ -182,6 +377,7 @@ class GitHubCog(commands.GroupCog, name="gh"):
         # At this point, user doesn't have github and no one has got that account yet
         async with self._bot.get_db() as session:  # opening this again is yuck
             result = await create_or_update_user_model(session, user_id, gh_user_id)
+            await self._bot.invalidation_bus.publish(session, USERS_NAMESPACE, user_id)
             self._user_cache.set(user_id, result)
         await interaction.followup.send(f"You have now set your github account to '{gh_username}'.", ephemeral=True)
 
@@ -204,9 +400,89 @@ class GitHubCog(commands.GroupCog, name="gh"):
 
         async with self._bot.get_db() as session:
             result = await create_or_update_user_model(session, user_id, None)
+            await self._bot.invalidation_bus.publish(session, USERS_NAMESPACE, user_id)
             self._user_cache.set(user_id, result)
         await interaction.followup.send(f"{member.mention}'s has been unassociated from a github user.", ephemeral=True)
 
+    @app_commands.command(name="list")
+    @app_commands.describe(role="Only list members with this role, defaults to the student role")
+    @app_commands.checks.has_permissions(manage_guild=True)
+    @auto_defer(ephemeral=True)
+    async def list_gh(self, interaction: discord.Interaction, role: discord.Role | None = None) -> None:
+        """List the github accounts linked to members of a role - Staff Only."""
+        guild = interaction.guild
+        if guild is None:
+            await respond(interaction, "Must be used in a server.", ephemeral=True)
+            return
+
+        role = role or self._bot.get_role_index(guild).student_role
+        members = [
+            member
+            for member in await self._bot.get_guild_members(guild)
+            if not member.bot and (role is None or member.get_role(role.id) is not None)
+        ]
+
+        async with self._bot.get_db() as session:
+            models = await get_user_models(session, [str(member.id) for member in members])
+        gh_ids = {model.discord_user_id: model.gh_id for model in models if model.gh_id is not None}
+        logins = await self._resolve_logins(list(gh_ids.values()))
+
+        accounts: list[LinkedAccount] = []
+        for member in members:
+            gh_id = gh_ids.get(str(member.id))
+            accounts.append(
+                {
+                    "member_id": member.id,
+                    "display_name": member.display_name,
+                    "gh_login": logins.get(gh_id) if gh_id is not None else None,
+                }
+            )
+
+        title = f"Linked GitHub accounts - {role.name if role is not None else guild.name}"
+        pages = render_linked_accounts(title, accounts)
+        if len(pages) == 1:
+            await respond(interaction, embed=pages[0], ephemeral=True)
+            return
+
+        view = PaginatorView(pages)
+        await respond(interaction, embed=view.first_page, view=view, ephemeral=True)
+
+    @app_commands.command(
+        name="import_roster", description="Link members to github users and teams from a CSV roster - Staff Only"
+    )
+    @app_commands.describe(roster="CSV with a discord (id or username) column, and a team and/or github column")
+    @app_commands.checks.has_permissions(manage_guild=True)
+    @auto_defer(ephemeral=True)
+    async def import_roster(self, interaction: discord.Interaction, roster: discord.Attachment) -> None:
+        """Show what importing a roster would change, and import it once confirmed - Staff Only."""
+        guild = interaction.guild
+        if guild is None:
+            await respond(interaction, "Must be used in a server.", ephemeral=True)
+            return
+        if roster.size > MAX_ROSTER_BYTES:
+            await respond(interaction, f"Rosters are limited to {MAX_ROSTER_BYTES // 1024}KB.", ephemeral=True)
+            return
+
+        try:
+            data = await roster.read()
+            plan = await self.plan_roster(guild, io.StringIO(data.decode("utf-8-sig")))
+        except (discord.HTTPException, UnicodeDecodeError, RosterFormatError) as e:
+            log.info(f"Couldn't read roster '{roster.filename}': {e}")
+            await respond(interaction, f"Couldn't read the roster: {e}", ephemeral=True)
+            return
+
+        pages = render_roster_plan(plan)
+        if not plan["changes"]:
+            view = PaginatorView(pages)
+            await respond(interaction, embed=view.first_page, view=view, ephemeral=True)
+            return
+
+        async def apply() -> discord.Embed:
+            return render_roster_result(await self.apply_roster(guild, plan))
+
+        import_view = RosterImportView(pages, interaction.user.id, apply)
+        await respond(interaction, embed=import_view.first_page, view=import_view, ephemeral=True)
+
     @app_commands.command(name="refresh")
     @app_commands.checks.has_permissions(manage_guild=True)
     async def refresh_gh_names(self, interaction: discord.Interaction) -> None:
@@ -217,7 +493,8 @@ class GitHubCog(commands.GroupCog, name="gh"):
         await interaction.followup.send("All github members in the org have been refreshed", ephemeral=True)
 
     @app_commands.command(name="repo_info")
-    @app_commands.checks.cooldown(1, 5.0, key=lambda i: (i.guild_id))
+    @rate_limit(1, 5.0, RateLimitScope.guild)
+    @auto_defer()
     @studio_required
     async def repo_info(self, interaction: discord.Interaction) -> None:
         """Get information about your studio's repository."""
@@ -225,19 +502,19 @@ class GitHubCog(commands.GroupCog, name="gh"):
         if guild is None:
             msg = "Get Repo command must be used in a guild"
             log.warning(msg)
-            await interaction.response.send_message(msg, ephemeral=True)
+            await respond(interaction, msg, ephemeral=True)
             return
 
         studio = await self._bot.get_studio(guild)
         if studio is None:
             msg = "Can't use this command until the studio is setup with the bot"
-            await interaction.response.send_message(msg, ephemeral=True)
+            await respond(interaction, msg, ephemeral=True)
             return
 
-        repo = self._repo_cache.get(studio.repo_name)
+        repo = await self._get_repo_state(studio.repo_name)
         if repo is None:
             msg = f"Unable to find repository '{studio.repo_name}' in github org"
-            await interaction.response.send_message(msg, ephemeral=True)
+            await respond(interaction, msg, ephemeral=True)
             return
 
         embed = discord.Embed(
@@ -247,21 +524,31 @@ class GitHubCog(commands.GroupCog, name="gh"):
             color=discord.Color.blue(),
         )
 
+        watchers = str(repo.subscribers_count) if repo.subscribers_count is not None else "-"
         embed.add_field(name="⭐ Stars", value=str(repo.stargazers_count), inline=True)
         embed.add_field(name="🍴 Forks", value=str(repo.forks_count), inline=True)
-        embed.add_field(name="👀 Watchers", value=str(repo.subscribers_count), inline=True)
+        embed.add_field(name="👀 Watchers", value=watchers, inline=True)
         embed.add_field(name="🧑‍💻 Open Issues", value=str(repo.open_issues_count), inline=True)
-        embed.add_field(name="📅 Created At", value=discord.utils.format_dt(repo.created_at, style="D"), inline=True)
-        embed.add_field(name="🛠 Updated At", value=discord.utils.format_dt(repo.updated_at, style="R"), inline=True)
+        embed.add_field(
+            name="📅 Created At", value=discord.utils.format_dt(repo.repo_created_at, style="D"), inline=True
+        )
+        embed.add_field(
+            name="🛠 Updated At", value=discord.utils.format_dt(repo.repo_updated_at, style="R"), inline=True
+        )
 
         # This should always be true
-        if repo.organization and repo.organization.avatar_url:
-            embed.set_thumbnail(url=repo.organization.avatar_url)
+        if repo.owner_avatar_url:
+            embed.set_thumbnail(url=repo.owner_avatar_url)
 
-        await interaction.response.send_message(embed=embed)
+        await respond(interaction, embed=embed)
 
     @repo_info.error
     async def on_repo_info_error(self, interaction: discord.Interaction, error: app_commands.AppCommandError) -> None:
         """On error for repo info command."""
         if isinstance(error, app_commands.CommandOnCooldown):
-            await interaction.response.send_message(str(error), ephemeral=True)
+            await respond(interaction, str(error), ephemeral=True)
+
+
+async def setup(bot: CSSEBot) -> None:
+    """Extension entry point."""
+    await bot.add_cog(GitHubCog(bot))
@@ -1,5 +1,8 @@
 """Studio db models."""
 
+import datetime as dt
+
+from sqlalchemy import DateTime as SQLDatetime
 from sqlalchemy import UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -16,3 +19,22 @@ class DiscordUserModel(BaseDBModel, TimestampMixin):
     discord_user_id: Mapped[str] = mapped_column(primary_key=True)
 
     gh_id: Mapped[str | None]
+
+
+class RepoStateModel(BaseDBModel, TimestampMixin):
+    """DB Model for the state of a github repository, kept up to date by github webhooks."""
+
+    __tablename__ = "github_repo_state"
+
+    repo_name: Mapped[str] = mapped_column(primary_key=True)
+
+    full_name: Mapped[str]
+    html_url: Mapped[str]
+    description: Mapped[str | None]
+    stargazers_count: Mapped[int]
+    forks_count: Mapped[int]
+    subscribers_count: Mapped[int | None]  # not included in webhook payloads
+    open_issues_count: Mapped[int]
+    repo_created_at: Mapped[dt.datetime] = mapped_column(SQLDatetime(timezone=True))
+    repo_updated_at: Mapped[dt.datetime] = mapped_column(SQLDatetime(timezone=True))
+    owner_avatar_url: Mapped[str | None]
@@ -0,0 +1,98 @@
+"""Linked accounts report rendering."""
+
+from collections.abc import Sequence
+from typing import TypedDict
+
+import discord
+
+from csse3200bot.gh.roster import RosterChange, RosterPlan, RosterResult
+
+# Lines per page, keeps each page well under the embed description limit
+ACCOUNTS_PER_PAGE = 25
+
+REPORT_COLOUR = 0x24292E
+ERROR_COLOUR = 0xFF0000
+
+
+class LinkedAccount(TypedDict):
+    """A member and the github account linked to them."""
+
+    member_id: int
+    display_name: str
+    gh_login: str | None  # None when not linked, or the linked account couldn't be found
+
+
+def _format_account(account: LinkedAccount) -> str:
+    if account["gh_login"] is None:
+        return f"<@{account['member_id']}> - *not linked*"
+    login = account["gh_login"]
+    return f"<@{account['member_id']}> - [{login}](https://github.com/{login})"
+
+
+def render_linked_accounts(title: str, accounts: Sequence[LinkedAccount]) -> list[discord.Embed]:
+    """Render the accounts as pages of embeds, unlinked members first so they're easy to chase up."""
+    ordered = sorted(accounts, key=lambda account: (account["gh_login"] is not None, account["display_name"].lower()))
+    linked = sum(account["gh_login"] is not None for account in accounts)
+    num_pages = max(1, -(-len(ordered) // ACCOUNTS_PER_PAGE))
+
+    pages = []
+    for num in range(num_pages):
+        chunk = ordered[num * ACCOUNTS_PER_PAGE : (num + 1) * ACCOUNTS_PER_PAGE]
+        page = discord.Embed(
+            title=title,
+            description="\n".join(_format_account(account) for account in chunk) or "No members",
+            color=REPORT_COLOUR,
+        )
+        footer = f"{linked}/{len(accounts)} linked"
+        if num_pages > 1:
+            footer += f" • Page {num + 1}/{num_pages}"
+        page.set_footer(text=footer)
+        pages.append(page)
+    return pages
+
+
+def _format_change(change: RosterChange) -> str:
+    parts = []
+    if change["new_team_id"] is not None:
+        old_team = f"<@&{change['old_team_id']}>" if change["old_team_id"] is not None else "*no team*"
+        parts.append(f"{old_team} → <@&{change['new_team_id']}>")
+    if change["gh_login"] is not None:
+        login = change["gh_login"]
+        relinked = " (relinked)" if change["old_gh_id"] is not None else ""
+        parts.append(f"[{login}](https://github.com/{login}){relinked}")
+    return f"<@{change['member_id']}>: {' • '.join(parts)}"
+
+
+def render_roster_plan(plan: RosterPlan) -> list[discord.Embed]:
+    """Render the changes a roster import would make as pages of embeds, the rows that can't be imported first."""
+    lines = [f"⚠️ {error}" for error in plan["errors"]]
+    lines.extend(_format_change(change) for change in plan["changes"])
+    num_pages = max(1, -(-len(lines) // ACCOUNTS_PER_PAGE))
+
+    pages = []
+    for num in range(num_pages):
+        chunk = lines[num * ACCOUNTS_PER_PAGE : (num + 1) * ACCOUNTS_PER_PAGE]
+        page = discord.Embed(
+            title="Roster import - dry run",
+            description="\n".join(chunk) or "Nothing to change",
+            color=ERROR_COLOUR if plan["errors"] else REPORT_COLOUR,
+        )
+        footer = f"{len(plan['changes'])} to change, {plan['unchanged']} unchanged, {len(plan['errors'])} error(s)"
+        if num_pages > 1:
+            footer += f" • Page {num + 1}/{num_pages}"
+        page.set_footer(text=footer)
+        pages.append(page)
+    return pages
+
+
+def render_roster_result(result: RosterResult) -> discord.Embed:
+    """Render what a roster import changed."""
+    failures = "\n".join(f"⚠️ {failure}" for failure in result["failures"][:ACCOUNTS_PER_PAGE])
+    if len(result["failures"]) > ACCOUNTS_PER_PAGE:
+        failures += f"\n…and {len(result['failures']) - ACCOUNTS_PER_PAGE} more"
+    return discord.Embed(
+        title="Roster imported",
+        description=f"Linked {result['linked']} github account(s) and assigned {result['assigned']} team(s)."
+        + (f"\n\n{failures}" if failures else ""),
+        color=ERROR_COLOUR if result["failures"] else REPORT_COLOUR,
+    )
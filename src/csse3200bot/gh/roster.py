@@ -0,0 +1,218 @@
+"""Roster imports, linking many members to github accounts and teams at once."""
+
+import csv
+import re
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from typing import TypedDict
+
+import discord
+
+from csse3200bot.teams.utils import TEAM_PREFIX, GuildRoleIndex
+
+MAX_ROSTER_ROWS = 2000
+DISCORD_COLUMN = "discord"
+TEAM_COLUMN = "team"
+GITHUB_COLUMN = "github"
+
+_MENTION = re.compile(r"<@!?(\d+)>")
+
+
+class RosterFormatError(ValueError):
+    """The roster isn't a CSV with the expected columns."""
+
+
+class RosterRow(TypedDict):
+    """A row of a roster, blank cells are None."""
+
+    line: int
+    discord: str  # discord id, mention or username
+    team: str | None  # team name or number
+    github: str | None  # github login
+
+
+class ResolvedRow(TypedDict):
+    """A row of a roster, resolved to the member, team role and github account it names."""
+
+    line: int
+    member: discord.Member
+    team_id: int | None
+    gh_id: str | None
+    gh_login: str | None
+
+
+class RosterChange(TypedDict):
+    """What importing a row changes for a member."""
+
+    line: int
+    member_id: int
+    old_team_id: int | None
+    new_team_id: int | None  # None when the team is unchanged
+    old_gh_id: str | None
+    new_gh_id: str | None  # None when the github account is unchanged
+    gh_login: str | None  # login of new_gh_id
+
+
+class RosterPlan(TypedDict):
+    """The changes importing a roster would make, and the rows that can't be imported."""
+
+    changes: list[RosterChange]
+    unchanged: int
+    errors: list[str]
+
+
+class RosterResult(TypedDict):
+    """What importing a roster changed."""
+
+    linked: int
+    assigned: int
+    failures: list[str]
+
+
+def parse_roster(lines: Iterable[str]) -> Iterator[RosterRow]:
+    """Parse the rows of a CSV roster as they're read, skipping blank ones.
+
+    The header must have a `discord` column, and a `team` and/or `github` column, other columns are ignored.
+
+    Raises:
+        RosterFormatError: when the header is missing a column, or there are too many rows
+    """
+    reader = csv.reader(lines)
+    header = [column.strip().lower() for column in next(reader, [])]
+    if DISCORD_COLUMN not in header or not {TEAM_COLUMN, GITHUB_COLUMN} & set(header):
+        msg = f"the header must have a '{DISCORD_COLUMN}' column and a '{TEAM_COLUMN}' or '{GITHUB_COLUMN}' column"
+        raise RosterFormatError(msg)
+    columns = {name: header.index(name) for name in (DISCORD_COLUMN, TEAM_COLUMN, GITHUB_COLUMN) if name in header}
+
+    def cell(row: list[str], name: str) -> str | None:
+        index = columns.get(name)
+        value = row[index].strip() if index is not None and index < len(row) else ""
+        return value or None
+
+    rows = 0
+    for row in reader:
+        discord_value = cell(row, DISCORD_COLUMN)
+        if discord_value is None:
+            continue
+        rows += 1
+        if rows > MAX_ROSTER_ROWS:
+            msg = f"rosters are limited to {MAX_ROSTER_ROWS} rows"
+            raise RosterFormatError(msg)
+        yield {
+            "line": reader.line_num,
+            "discord": discord_value,
+            "team": cell(row, TEAM_COLUMN),
+            "github": cell(row, GITHUB_COLUMN),
+        }
+
+
+def _team_name(value: str) -> str:
+    """Team numbers are short for the team role, e.g. '3' is 'Team 3'."""
+    return f"{TEAM_PREFIX}{value}" if value.isdigit() else value
+
+
+def resolve_roster(
+    rows: Iterable[RosterRow],
+    members: Sequence[discord.Member],
+    role_index: GuildRoleIndex,
+    gh_users: Mapping[str, str],
+) -> tuple[list[ResolvedRow], list[str]]:
+    """Resolve each row to a member, team role and github account, returning them and the rows that can't be.
+
+    `gh_users` maps the logins of the org's members to their ids. Members are matched by id, mention or username,
+    and logins case insensitively. Rows naming a member or github account already named are left out.
+    """
+    by_id = {member.id: member for member in members}
+    by_name = {member.name.lower(): member for member in members}
+    logins = {login.lower(): (login, gh_id) for login, gh_id in gh_users.items()}
+
+    resolved: list[ResolvedRow] = []
+    errors: list[str] = []
+    seen_members: set[int] = set()
+    seen_logins: set[str] = set()
+    for row in rows:
+        line, value = row["line"], row["discord"]
+        mention = _MENTION.fullmatch(value)
+        user_id = mention.group(1) if mention is not None else value
+        member = by_id.get(int(user_id)) if user_id.isdigit() else by_name.get(value.lower())
+        if member is None:
+            errors.append(f"Line {line}: no member '{value}' in the server")
+            continue
+        if member.id in seen_members:
+            errors.append(f"Line {line}: {member.mention} is listed more than once")
+            continue
+        seen_members.add(member.id)
+
+        team_id = None
+        if row["team"] is not None:
+            team = role_index.get_team_role(_team_name(row["team"]))
+            if team is None:
+                errors.append(f"Line {line}: no team '{row['team']}'")
+                continue
+            team_id = team.id
+
+        gh_login, gh_id = None, None
+        if row["github"] is not None:
+            key = row["github"].lower()
+            if key not in logins:
+                errors.append(f"Line {line}: no github user '{row['github']}' in the org")
+                continue
+            if key in seen_logins:
+                errors.append(f"Line {line}: github user '{row['github']}' is listed more than once")
+                continue
+            seen_logins.add(key)
+            gh_login, gh_id = logins[key]
+
+        resolved.append({"line": line, "member": member, "team_id": team_id, "gh_id": gh_id, "gh_login": gh_login})
+    return resolved, errors
+
+
+def diff_roster(rows: Sequence[ResolvedRow], role_index: GuildRoleIndex, links: Mapping[str, str | None]) -> RosterPlan:
+    """Changes importing the rows would make, given the current links of the members and their github accounts.
+
+    `links` maps discord user ids to linked github ids, and must include whoever the rows' accounts are linked to.
+    An account linked to someone else can only be taken if the roster links them to a different account.
+    """
+    holders = {gh_id: user_id for user_id, gh_id in links.items() if gh_id is not None}
+    relinks = {
+        str(row["member"].id): row["gh_id"]
+        for row in rows
+        if row["gh_id"] is not None and row["gh_id"] != links.get(str(row["member"].id))
+    }
+    # taking an account is only allowed while its holder is relinked, which may itself be refused
+    refused: set[str] = set()
+    while True:
+        taken = {user_id for user_id, gh_id in relinks.items() if holders.get(gh_id, user_id) not in relinks}
+        if not taken:
+            break
+        refused |= taken
+        for user_id in taken:
+            del relinks[user_id]
+
+    plan: RosterPlan = {"changes": [], "unchanged": 0, "errors": []}
+    for row in rows:
+        member = row["member"]
+        current_team = role_index.get_member_team(member)
+        old_team_id = current_team.id if current_team is not None else None
+        new_team_id = row["team_id"] if row["team_id"] != old_team_id else None
+
+        old_gh_id = links.get(str(member.id))
+        new_gh_id = relinks.get(str(member.id))
+        if str(member.id) in refused and row["gh_id"] is not None:
+            holder = holders[row["gh_id"]]
+            plan["errors"].append(f"Line {row['line']}: github user '{row['gh_login']}' is linked to <@{holder}>")
+
+        if new_team_id is None and new_gh_id is None:
+            plan["unchanged"] += 1
+            continue
+        plan["changes"].append(
+            {
+                "line": row["line"],
+                "member_id": member.id,
+                "old_team_id": old_team_id,
+                "new_team_id": new_team_id,
+                "old_gh_id": old_gh_id,
+                "new_gh_id": new_gh_id,
+                "gh_login": row["gh_login"] if new_gh_id is not None else None,
+            }
+        )
+    return plan
@@ -1,9 +1,13 @@
 """Github services."""
 
-from sqlalchemy import select
+from collections.abc import Mapping, Sequence
+
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from csse3200bot.gh.models import DiscordUserModel
+from csse3200bot.gh.models import DiscordUserModel, RepoStateModel
+from csse3200bot.gh.webhooks import RepoState
 
 
 async def get_user_model(session: AsyncSession, user_id: str) -> DiscordUserModel | None:
@@ -11,6 +15,28 @@ async def get_user_model(session: AsyncSession, user_id: str) -> DiscordUserMode
     return await session.get(DiscordUserModel, user_id)
 
 
+async def get_user_models(session: AsyncSession, user_ids: Sequence[str]) -> Sequence[DiscordUserModel]:
+    """Get the discord user models of many users in one query, users without one are left out."""
+    if not user_ids:
+        return []
+    stmt = select(DiscordUserModel).where(DiscordUserModel.discord_user_id.in_(user_ids))
+    result = await session.execute(stmt)
+    return result.scalars().all()
+
+
+async def get_linked_user_models(
+    session: AsyncSession, user_ids: Sequence[str], gh_ids: Sequence[str]
+) -> Sequence[DiscordUserModel]:
+    """Get the discord user models of the users, and of whoever the github users are linked to, in one query."""
+    if not user_ids and not gh_ids:
+        return []
+    stmt = select(DiscordUserModel).where(
+        or_(DiscordUserModel.discord_user_id.in_(user_ids), DiscordUserModel.gh_id.in_(gh_ids))
+    )
+    result = await session.execute(stmt)
+    return result.scalars().all()
+
+
 async def get_user_model_by_gh(session: AsyncSession, gh_id: str) -> DiscordUserModel | None:
     """Get a discord user model by github name."""
     stmt = select(DiscordUserModel).where(
@@ -38,3 +64,54 @@ async def create_or_update_user_model(
     session.add(user_model)
     await session.commit()
     return user_model
+
+
+async def save_user_links(session: AsyncSession, links: Mapping[str, str]) -> None:
+    """Link many discord users to github users in one transaction, with two statements however many there are.
+
+    Github users may move between discord users in the batch, so the changed links are cleared before any are set,
+    keeping each github user linked to one discord user at a time. The links are then set with a single upsert.
+    """
+    if not links:
+        return
+    await session.execute(
+        update(DiscordUserModel)
+        .where(DiscordUserModel.discord_user_id.in_(links))
+        .values(gh_id=None)
+        .execution_options(synchronize_session=False)
+    )
+
+    insert = postgresql.insert if session.get_bind().dialect.name == "postgresql" else sqlite.insert
+    stmt = insert(DiscordUserModel).values(
+        [{"discord_user_id": user_id, "gh_id": gh_id} for user_id, gh_id in links.items()]
+    )
+    await session.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[DiscordUserModel.discord_user_id],
+            set_={"gh_id": stmt.excluded.gh_id, "updated_at": func.now()},
+        )
+    )
+    await session.commit()
+
+
+async def get_repo_state(session: AsyncSession, repo_name: str) -> RepoStateModel | None:
+    """Get the state of a repository."""
+    return await session.get(RepoStateModel, repo_name)
+
+
+async def save_repo_state(session: AsyncSession, state: RepoState) -> RepoStateModel:
+    """Create or update the state of a repository, keeping the subscriber count if the new state doesn't have it."""
+    existing = await session.get(RepoStateModel, state["repo_name"])
+    if existing:
+        for key, value in state.items():
+            if value is not None or key != "subscribers_count":
+                setattr(existing, key, value)
+        session.add(existing)
+        await session.commit()
+        await session.refresh(existing)
+        return existing
+
+    state_model = RepoStateModel(**state)
+    session.add(state_model)
+    await session.commit()
+    return state_model
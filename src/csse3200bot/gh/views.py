@@ -0,0 +1,57 @@
+"""Views for github."""
+
+import logging
+from collections.abc import Awaitable, Callable
+
+import discord
+
+from csse3200bot.gh.report import ERROR_COLOUR
+from csse3200bot.teams.views import PaginatorView
+
+log = logging.getLogger(__name__)
+
+
+class RosterImportView(PaginatorView):
+    """View to page through the dry run of a roster import, and import it once confirmed."""
+
+    _user_id: int
+    _apply: Callable[[], Awaitable[discord.Embed]]
+
+    def __init__(self, pages: list[discord.Embed], user_id: int, apply: Callable[[], Awaitable[discord.Embed]]) -> None:
+        """Creates the view.
+
+        Args:
+            pages (list[discord.Embed]): pages of the dry run, must not be empty
+            user_id (int): the only user who can confirm the import
+            apply (Callable[[], Awaitable[discord.Embed]]): imports the roster, returning what changed
+        """
+        super().__init__(pages)
+        self._user_id = user_id
+        self._apply = apply
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        """Only the user who uploaded the roster can use the view."""
+        return await super().interaction_check(interaction) and interaction.user.id == self._user_id
+
+    @discord.ui.button(label="Import", style=discord.ButtonStyle.success, row=1)
+    async def confirm(self, interaction: discord.Interaction, _: discord.ui.Button) -> None:
+        """Import the roster."""
+        self.stop()
+        await interaction.response.edit_message(content="Importing roster...", view=None)
+        try:
+            result = await self._apply()
+        except Exception:
+            log.exception(f"Failed to import roster uploaded by {self._user_id}")
+            result = discord.Embed(
+                title="❌ Import Failed",
+                description="There was an error importing the roster, some rows may have been imported. "
+                "Please try again.",
+                color=ERROR_COLOUR,
+            )
+        await interaction.edit_original_response(content=None, embed=result)
+
+    @discord.ui.button(label="Cancel", style=discord.ButtonStyle.secondary, row=1)
+    async def cancel(self, interaction: discord.Interaction, _: discord.ui.Button) -> None:
+        """Cancel the import."""
+        self.stop()
+        await interaction.response.edit_message(content="Roster import cancelled.", embed=None, view=None)
@@ -0,0 +1,120 @@
+"""GitHub webhook receiving, see https://docs.github.com/en/webhooks."""
+
+import datetime as dt
+import hashlib
+import hmac
+import json
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Any, TypedDict
+
+from aiohttp import web
+from aiohttp.typedefs import Handler
+from github.Repository import Repository
+
+log = logging.getLogger(__name__)
+
+SIGNATURE_HEADER = "X-Hub-Signature-256"
+EVENT_HEADER = "X-GitHub-Event"
+DELIVERY_HEADER = "X-GitHub-Delivery"
+
+# Bot event deliveries are dispatched as, listened to with `on_github_webhook`
+DISPATCH_EVENT = "github_webhook"
+
+# Events whose payloads carry the repository's current counters
+REPO_EVENTS = frozenset({"push", "issues", "pull_request", "star", "fork", "repository"})
+
+type WebhookCallback = Callable[[str, dict[str, Any]], Awaitable[None]]
+
+
+class RepoState(TypedDict):
+    """What the bot shows about a repository, named like the `RepoStateModel` columns."""
+
+    repo_name: str
+    full_name: str
+    html_url: str
+    description: str | None
+    stargazers_count: int
+    forks_count: int
+    subscribers_count: int | None
+    open_issues_count: int
+    repo_created_at: dt.datetime
+    repo_updated_at: dt.datetime
+    owner_avatar_url: str | None
+
+
+def sign(secret: str, body: bytes) -> str:
+    """Signature of the body, as github sends it in the signature header."""
+    return "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+def verify_signature(secret: str, body: bytes, signature: str | None) -> bool:
+    """Check the body was signed with the secret."""
+    return signature is not None and hmac.compare_digest(sign(secret, body), signature)
+
+
+def _parse_timestamp(value: str | int) -> dt.datetime:
+    """Push payloads use unix timestamps, the others use ISO 8601."""
+    if isinstance(value, int):
+        return dt.datetime.fromtimestamp(value, dt.UTC)
+    return dt.datetime.fromisoformat(value)
+
+
+def repo_state_from_payload(repository: dict[str, Any]) -> RepoState:
+    """State of the repository object in a webhook payload."""
+    return {
+        "repo_name": repository["name"],
+        "full_name": repository["full_name"],
+        "html_url": repository["html_url"],
+        "description": repository.get("description"),
+        "stargazers_count": repository["stargazers_count"],
+        "forks_count": repository["forks_count"],
+        "subscribers_count": repository.get("subscribers_count"),
+        "open_issues_count": repository["open_issues_count"],
+        "repo_created_at": _parse_timestamp(repository["created_at"]),
+        "repo_updated_at": _parse_timestamp(repository["updated_at"]),
+        "owner_avatar_url": repository.get("owner", {}).get("avatar_url"),
+    }
+
+
+def repo_state_from_repository(repo: Repository) -> RepoState:
+    """State of a repository fetched from the API."""
+    return {
+        "repo_name": repo.name,
+        "full_name": repo.full_name,
+        "html_url": repo.html_url,
+        "description": repo.description,
+        "stargazers_count": repo.stargazers_count,
+        "forks_count": repo.forks_count,
+        "subscribers_count": repo.subscribers_count,
+        "open_issues_count": repo.open_issues_count,
+        "repo_created_at": repo.created_at,
+        "repo_updated_at": repo.updated_at,
+        "owner_avatar_url": repo.organization.avatar_url if repo.organization else None,
+    }
+
+
+def make_webhook_handler(secret: str, callback: WebhookCallback) -> Handler:
+    """Route receiving github webhooks, passing the event and payload of correctly signed deliveries to the callback.
+
+    Responds with 401 to deliveries without a valid signature, so github shows them as failed.
+    """
+
+    async def webhook(request: web.Request) -> web.Response:
+        body = await request.read()
+        delivery = request.headers.get(DELIVERY_HEADER, "unknown")
+        if not verify_signature(secret, body, request.headers.get(SIGNATURE_HEADER)):
+            log.warning(f"Rejected github webhook delivery {delivery} with a bad signature")
+            return web.Response(status=401)
+
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            return web.Response(status=400, text="Invalid JSON")
+
+        event = request.headers.get(EVENT_HEADER, "")
+        log.debug(f"Got github '{event}' webhook delivery {delivery}")
+        await callback(event, payload)
+        return web.Response(status=204)
+
+    return webhook
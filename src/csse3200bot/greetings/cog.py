@@ -1,30 +1,127 @@
 """Greetings Cog Module."""
 
+import asyncio
+import logging
+
 import discord
 from discord import app_commands
 from discord.ext import commands
 
 from csse3200bot.bot import CSSEBot
+from csse3200bot.greetings.utils import (
+    DEFAULT_WELCOME_BATCH_SIZE,
+    DEFAULT_WELCOME_DELAY,
+    DEFAULT_WELCOME_TEMPLATE,
+    check_welcome_template,
+    render_welcomes,
+)
+
+log = logging.getLogger(__name__)
+
+WELCOMES_SHUTDOWN_HOOK = "greetings.welcomes"
 
 
 class GreetingsCog(commands.GroupCog, name="say"):
-    """Greetings cog."""
+    """Greetings cog.
+
+    Members are welcomed in batches, so a cohort joining at once gets a few messages rather than one each.
+    A guild's batch is sent `welcome_delay` seconds after its first join, or as soon as it has
+    `welcome_batch_size` members.
+    """
 
     _bot: CSSEBot
 
-    def __init__(self, bot: CSSEBot) -> None:
+    _welcome_template: str
+    _welcome_delay: float
+    _welcome_batch_size: int
+    _pending_welcomes: dict[int, list[discord.Member]]  # guild_id -> members waiting to be welcomed
+    _welcome_timers: dict[int, asyncio.Task[None]]  # guild_id -> task sending the guild's batch
+
+    def __init__(
+        self,
+        bot: CSSEBot,
+        welcome_template: str = DEFAULT_WELCOME_TEMPLATE,
+        welcome_delay: float = DEFAULT_WELCOME_DELAY,
+        welcome_batch_size: int = DEFAULT_WELCOME_BATCH_SIZE,
+    ) -> None:
         """Constructor."""
+        check_welcome_template(welcome_template)
         self._bot = bot
+        self._welcome_template = welcome_template
+        self._welcome_delay = welcome_delay
+        self._welcome_batch_size = welcome_batch_size
+        self._pending_welcomes = {}
+        self._welcome_timers = {}
+
+    async def cog_load(self) -> None:
+        """Load cog, welcoming anyone still waiting when the bot shuts down."""
+        self._bot.shutdown_coordinator.add_hook(WELCOMES_SHUTDOWN_HOOK, self.flush_all_welcomes)
+
+    async def cog_unload(self) -> None:
+        """Unload cog, welcoming anyone still waiting."""
+        self._bot.shutdown_coordinator.remove_hook(WELCOMES_SHUTDOWN_HOOK)
+        await self.flush_all_welcomes()
+        await super().cog_unload()
 
     @commands.Cog.listener()
     async def on_member_join(self, member: discord.Member) -> None:
         """Listener for when a member joins."""
-        channel = member.guild.system_channel
-        if channel is not None:
-            await channel.send(f"Welcome {member.mention}.")
+        if member.guild.system_channel is None:
+            return
+
+        guild_id = member.guild.id
+        pending = self._pending_welcomes.setdefault(guild_id, [])
+        pending.append(member)
+        if len(pending) >= self._welcome_batch_size:
+            await self.flush_welcomes(guild_id)
+        elif guild_id not in self._welcome_timers:
+            self._welcome_timers[guild_id] = asyncio.create_task(self._flush_later(guild_id))
+
+    async def _flush_later(self, guild_id: int) -> None:
+        await asyncio.sleep(self._welcome_delay)
+        await self.flush_welcomes(guild_id)
+
+    async def flush_all_welcomes(self) -> None:
+        """Welcome everyone waiting to be welcomed now."""
+        for guild_id in list(self._pending_welcomes):
+            await self.flush_welcomes(guild_id)
+
+    async def flush_welcomes(self, guild_id: int) -> None:
+        """Welcome the members of a guild waiting to be welcomed now."""
+        timer = self._welcome_timers.pop(guild_id, None)
+        if timer is not None and timer is not asyncio.current_task():
+            timer.cancel()
+        members = self._pending_welcomes.pop(guild_id, [])
+        if not members:
+            return
+
+        channel = members[0].guild.system_channel
+        if channel is None:
+            return
+        for message in render_welcomes(self._welcome_template, [member.mention for member in members]):
+            try:
+                await channel.send(message)
+            except discord.HTTPException:
+                log.exception(f"Couldn't welcome members in channel {channel.id}")
+                return
 
     @app_commands.command(name="hello")
     @app_commands.describe(thing_to_say="This is the thing to say")
     async def better_hello(self, interaction: discord.Interaction, thing_to_say: str) -> None:
         """Better hello command."""
         await interaction.response.send_message(f"{thing_to_say} - BOOM, said a thing")
+
+
+async def setup(bot: CSSEBot) -> None:
+    """Extension entry point, with the welcomes set up from the config."""
+    # the config is read from the environment, only once the extension is loaded
+    from csse3200bot.config import CONFIG  # noqa: PLC0415
+
+    await bot.add_cog(
+        GreetingsCog(
+            bot,
+            welcome_template=CONFIG.welcome_template,
+            welcome_delay=CONFIG.welcome_delay,
+            welcome_batch_size=CONFIG.welcome_batch_size,
+        )
+    )
@@ -0,0 +1,36 @@
+"""Utils for welcoming members."""
+
+from collections.abc import Iterator, Sequence
+
+MESSAGE_LIMIT = 2000  # https://discord.com/developers/docs/resources/message#create-message
+
+DEFAULT_WELCOME_TEMPLATE = "Welcome {mentions}."
+DEFAULT_WELCOME_DELAY = 5.0
+DEFAULT_WELCOME_BATCH_SIZE = 50
+MENTIONS_PLACEHOLDER = "{mentions}"
+
+
+def check_welcome_template(template: str) -> None:
+    """Raise a `ValueError` if the template can't be rendered with a mention."""
+    if MENTIONS_PLACEHOLDER not in template:
+        msg = f"Welcome template must contain {MENTIONS_PLACEHOLDER}: {template!r}"
+        raise ValueError(msg)
+    if len(template.replace(MENTIONS_PLACEHOLDER, "")) > MESSAGE_LIMIT // 2:
+        msg = f"Welcome template is too long, it can be at most {MESSAGE_LIMIT // 2} characters"
+        raise ValueError(msg)
+
+
+def render_welcomes(template: str, mentions: Sequence[str]) -> Iterator[str]:
+    """Render the welcome messages for the mentions, as few as fit in discord's message limit."""
+    budget = MESSAGE_LIMIT - len(template.replace(MENTIONS_PLACEHOLDER, ""))
+    chunk: list[str] = []
+    size = 0
+    for mention in mentions:
+        added = len(mention) + (2 if chunk else 0)  # joined with ", "
+        if chunk and size + added > budget:
+            yield template.replace(MENTIONS_PLACEHOLDER, ", ".join(chunk))
+            chunk, size, added = [], 0, len(mention)
+        chunk.append(mention)
+        size += added
+    if chunk:
+        yield template.replace(MENTIONS_PLACEHOLDER, ", ".join(chunk))
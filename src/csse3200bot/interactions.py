@@ -0,0 +1,135 @@
+"""Interaction helpers."""
+
+import asyncio
+import functools
+import logging
+from time import perf_counter
+from typing import Any
+
+import discord
+from discord import app_commands
+
+from csse3200bot.bot import CSSEBot, admit_interaction
+from csse3200bot.enums import RateLimitScope
+from csse3200bot.utils import Budget
+
+log = logging.getLogger(__name__)
+
+# Discord gives 3 seconds to respond to an interaction, defer with some room to spare
+AUTO_DEFER_AFTER = 2.0
+
+_DEFERRAL_KEY = "auto_defer"
+_RESPONDING_KEY = "responding"
+
+
+async def _defer(interaction: discord.Interaction, *, ephemeral: bool) -> None:
+    try:
+        await interaction.response.defer(ephemeral=ephemeral, thinking=True)
+    except discord.HTTPException:
+        log.exception("Failed to auto defer interaction")
+
+
+def _start_deferral(interaction: discord.Interaction, *, ephemeral: bool) -> None:
+    """Defer the interaction, unless a response is already on its way."""
+    if interaction.response.is_done() or interaction.extras.get(_RESPONDING_KEY):
+        return
+    log.debug(f"Auto deferring interaction {interaction.id}")
+    interaction.extras[_DEFERRAL_KEY] = asyncio.create_task(_defer(interaction, ephemeral=ephemeral))
+
+
+async def respond(interaction: discord.Interaction, *args: Any, **kwargs: Any) -> None:  # noqa: ANN401
+    """Respond to an interaction, as a followup if it has already been responded to or deferred.
+
+    Commands using `auto_defer` must respond with this, as they can be deferred at any point.
+    """
+    interaction.extras[_RESPONDING_KEY] = True
+    deferral: asyncio.Task[None] | None = interaction.extras.pop(_DEFERRAL_KEY, None)
+    if deferral is not None:
+        await deferral
+
+    if interaction.response.is_done():
+        await interaction.followup.send(*args, **kwargs)
+    else:
+        await interaction.response.send_message(*args, **kwargs)
+
+
+def auto_defer(*, after: float = AUTO_DEFER_AFTER, ephemeral: bool = False):  # noqa: ANN201
+    """Decorator that defers the interaction if the command hasn't responded in time.
+
+    This should be applied to app_commands that may be slow to respond (DB/GitHub calls, etc.), and which
+    respond with `respond` rather than `interaction.response`.
+    Whether a deferred response is ephemeral is decided when deferring, so `ephemeral` applies to the whole
+    response once deferred.
+
+    Usage:
+        @app_commands.command(name="example")
+        @auto_defer()
+        async def some_command(self, interaction: discord.Interaction) -> None:
+            await respond(interaction, "Done")
+    """
+
+    def decorator(func):  # noqa: ANN001, ANN202
+        @functools.wraps(func)
+        async def wrapper(self: Any, interaction: discord.Interaction, *args, **kwargs) -> Any:  # noqa: ANN002, ANN003, ANN401
+            start = perf_counter()
+            deferral = asyncio.get_running_loop().call_later(
+                after, functools.partial(_start_deferral, interaction, ephemeral=ephemeral)
+            )
+            try:
+                return await func(self, interaction, *args, **kwargs)
+            finally:
+                deferral.cancel()
+                elapsed = perf_counter() - start
+                if elapsed > after:
+                    log.info(f"Command {func.__name__} took {elapsed:.2f}s")
+
+        return wrapper
+
+    return decorator
+
+
+class BotView(discord.ui.View):
+    """Base of the bot's views, so their callbacks are turned away once shutting down, and drained by the shutdown.
+
+    Subclasses overriding `interaction_check` must check `super().interaction_check` first.
+    """
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        """Admit the interaction unless the bot is shutting down."""
+        return await admit_interaction(interaction)
+
+
+def _rate_limit_key(interaction: discord.Interaction, scope: RateLimitScope) -> str:
+    command = interaction.command.qualified_name if interaction.command is not None else "unknown"
+    if scope is RateLimitScope.user:
+        return f"{command}:user:{interaction.user.id}"
+    if scope is RateLimitScope.guild:
+        return f"{command}:guild:{interaction.guild_id or interaction.user.id}"
+    return f"{command}:global"
+
+
+def rate_limit(rate: int, per: float, scope: RateLimitScope = RateLimitScope.user):  # noqa: ANN201
+    """Check that limits an app_command to `rate` uses every `per` seconds, per user, guild or globally.
+
+    Replaces `app_commands.checks.cooldown`, with the budget kept by the bot's rate limiter so it can be shared
+    by every bot process and survive restarts. Raises `app_commands.CommandOnCooldown` like the cooldown check,
+    so error handlers don't need to change. Uses can be saved up, up to `rate` at once.
+
+    Usage:
+        @app_commands.command(name="example")
+        @rate_limit(1, 5.0, RateLimitScope.guild)
+        async def some_command(self, interaction: discord.Interaction) -> None:
+            ...
+    """
+    budget = Budget(rate, per)
+
+    async def predicate(interaction: discord.Interaction) -> bool:
+        bot = interaction.client
+        if not isinstance(bot, CSSEBot):
+            return True
+        retry_after = await bot.rate_limiter.acquire(_rate_limit_key(interaction, scope), budget)
+        if retry_after > 0:
+            raise app_commands.CommandOnCooldown(app_commands.Cooldown(rate, per), retry_after)
+        return True
+
+    return app_commands.check(predicate)
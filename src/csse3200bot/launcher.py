@@ -0,0 +1,145 @@
+"""Runs the bot as several processes, each running its share of the shards.
+
+Usage:
+    python src/csse3200bot/launcher.py --processes 4 [--shard-count 16] [--base-port 8080]
+
+Every process gets the same environment as the launcher, plus its shard ids (and http port if a base port
+is given, so each process gets its own health check).
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import signal
+import sys
+from pathlib import Path
+
+import aiohttp
+
+log = logging.getLogger(__name__)
+
+MAIN_PATH = Path(__file__).with_name("main.py")
+GATEWAY_BOT_URL = "https://discord.com/api/v10/gateway/bot"
+
+# Discord only allows one identify every 5 seconds (per max_concurrency bucket)
+IDENTIFY_INTERVAL = 5.0
+RESTART_DELAY = 10.0
+
+
+async def get_recommended_shard_count(token: str) -> int:
+    """Ask discord how many shards the bot should be running."""
+    async with (
+        aiohttp.ClientSession() as session,
+        session.get(GATEWAY_BOT_URL, headers={"Authorization": f"Bot {token}"}) as response,
+    ):
+        response.raise_for_status()
+        data = await response.json()
+        return int(data["shards"])
+
+
+def split_shards(shard_count: int, processes: int) -> list[list[int]]:
+    """Split the shard ids into contiguous blocks, one per process."""
+    size, extra = divmod(shard_count, processes)
+    blocks = []
+    start = 0
+    for i in range(processes):
+        end = start + size + (1 if i < extra else 0)
+        blocks.append(list(range(start, end)))
+        start = end
+    return [block for block in blocks if block]
+
+
+class ShardProcess:
+    """A bot process running a block of shards, restarted if it dies."""
+
+    _shard_ids: list[int]
+    _env: dict[str, str]
+    _process: asyncio.subprocess.Process | None
+    _stopping: bool
+
+    def __init__(self, shard_ids: list[int], shard_count: int, http_port: int | None) -> None:
+        """Creates a shard process, it isn't started until `run` is awaited."""
+        self._shard_ids = shard_ids
+        self._env = {
+            **os.environ,
+            "SHARDED": "true",
+            "SHARD_COUNT": str(shard_count),
+            "SHARD_IDS": json.dumps(shard_ids),
+        }
+        if http_port is not None:
+            self._env["HTTP_PORT"] = str(http_port)
+        self._process = None
+        self._stopping = False
+
+    async def run(self) -> None:
+        """Run the process until stopped, restarting it whenever it exits."""
+        while not self._stopping:
+            log.info(f"Starting process for shards {self._shard_ids}")
+            self._process = await asyncio.create_subprocess_exec(sys.executable, str(MAIN_PATH), env=self._env)
+            code = await self._process.wait()
+            if self._stopping:
+                break
+            log.error(f"Process for shards {self._shard_ids} exited with {code}, restarting in {RESTART_DELAY}s")
+            await asyncio.sleep(RESTART_DELAY)
+
+    def stop(self) -> None:
+        """Ask the process to shut down."""
+        self._stopping = True
+        if self._process is not None and self._process.returncode is None:
+            self._process.terminate()
+
+
+async def launch(token: str, processes: int, shard_count: int | None, base_port: int | None) -> None:
+    """Launch the shard processes and wait for them."""
+    if shard_count is None:
+        shard_count = await get_recommended_shard_count(token)
+        log.info(f"Discord recommends {shard_count} shard(s)")
+
+    blocks = split_shards(shard_count, processes)
+    shard_processes = [
+        ShardProcess(block, shard_count, None if base_port is None else base_port + i) for i, block in enumerate(blocks)
+    ]
+
+    def stop_all() -> None:
+        log.info("Stopping all shard processes")
+        for process in shard_processes:
+            process.stop()
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop_all)
+
+    tasks = []
+    for process, block in zip(shard_processes, blocks, strict=True):
+        tasks.append(asyncio.create_task(process.run()))
+        # stagger starts so the processes aren't all identifying at once
+        await asyncio.sleep(IDENTIFY_INTERVAL * len(block))
+
+    await asyncio.gather(*tasks)
+
+
+def main() -> None:
+    """Launcher entry point."""
+    # the config is read from the environment, only once the launcher is run
+    from csse3200bot.config import CONFIG  # noqa: PLC0415
+    from csse3200bot.logger import configure_logging  # noqa: PLC0415
+
+    parser = argparse.ArgumentParser(description="Run the bot across several processes")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1, help="number of bot processes")
+    parser.add_argument(
+        "--shard-count",
+        type=int,
+        default=CONFIG.shard_count,
+        help="total number of shards, asks discord when not set",
+    )
+    parser.add_argument("--base-port", type=int, default=CONFIG.http_port, help="http port of the first process")
+    args = parser.parse_args()
+
+    configure_logging()
+    asyncio.run(launch(CONFIG.discord_bot_token, args.processes, args.shard_count, args.base_port))
+
+
+if __name__ == "__main__":
+    main()
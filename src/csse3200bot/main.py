@@ -2,12 +2,10 @@
 
 import asyncio
 import logging
-from typing import TYPE_CHECKING
+import signal
+from typing import Any
 
 import discord
-
-if TYPE_CHECKING:
-    from discord.ext import commands
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
@@ -16,53 +14,133 @@ from sqlalchemy.ext.asyncio import (
 )
 
 from csse3200bot import constants
-from csse3200bot.bot import CSSEBot
+from csse3200bot.bot import CSSEBot, ShardedCSSEBot
 from csse3200bot.config import CONFIG
+from csse3200bot.database.notify import CacheInvalidationBus
+from csse3200bot.database.profiling import install_query_hooks
+from csse3200bot.database.ratelimit import DatabaseRateLimiter
 from csse3200bot.database.service import initialise_database
-from csse3200bot.gh.cog import GitHubCog
-from csse3200bot.greetings.cog import GreetingsCog
+from csse3200bot.enums import RateLimitBackend
+from csse3200bot.gh.webhooks import DISPATCH_EVENT, make_webhook_handler
 from csse3200bot.logger import configure_logging
-from csse3200bot.studio.cog import StudioCog
-from csse3200bot.teams.cog import TeamsCog
-
-# Setting up the intents
-intents = discord.Intents.default()
-intents.message_content = True
-intents.members = True
+from csse3200bot.server import HTTPServer, make_health_handler, make_ready_handler
+from csse3200bot.utils import LoopStallDetector, ProfileInProgressError, profile
 
 log = logging.getLogger(__name__)
 
-db_engine: AsyncEngine = create_async_engine(CONFIG.db_url, pool_pre_ping=True)
-session_factory = async_sessionmaker(
-    db_engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-)
+# Seconds profiled on SIGUSR1
+SIGNAL_PROFILE_SECONDS = 30
 
-bot = CSSEBot(
-    CONFIG.guild_ids, session_factory, constants.GH_ORG_NAME, CONFIG.gh_token, command_prefix="!", intents=intents
-)
+_background_tasks: set[asyncio.Task[None]] = set()
+
+
+def create_engine() -> AsyncEngine:
+    """Database engine, with slow queries logged."""
+    engine = create_async_engine(CONFIG.db_url, pool_pre_ping=True)
+    install_query_hooks(engine, CONFIG.slow_query_ms)
+    return engine
+
+
+def create_bot(engine: AsyncEngine) -> CSSEBot:
+    """Bot set up from the config, its extensions are loaded once it logs in."""
+    # Setting up the intents
+    intents = discord.Intents.default()
+    intents.message_content = True
+    intents.members = True
+
+    session_factory = async_sessionmaker(
+        engine,
+        class_=AsyncSession,
+        expire_on_commit=False,
+    )
+    bot_cls = ShardedCSSEBot if CONFIG.sharded else CSSEBot
+    shard_options = {"shard_count": CONFIG.shard_count, "shard_ids": CONFIG.shard_ids} if CONFIG.sharded else {}
+
+    return bot_cls(
+        CONFIG.guild_ids,
+        session_factory,
+        CacheInvalidationBus(engine),
+        constants.GH_ORG_NAME,
+        CONFIG.gh_token,
+        cache_ttl=CONFIG.cache_ttl,
+        sprint_starts=CONFIG.sprint_starts,
+        command_sync=CONFIG.command_sync,
+        extensions=CONFIG.extensions,
+        rate_limiter=DatabaseRateLimiter(engine) if CONFIG.rate_limit_backend is RateLimitBackend.database else None,
+        command_prefix="!",
+        intents=intents,
+        member_cache_flags=CONFIG.member_cache.get_flags(),
+        chunk_guilds_at_startup=CONFIG.chunk_guilds_at_startup,
+        **shard_options,
+    )
+
+
+def _start_background_task(coro: Any) -> None:  # noqa: ANN401
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+def _start_shutdown(bot: CSSEBot, signal_name: str) -> None:
+    """Drain and close the bot without blocking the signal handler, a second signal is ignored."""
+    log.info(f"Received {signal_name}, shutting down")
+    _start_background_task(bot.shutdown(CONFIG.shutdown_timeout))
+
+
+async def _profile_on_signal() -> None:
+    try:
+        await profile(SIGNAL_PROFILE_SECONDS)
+    except ProfileInProgressError:
+        log.warning("Ignoring SIGUSR1, a profile is already running")
+
+
+def _start_signal_profile() -> None:
+    """Profile without blocking the signal handler, `kill -USR1 <pid>` to diagnose latency in production."""
+    _start_background_task(_profile_on_signal())
 
 
 async def main() -> None:
     """Main function."""
     configure_logging()
 
-    # Add the cogs
-    log.info("Setting up cogs")
-    cogs: list[commands.Cog] = [GitHubCog(bot), GreetingsCog(bot), StudioCog(bot), TeamsCog(bot)]
-    for cog in cogs:
-        log.info(f"Adding cog '{cog.__cog_name__} to bot'")
-        await bot.add_cog(cog)
-
+    db_engine = create_engine()
+    bot = create_bot(db_engine)
+    http_server = HTTPServer()
     await initialise_database(db_engine)
 
+    if CONFIG.http_port is not None:
+        http_server.add_route("GET", "/healthz", make_health_handler(bot))
+        http_server.add_route("GET", "/readyz", make_ready_handler(bot))
+        if CONFIG.github_webhook_secret is not None:
+
+            async def dispatch_webhook(event: str, payload: dict[str, Any]) -> None:
+                # dispatched, so the gh extension can be reloaded (or disabled) without re-adding the route
+                bot.dispatch(DISPATCH_EVENT, event, payload)
+
+            http_server.add_route(
+                "POST", "/github/webhook", make_webhook_handler(CONFIG.github_webhook_secret, dispatch_webhook)
+            )
+        await http_server.start(CONFIG.http_port)
+
+    loop = asyncio.get_running_loop()
+    loop.add_signal_handler(signal.SIGUSR1, _start_signal_profile)
+    # the http server is only stopped once the bot has closed, so the readiness check reports the drain
+    loop.add_signal_handler(signal.SIGTERM, _start_shutdown, bot, signal.SIGTERM.name)
+    stall_detector = LoopStallDetector(CONFIG.loop_stall_ms) if CONFIG.loop_stall_ms is not None else None
+    if stall_detector is not None:
+        stall_detector.start()
+
     try:
         await bot.start(CONFIG.discord_bot_token)
     except KeyboardInterrupt:
         log.info("Shutting down due to keyboard interrupt")
         await bot.close()
     finally:
+        log.info("Waiting for background jobs")
+        await bot.scheduler.shutdown()
+        await http_server.stop()
+        if stall_detector is not None:
+            await stall_detector.stop()
         log.info("Disposing of db engine")
         await db_engine.dispose()
 
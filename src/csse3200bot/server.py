@@ -0,0 +1,73 @@
+"""Embedded HTTP server, for health checks and the like."""
+
+import logging
+from typing import TYPE_CHECKING
+
+from aiohttp import web
+from aiohttp.typedefs import Handler
+
+if TYPE_CHECKING:
+    from csse3200bot.bot import CSSEBot
+
+log = logging.getLogger(__name__)
+
+
+class HTTPServer:
+    """Small aiohttp server that runs alongside the bot on the same event loop."""
+
+    _app: web.Application
+    _runner: web.AppRunner | None
+
+    def __init__(self) -> None:
+        """Creates a server with no routes."""
+        self._app = web.Application()
+        self._runner = None
+
+    def add_route(self, method: str, path: str, handler: Handler) -> None:
+        """Add a route, must be done before the server is started."""
+        self._app.router.add_route(method, path, handler)
+
+    async def start(self, port: int) -> None:
+        """Start serving on the given port."""
+        self._runner = web.AppRunner(self._app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, port=port)
+        await site.start()
+        log.info(f"HTTP server listening on port {port}")
+
+    async def stop(self) -> None:
+        """Stop serving."""
+        if self._runner is None:
+            return
+        runner, self._runner = self._runner, None
+        await runner.cleanup()
+
+
+def make_health_handler(bot: "CSSEBot") -> Handler:
+    """Health check route, reports the state of every shard this process runs.
+
+    Responds with 503 until the bot is ready and while any shard is disconnected.
+    """
+
+    async def health(_: web.Request) -> web.Response:
+        shards = bot.shard_health()
+        healthy = bot.is_ready() and all(not shard["closed"] for shard in shards)
+        return web.json_response(
+            {"ready": bot.is_ready(), "shards": shards},
+            status=200 if healthy else 503,
+        )
+
+    return health
+
+
+def make_ready_handler(bot: "CSSEBot") -> Handler:
+    """Readiness check route, for the load balancer or rolling updates to stop sending work before a shutdown.
+
+    Responds with 503 until the bot is ready, and as soon as it starts shutting down.
+    """
+
+    async def ready(_: web.Request) -> web.Response:
+        ready = bot.is_ready() and bot.accepting_interactions
+        return web.json_response({"ready": ready}, status=200 if ready else 503)
+
+    return ready
@@ -1,27 +1,59 @@
 """Studio cog."""
 
+import datetime as dt
 import logging
 
 import discord
 from discord import app_commands
 from discord.ext import commands
 
-from csse3200bot.bot import CSSEBot
-from csse3200bot.constants import STUDENT_ROLE, TUTOR_ROLES
+from csse3200bot.bot import CACHE_SWEEP_INTERVAL, CSSEBot
+from csse3200bot.constants import STUDENT_ROLE
+from csse3200bot.enums import ExportFormat, ExportTable
+from csse3200bot.export import export_path, export_to_file
+from csse3200bot.interactions import auto_defer, respond
+from csse3200bot.studio.service import delete_setup_states_before, set_broadcast_channel
 from csse3200bot.studio.utils import studio_required
-from csse3200bot.studio.views import StudioSetupView
+from csse3200bot.studio.views import StudioSetupWizard
 
 log = logging.getLogger(__name__)
 
+# Setup wizards not answered for this long are forgotten
+SETUP_EXPIRY = dt.timedelta(days=7)
+
 
 class StudioCog(commands.GroupCog, name="studio"):
     """Studio management and setup cog."""
 
     _bot: CSSEBot
+    _setup_wizard: StudioSetupWizard
+    _setup_views: list[discord.ui.View]
 
     def __init__(self, bot: CSSEBot) -> None:
         """Constructor."""
         self._bot = bot
+        self._setup_wizard = StudioSetupWizard(bot)
+        self._setup_views = []
+
+    async def cog_load(self) -> None:
+        """Load cog, listening to every setup wizard's components."""
+        await super().cog_load()
+        self._setup_views = self._setup_wizard.persistent_views()
+        for view in self._setup_views:
+            self._bot.add_view(view)
+        self._bot.scheduler.add_job("studio.sweep_setups", self._sweep_setups, CACHE_SWEEP_INTERVAL)
+
+    async def cog_unload(self) -> None:
+        """Unload cog."""
+        for view in self._setup_views:
+            view.stop()
+        self._setup_views = []
+        self._bot.scheduler.remove_job("studio.sweep_setups")
+        await super().cog_unload()
+
+    async def _sweep_setups(self) -> None:
+        async with self._bot.get_db() as session:
+            await delete_setup_states_before(session, dt.datetime.now(dt.UTC) - SETUP_EXPIRY)
 
     @commands.Cog.listener()
     async def on_guild_join(self, guild: discord.Guild) -> None:
@@ -54,53 +86,51 @@ class StudioCog(commands.GroupCog, name="studio"):
         )
         embed.set_footer(text="Click the button below to begin setup")
 
-        try:
-            view = StudioSetupView(self._bot, guild)
-        except Exception:
-            log.exception("Error creating StudioSetupView")
-
         try:
             log.debug("Attempting to send setup embed and view.")
-            await setup_channel.send(embed=embed, view=view)
+            await setup_channel.send(embed=embed, view=self._setup_wizard.start_view())
             log.info(f"Setup message sent to {setup_channel.name} in {guild.name}")
         except Exception:
             log.exception(f"Failed to send setup message to {guild.name}")
 
     @app_commands.command(name="clean", description="Cleans up the studio, configuring all default roles, etc.")
     @app_commands.checks.has_permissions(manage_guild=True)
+    @auto_defer(ephemeral=True)
     async def studio_clean(self, interaction: discord.Interaction) -> None:
         """Assigns STUDENT_ROLE to all members who do not have any TUTOR_ROLES."""
         guild = interaction.guild
         if guild is None:
-            await interaction.response.send_message("This command can only be used in a server", ephemeral=True)
+            await respond(interaction, "This command can only be used in a server", ephemeral=True)
             return
 
-        student_role = discord.utils.get(guild.roles, name=STUDENT_ROLE)
-        tutor_roles = [discord.utils.get(guild.roles, name=role) for role in TUTOR_ROLES]
+        role_index = self._bot.get_role_index(guild)
+        student_role = role_index.student_role
 
         if student_role is None:
-            await interaction.response.send_message(f"Student role '{STUDENT_ROLE}' not found.", ephemeral=True)
+            await respond(interaction, f"Student role '{STUDENT_ROLE}' not found.", ephemeral=True)
             return
 
         updated_members = []
-        for member in guild.members:
+        for member in await self._bot.get_guild_members(guild):
             # skip bots
             if member.bot:
                 continue
 
             # check if member has any tutor role
-            if any(role in member.roles for role in tutor_roles if role is not None):
+            if role_index.is_tutor(member):
                 continue
 
-            if student_role not in member.roles:
+            if not role_index.is_student(member):
                 try:
                     await member.add_roles(student_role, reason="Studio clean-up: Assigning student role")
                     updated_members.append(member.display_name)
                 except Exception:
                     log.exception(f"Failed to assign student role to {member.display_name}")
 
-        await interaction.response.send_message(
-            f"Studio clean-up complete. Assigned '{STUDENT_ROLE}' to {len(updated_members)} member(s).", ephemeral=True
+        await respond(
+            interaction,
+            f"Studio clean-up complete. Assigned '{STUDENT_ROLE}' to {len(updated_members)} member(s).",
+            ephemeral=True,
         )
 
     @app_commands.command(name="setup", description="Set up or reconfigure the studio")
@@ -123,8 +153,79 @@ class StudioCog(commands.GroupCog, name="studio"):
             await interaction.response.send_message("This command can only be used in a server", ephemeral=True)
             return
 
-        view = StudioSetupView(self._bot, guild)
-        await interaction.response.send_message(embed=embed, view=view)
+        await interaction.response.send_message(embed=embed, view=self._setup_wizard.start_view())
+
+    @app_commands.command(
+        name="broadcast_channel", description="Get updates from every server in the studio in a channel - Staff Only"
+    )
+    @app_commands.describe(channel="Channel to post to, leave empty to stop posting")
+    @app_commands.checks.has_permissions(manage_guild=True)
+    @studio_required
+    async def studio_broadcast_channel(
+        self, interaction: discord.Interaction, channel: discord.TextChannel | None = None
+    ) -> None:
+        """Set (or unset) the channel the studio's updates, like sprint features, are broadcast to."""
+        guild = interaction.guild
+        if guild is None:
+            await interaction.response.send_message("This command can only be used in a server", ephemeral=True)
+            return
+
+        async with self._bot.get_db() as session:
+            await set_broadcast_channel(session, str(guild.id), str(channel.id) if channel is not None else None)
+
+        if channel is None:
+            await interaction.response.send_message("Studio updates will no longer be posted.", ephemeral=True)
+            return
+        await interaction.response.send_message(
+            f"Updates from every server in the studio will be posted to {channel.mention}.", ephemeral=True
+        )
+
+    @app_commands.command(name="export", description="Export the studio's data as CSV or JSON - Staff Only")
+    @app_commands.describe(table="Data to export", export_format="File format, defaults to CSV")
+    @app_commands.rename(export_format="format")
+    @app_commands.checks.has_permissions(manage_guild=True)
+    @auto_defer(ephemeral=True)
+    @studio_required
+    async def studio_export(
+        self, interaction: discord.Interaction, table: ExportTable, export_format: ExportFormat = ExportFormat.csv
+    ) -> None:
+        """Export the studio's sprint features, linked users or guilds, streamed to a file then uploaded."""
+        guild = interaction.guild
+        studio = await self._bot.get_studio(guild) if guild is not None else None
+        if guild is None or studio is None:
+            log.error("This should not occur as caught by 'studio_required' decorator")
+            await respond(interaction, "Studio not fully setup yet", ephemeral=True)
+            return
+
+        user_ids = None
+        if table is ExportTable.users:
+            # users aren't linked to a studio, so only this table needs the guild's members
+            user_ids = {str(member.id) for member in await self._bot.get_guild_members(guild)}
+        path = export_path(table, export_format, str(guild.id))
+        try:
+            async with self._bot.get_db() as session:
+                rows = await export_to_file(
+                    session,
+                    path,
+                    table,
+                    export_format,
+                    studio_year=studio.studio_year,
+                    studio_number=studio.studio_number,
+                    user_ids=user_ids,
+                )
+            log.info(f"Exported {rows} {table} row(s) of studio {studio.studio_number} - {studio.studio_year}")
+
+            if path.stat().st_size > guild.filesize_limit:
+                hint = "try CSV, or " if export_format is not ExportFormat.csv else ""
+                await respond(
+                    interaction,
+                    f"Export of {rows} row(s) is too big to upload, {hint}ask a maintainer to run the export CLI",
+                    ephemeral=True,
+                )
+                return
+            await respond(interaction, f"Exported {rows} row(s)", file=discord.File(path), ephemeral=True)
+        finally:
+            path.unlink(missing_ok=True)
 
     @app_commands.command(name="info", description="View current studio configuration")
     @studio_required
@@ -161,3 +262,8 @@ class StudioCog(commands.GroupCog, name="studio"):
             embed.set_footer(text=f"Studio ID: {studio.studio_number}")
 
         await interaction.response.send_message(embed=embed)
+
+
+async def setup(bot: CSSEBot) -> None:
+    """Extension entry point."""
+    await bot.add_cog(StudioCog(bot))
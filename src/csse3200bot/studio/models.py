@@ -42,3 +42,25 @@ class StudioGuildModel(BaseDBModel):
     guild_id: Mapped[str] = mapped_column()
 
     studio: Mapped[StudioModel] = relationship(back_populates="guild_links")
+
+
+class StudioSetupModel(BaseDBModel, TimestampMixin):
+    """Answers given so far in a studio setup wizard, by the message it's in."""
+
+    __tablename__ = "studio_setup"
+
+    message_id: Mapped[str] = mapped_column(primary_key=True)
+    guild_id: Mapped[str]
+
+    studio_number: Mapped[int | None]
+    studio_year: Mapped[int | None]
+    repo_name: Mapped[str | None]
+
+
+class StudioBroadcastChannelModel(BaseDBModel):
+    """DB Model for the channel a guild gets its studio's updates in, opted into by each of the studio's guilds."""
+
+    __tablename__ = "studio_broadcast_channel"
+
+    guild_id: Mapped[str] = mapped_column(primary_key=True)
+    channel_id: Mapped[str]
@@ -1,12 +1,14 @@
 """Studio service."""
 
+import datetime as dt
 import logging
+from collections.abc import Sequence
 from uuid import UUID
 
 from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from csse3200bot.studio.models import StudioGuildModel, StudioModel
+from csse3200bot.studio.models import StudioBroadcastChannelModel, StudioGuildModel, StudioModel, StudioSetupModel
 
 log = logging.getLogger(__name__)
 
@@ -81,3 +83,49 @@ async def update_studio(
     await session.commit()
     await session.refresh(studio_model)
     return studio_model
+
+
+async def get_setup_state(session: AsyncSession, message_id: str) -> StudioSetupModel | None:
+    """Get the answers of the setup wizard in the given message."""
+    return await session.get(StudioSetupModel, message_id)
+
+
+async def save_setup_state(session: AsyncSession, state: StudioSetupModel) -> None:
+    """Create or update the answers of a setup wizard."""
+    await session.merge(state)
+    await session.commit()
+
+
+async def delete_setup_state(session: AsyncSession, message_id: str) -> None:
+    """Forget the answers of the setup wizard in the given message."""
+    await session.execute(delete(StudioSetupModel).where(StudioSetupModel.message_id == message_id))
+    await session.commit()
+
+
+async def delete_setup_states_before(session: AsyncSession, before: dt.datetime) -> None:
+    """Forget the answers of every setup wizard last answered before the given time."""
+    await session.execute(delete(StudioSetupModel).where(StudioSetupModel.updated_at < before))
+    await session.commit()
+
+
+async def get_broadcast_channels(session: AsyncSession, guild_ids: Sequence[str]) -> dict[str, str]:
+    """Get the broadcast channels of the guilds by guild id, guilds without one are left out."""
+    if not guild_ids:
+        return {}
+    stmt = select(StudioBroadcastChannelModel).where(StudioBroadcastChannelModel.guild_id.in_(guild_ids))
+    result = await session.execute(stmt)
+    return {channel.guild_id: channel.channel_id for channel in result.scalars().all()}
+
+
+async def set_broadcast_channel(session: AsyncSession, guild_id: str, channel_id: str | None) -> None:
+    """Set the broadcast channel of a guild, or stop broadcasting to it if `channel_id` is None."""
+    existing = await session.get(StudioBroadcastChannelModel, guild_id)
+    if channel_id is None:
+        if existing:
+            await session.delete(existing)
+    elif existing:
+        existing.channel_id = channel_id
+        session.add(existing)
+    else:
+        session.add(StudioBroadcastChannelModel(guild_id=guild_id, channel_id=channel_id))
+    await session.commit()
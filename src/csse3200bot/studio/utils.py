@@ -7,6 +7,7 @@ from typing import Any
 import discord
 
 from csse3200bot.bot import CSSEBot
+from csse3200bot.interactions import respond
 
 log = logging.getLogger(__name__)
 
@@ -31,7 +32,7 @@ def studio_required(func):  # noqa: ANN001, ANN201
 
         if guild is None:
             log.warning(f"Command {func.__name__} used outside of guild")
-            await interaction.response.send_message("This command must be used in a server.", ephemeral=True)
+            await respond(interaction, "This command must be used in a server.", ephemeral=True)
             return None
 
         if hasattr(self, "_bot"):  # python magic
@@ -40,9 +41,7 @@ def studio_required(func):  # noqa: ANN001, ANN201
             bot = self
         else:
             log.error(f"Could not find the bot instance in {func.__name__}")
-            await interaction.response.send_message(
-                "Bot configuration error, Lucas has something wrong here", ephemeral=True
-            )
+            await respond(interaction, "Bot configuration error, Lucas has something wrong here", ephemeral=True)
             return None
 
         # studio_exists
@@ -50,7 +49,8 @@ def studio_required(func):  # noqa: ANN001, ANN201
         if studio is None:
             msg = "This command requires a studio to be set up for the guild - staff use `/studio setup` for this."
 
-            await interaction.response.send_message(
+            await respond(
+                interaction,
                 msg,
                 ephemeral=True,
             )
@@ -1,5 +1,5 @@
 """Views for studio."""
 
-__all__ = ["StudioSetupView"]
+__all__ = ["StudioSetupView", "StudioSetupWizard"]
 
-from .setup import StudioSetupView
+from .setup import StudioSetupView, StudioSetupWizard
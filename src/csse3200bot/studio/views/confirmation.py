@@ -4,25 +4,28 @@ from typing import TYPE_CHECKING
 
 import discord
 
+from csse3200bot.interactions import BotView
 from csse3200bot.studio.views.utils import manage_guild_perms_only
 
 if TYPE_CHECKING:
-    from csse3200bot.studio.views.setup import StudioSetupView
+    from csse3200bot.studio.views.setup import StudioSetupWizard
 
 
-class ConfirmationView(discord.ui.View):
+class ConfirmationView(BotView):
     """View to confirm studio details during setup."""
 
-    def __init__(self, parent_view: "StudioSetupView") -> None:
+    def __init__(self, wizard: "StudioSetupWizard") -> None:
         """Construct a confirmation view."""
-        super().__init__(timeout=300)
-        self.parent = parent_view
+        super().__init__(timeout=None)
+        self.wizard = wizard
 
     async def interaction_check(self, interaction: discord.Interaction) -> bool:
         """Checks the perms before doing the interaction."""
-        return await manage_guild_perms_only(interaction)
+        return await super().interaction_check(interaction) and await manage_guild_perms_only(interaction)
 
-    @discord.ui.button(label="Activate Studio Bot", style=discord.ButtonStyle.success, emoji="🚀")
+    @discord.ui.button(
+        label="Activate Studio Bot", style=discord.ButtonStyle.success, emoji="🚀", custom_id="studio_setup:confirm"
+    )
     async def confirm_setup(self, interaction: discord.Interaction, _: discord.ui.Button) -> None:
         """Run when button is pressed."""
-        await self.parent.finish_setup(interaction)
+        await self.wizard.finish_setup(interaction)
@@ -5,60 +5,57 @@ from typing import TYPE_CHECKING
 
 import discord
 
+from csse3200bot.interactions import BotView
 from csse3200bot.studio.views.utils import manage_guild_perms_only
 
 if TYPE_CHECKING:
-    from csse3200bot.studio.views.setup import StudioSetupView
+    from csse3200bot.studio.views.setup import StudioSetupWizard
 
 log = logging.getLogger(__name__)
 
+# Discord needs at least one option, the persistent view's options are never shown
+_PLACEHOLDER_OPTION = discord.SelectOption(label="-")
 
-class GitHubSetupView(discord.ui.View):
+
+class GitHubSetupView(BotView):
     """View that displays github repo picker."""
 
-    def __init__(self, parent_view: "StudioSetupView", repo_names: list[str]) -> None:
+    def __init__(self, wizard: "StudioSetupWizard", repo_names: list[str]) -> None:
         """Creates a github setup view, used when setting the github repo for a studio.
 
         Args:
-            parent_view (StudioSetupView): studio setup view
+            wizard (StudioSetupWizard): studio setup wizard
             repo_names (list[str]): list of valid repo names for autocomplete
         """
-        super().__init__(timeout=300)
-        self.parent = parent_view
-        self.add_item(GitHubRepoSelect(parent_view, repo_names))
+        super().__init__(timeout=None)
+        self.wizard = wizard
+        self.add_item(GitHubRepoSelect(wizard, repo_names))
 
     async def interaction_check(self, interaction: discord.Interaction) -> bool:
         """Checks the perms before doing the interaction."""
-        return await manage_guild_perms_only(interaction)
+        return await super().interaction_check(interaction) and await manage_guild_perms_only(interaction)
 
 
 class GitHubRepoSelect(discord.ui.Select):
     """Github Repo Dropdown."""
 
-    def __init__(self, parent_view: "StudioSetupView", repo_names: list[str]) -> None:
+    def __init__(self, wizard: "StudioSetupWizard", repo_names: list[str]) -> None:
         """Dropdown for selecting github repo name.
 
         Args:
-            parent_view (StudioSetupView): studio setup view
+            wizard (StudioSetupWizard): studio setup wizard
             repo_names (list[str]): list of valid repo names for autocomplete
         """
-        self.parent = parent_view
+        self.wizard = wizard
 
-        options = [discord.SelectOption(label=repo, value=repo) for repo in repo_names]
+        options = [discord.SelectOption(label=repo, value=repo) for repo in repo_names] or [_PLACEHOLDER_OPTION]
 
         super().__init__(
             placeholder="Select a Github repository name...",
             options=options,
+            custom_id="studio_setup:repo_name",
         )
 
     async def callback(self, interaction: discord.Interaction) -> None:
         """Select callback."""
-        try:
-            selected_repo = self.values[0]
-            self.parent.repo_name = selected_repo
-            await self.parent.next_step(interaction)
-        except Exception:
-            msg = "Failed to select github repository"
-            log.exception(msg)
-            await interaction.response.send_message(msg, ephemeral=True)
-            await self.parent.retry_step(interaction)
+        await self.wizard.answer(interaction, "repo_name", self.values[0])
@@ -1,151 +1,154 @@
 """Views for studio setup."""
 
+import asyncio
 import datetime
 import logging
-from collections.abc import Callable
-from typing import TypedDict
+from typing import Literal
 
 import discord
 
 from csse3200bot import constants
 from csse3200bot.bot import CSSEBot
+from csse3200bot.interactions import BotView
+from csse3200bot.studio.models import StudioSetupModel
+from csse3200bot.studio.service import delete_setup_state, get_setup_state, save_setup_state
 from csse3200bot.studio.views.confirmation import ConfirmationView
 from csse3200bot.studio.views.repo_name import GitHubSetupView
 from csse3200bot.studio.views.studio_num import StudioNumberSetupView
 from csse3200bot.studio.views.studio_year import StudioYearSetupView
-from csse3200bot.studio.views.utils import make_step_embed, manage_guild_perms_only
+from csse3200bot.studio.views.utils import make_step_embed, manage_guild_perms_only, static_view
 
 log = logging.getLogger(__name__)
 
+ERROR_COLOUR = 0xFF0000
 
-class ViewStep(TypedDict):
-    """View step."""
+SetupQuestion = Literal["studio_number", "studio_year", "repo_name"]
 
-    title: str
-    desc: Callable[[], str]
-    view_constructor: Callable[[], discord.ui.View]
 
+class StudioSetupWizard:
+    """Runs every studio setup wizard.
 
-class StudioSetupView(discord.ui.View):
-    """Studio setup view for collecting studio configuration."""
+    The wizards' views are persistent, registered once and routed to by their fixed custom ids, so one instance of
+    each serves every wizard and keeps working after a restart. Views sent in messages are only rendered, never
+    listened to. The answers given so far are kept in the database, by the id of the wizard's message.
+    """
 
     _bot: CSSEBot
-    _guild: discord.Guild
 
-    _current_step: int
-    _steps: list[ViewStep]
-
-    _current_year: int
-
-    studio_num: int | None
-    studio_year: int | None
-    repo_name: str | None
-
-    def __init__(self, bot: CSSEBot, guild: discord.Guild) -> None:
+    def __init__(self, bot: CSSEBot) -> None:
         """Constructor."""
-        super().__init__(timeout=600)
         self._bot = bot
-        self._guild = guild
-
-        self.studio_num = None
-        self.studio_year = datetime.datetime.now(tz=datetime.UTC).year
-        self.repo_name = None
-
-        self._current_year = datetime.datetime.now(tz=datetime.UTC).year
-
-        self._current_step = 0
-
-        self._steps = [
-            {
-                "title": "Studio Number",
-                "desc": lambda: "What's your studio number?\n\n",
-                "view_constructor": lambda: StudioNumberSetupView(self),
-            },
-            {
-                "title": "Studio Year",
-                "desc": lambda: f"What year is this studio for? (Defaults to {self._current_year})",
-                "view_constructor": lambda: StudioYearSetupView(self),
-            },
-            {
-                "title": "GitHub Repo",
-                "desc": lambda: "What's your GitHub repo?\n\n",
-                "view_constructor": lambda: GitHubSetupView(
-                    self, [repo.name for repo in self._bot.github_org.get_repos()]
-                ),
-            },
-            {
-                "title": "Confirm",
-                "desc": lambda: (
-                    f"**Studio Number:** {self.studio_num}\n"
-                    f"**Studio Year:** {self.studio_year}\n"
-                    f"**GitHub Repo:** [`{self.repo_name}`](https://github.com/{constants.GH_ORG_NAME}/{self.repo_name})\n\n"
-                ),
-                "view_constructor": lambda: ConfirmationView(self),
-            },
-        ]
-
-    @discord.ui.button(label="Setup Studio", style=discord.ButtonStyle.primary)
-    async def start_setup(self, interaction: discord.Interaction, _: discord.ui.Button) -> None:
-        """Start setup button."""
-        await self.next_step(interaction)
-
-    async def interaction_check(self, interaction: discord.Interaction) -> bool:
-        """Checks the perms before doing the interaction."""
-        return await manage_guild_perms_only(interaction)
 
-    async def retry_step(self, interaction: discord.Interaction) -> None:
-        """Retry current step."""
-        if self._current_step >= len(self._steps):
-            await self.finish_setup(interaction)
-            return
-
-        step = self._steps[self._current_step]
-        embed = make_step_embed(self._current_step + 1, step["title"], step["desc"]())
-        view = step["view_constructor"]()
-        await interaction.response.edit_message(embed=embed, view=view)
-
-    async def next_step(self, interaction: discord.Interaction) -> None:
-        """Progress to the next step."""
-        if self._current_step >= len(self._steps):
-            await self.finish_setup(interaction)
-            return
+    def persistent_views(self) -> list[discord.ui.View]:
+        """A view of each step, to add to the bot once, which handle the interactions of every wizard."""
+        return [
+            StudioSetupView(self),
+            StudioNumberSetupView(self),
+            StudioYearSetupView(self),
+            GitHubSetupView(self, []),
+            ConfirmationView(self),
+        ]
 
+    def start_view(self) -> discord.ui.View:
+        """View to send with the setup message, to start a wizard."""
+        return static_view(StudioSetupView(self))
+
+    async def _get_state(self, interaction: discord.Interaction) -> StudioSetupModel | None:
+        """Answers of the interaction's wizard, or None (after telling the user) if it has expired."""
+        if interaction.message is not None:
+            async with self._bot.get_db() as session:
+                state = await get_setup_state(session, str(interaction.message.id))
+            if state is not None:
+                return state
+        await interaction.response.send_message(
+            "This setup has expired, run `/studio setup` to start again.", ephemeral=True
+        )
+        return None
+
+    async def _render_step(self, state: StudioSetupModel) -> tuple[discord.Embed, discord.ui.View]:
+        """The first unanswered question."""
+        if state.studio_number is None:
+            embed = make_step_embed(1, "Studio Number", "What's your studio number?\n\n")
+            return embed, StudioNumberSetupView(self)
+        if state.studio_year is None:
+            current_year = datetime.datetime.now(tz=datetime.UTC).year
+            embed = make_step_embed(2, "Studio Year", f"What year is this studio for? (Defaults to {current_year})")
+            return embed, StudioYearSetupView(self)
+        if state.repo_name is None:
+            repo_names = await asyncio.to_thread(lambda: [repo.name for repo in self._bot.github_org.get_repos()])
+            embed = make_step_embed(3, "GitHub Repo", "What's your GitHub repo?\n\n")
+            return embed, GitHubSetupView(self, repo_names)
+        embed = make_step_embed(
+            4,
+            "Confirm",
+            f"**Studio Number:** {state.studio_number}\n"
+            f"**Studio Year:** {state.studio_year}\n"
+            f"**GitHub Repo:** [`{state.repo_name}`](https://github.com/{constants.GH_ORG_NAME}/{state.repo_name})\n\n",
+        )
+        return embed, ConfirmationView(self)
+
+    async def _next_step(self, interaction: discord.Interaction, state: StudioSetupModel) -> None:
+        """Save the answers, and progress to the next step."""
         try:
-            step = self._steps[self._current_step]
-            embed = make_step_embed(self._current_step + 1, step["title"], step["desc"]())
-            view = step["view_constructor"]()
-            await interaction.response.edit_message(embed=embed, view=view)
-
-            self._current_step += 1
+            async with self._bot.get_db() as session:
+                await save_setup_state(session, state)
+            embed, view = await self._render_step(state)
+            await interaction.response.edit_message(embed=embed, view=static_view(view))
         except Exception:
             log.exception("Error executing step")
             await interaction.response.edit_message(
                 embed=discord.Embed(
                     title="Setup Error",
                     description="An unexpected error occurred during setup. Please try again.",
-                    color=0xFF0000,
+                    color=ERROR_COLOUR,
                 ),
                 view=None,
             )
-            self.stop()
+
+    async def start(self, interaction: discord.Interaction) -> None:
+        """Start (or restart) the wizard in the interaction's message."""
+        if interaction.message is None or interaction.guild_id is None:
+            return
+        state = StudioSetupModel(
+            message_id=str(interaction.message.id),
+            guild_id=str(interaction.guild_id),
+            studio_number=None,
+            studio_year=None,
+            repo_name=None,
+        )
+        await self._next_step(interaction, state)
+
+    async def answer(self, interaction: discord.Interaction, question: SetupQuestion, value: int | str) -> None:
+        """Answer a question of the interaction's wizard, moving on to the next."""
+        state = await self._get_state(interaction)
+        if state is None:
+            return
+        setattr(state, question, value)
+        await self._next_step(interaction, state)
 
     async def finish_setup(self, interaction: discord.Interaction) -> None:
-        """Save configuration using the view."""
+        """Save configuration from the wizard's answers."""
+        state = await self._get_state(interaction)
+        if state is None:
+            return
+
+        guild_id: str = state.guild_id
         try:
             await interaction.response.defer(thinking=True)
-            if self.studio_num is None or self.repo_name is None or self.studio_year is None:
+            if state.studio_number is None or state.repo_name is None or state.studio_year is None:
                 embed = discord.Embed(
                     title="❌ Setup Failed",
                     description="There was an error saving your studio configuration - studio num/year/repo name failed",  # noqa: E501
-                    color=0xFF0000,
+                    color=ERROR_COLOUR,
                 )
                 await interaction.edit_original_response(embed=embed, view=None)
                 return
 
-            guild_id: str = str(interaction.guild_id)
             studio = await self._bot.create_or_update_studio(
-                guild_id, self.studio_num, self.studio_year, self.repo_name
+                guild_id, state.studio_number, state.studio_year, state.repo_name
             )
+            async with self._bot.get_db() as session:
+                await delete_setup_state(session, state.message_id)
 
             embed = discord.Embed(
                 title="🎉 Studio Setup Complete!",
@@ -170,8 +173,24 @@ class StudioSetupView(discord.ui.View):
             embed = discord.Embed(
                 title="❌ Setup Failed",
                 description="There was an error saving your studio configuration. Please try again.",
-                color=0xFF0000,
+                color=ERROR_COLOUR,
             )
             await interaction.edit_original_response(embed=embed, view=None)
 
-        self.stop()
+
+class StudioSetupView(BotView):
+    """Studio setup view, starting the wizard."""
+
+    def __init__(self, wizard: StudioSetupWizard) -> None:
+        """Constructor."""
+        super().__init__(timeout=None)
+        self.wizard = wizard
+
+    @discord.ui.button(label="Setup Studio", style=discord.ButtonStyle.primary, custom_id="studio_setup:start")
+    async def start_setup(self, interaction: discord.Interaction, _: discord.ui.Button) -> None:
+        """Start setup button."""
+        await self.wizard.start(interaction)
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        """Checks the perms before doing the interaction."""
+        return await super().interaction_check(interaction) and await manage_guild_perms_only(interaction)
@@ -6,58 +6,59 @@ from typing import TYPE_CHECKING
 import discord
 
 from csse3200bot import constants
+from csse3200bot.interactions import BotView
 from csse3200bot.studio.views.utils import manage_guild_perms_only
 
 if TYPE_CHECKING:
-    from csse3200bot.studio.views.setup import StudioSetupView
+    from csse3200bot.studio.views.setup import StudioSetupWizard
 
 log = logging.getLogger(__name__)
 
 
-class StudioNumberSetupView(discord.ui.View):
+class StudioNumberSetupView(BotView):
     """View that displays the studio number setup."""
 
-    def __init__(self, parent_view: "StudioSetupView") -> None:
+    def __init__(self, wizard: "StudioSetupWizard") -> None:
         """Creates a view used during studio number selection.
 
         Args:
-            parent_view (StudioSetupView): studio setup view.
+            wizard (StudioSetupWizard): studio setup wizard.
         """
-        super().__init__(timeout=300)
-        self.add_item(StudioNumberSelect(parent_view))
-        self.parent = parent_view
+        super().__init__(timeout=None)
+        self.add_item(StudioNumberSelect(wizard))
+        self.wizard = wizard
 
     async def interaction_check(self, interaction: discord.Interaction) -> bool:
         """Checks the perms before doing the interaction."""
-        return await manage_guild_perms_only(interaction)
+        return await super().interaction_check(interaction) and await manage_guild_perms_only(interaction)
 
 
 class StudioNumberSelect(discord.ui.Select):
     """Studio Number Dropdown."""
 
-    def __init__(self, parent_view: "StudioSetupView") -> None:
+    def __init__(self, wizard: "StudioSetupWizard") -> None:
         """Create a studio number dropdown.
 
         Args:
-            parent_view (StudioSetupView): studio setup view.
+            wizard (StudioSetupWizard): studio setup wizard.
         """
-        self.parent = parent_view
+        self.wizard = wizard
 
         options = [discord.SelectOption(label=f"Studio {i}", value=str(i)) for i in range(1, constants.NUM_STUDIOS + 1)]
 
         super().__init__(
             placeholder="Choose your studio number...",
             options=options,
+            custom_id="studio_setup:studio_number",
         )
 
     async def callback(self, interaction: discord.Interaction) -> None:
         """Select callback."""
         try:
             studio_number = int(self.values[0])
-            self.parent.studio_num = studio_number
-            await self.parent.next_step(interaction)
-        except Exception:
+        except ValueError:
             msg = "Failed to process studio number"
             log.exception(msg)
             await interaction.response.send_message(msg, ephemeral=True)
-            await self.parent.retry_step(interaction)
+            return
+        await self.wizard.answer(interaction, "studio_number", studio_number)
@@ -6,35 +6,36 @@ from typing import TYPE_CHECKING
 
 import discord
 
+from csse3200bot.interactions import BotView
 from csse3200bot.studio.views.utils import manage_guild_perms_only
 
 if TYPE_CHECKING:
-    from csse3200bot.studio.views.setup import StudioSetupView
+    from csse3200bot.studio.views.setup import StudioSetupWizard
 
 
 log = logging.getLogger(__name__)
 
 
-class StudioYearSetupView(discord.ui.View):
+class StudioYearSetupView(BotView):
     """Studio year setup."""
 
-    def __init__(self, parent_view: "StudioSetupView") -> None:
+    def __init__(self, wizard: "StudioSetupWizard") -> None:
         """Creates view for studio year selection."""
-        super().__init__(timeout=300)
-        self.parent = parent_view
-        self.add_item(StudioYearSelect(parent_view))
+        super().__init__(timeout=None)
+        self.wizard = wizard
+        self.add_item(StudioYearSelect(wizard))
 
     async def interaction_check(self, interaction: discord.Interaction) -> bool:
         """Checks the perms before doing the interaction."""
-        return await manage_guild_perms_only(interaction)
+        return await super().interaction_check(interaction) and await manage_guild_perms_only(interaction)
 
 
 class StudioYearSelect(discord.ui.Select):
     """Studio Year Select."""
 
-    def __init__(self, parent_view: "StudioSetupView") -> None:
+    def __init__(self, wizard: "StudioSetupWizard") -> None:
         """Creates a dropdown used to select the studio year."""
-        self.parent = parent_view
+        self.wizard = wizard
         current_year = datetime.datetime.now(tz=datetime.UTC).year
 
         options = [
@@ -44,16 +45,16 @@ class StudioYearSelect(discord.ui.Select):
         super().__init__(
             placeholder=f"Select the studio year (default: {current_year})",
             options=options,
+            custom_id="studio_setup:studio_year",
         )
 
     async def callback(self, interaction: discord.Interaction) -> None:
         """Callback for select."""
         try:
             year = int(self.values[0])
-            self.parent.studio_year = year
-            await self.parent.next_step(interaction)
-        except Exception:
+        except ValueError:
             msg = "Failed to validate studio year"
             log.exception(msg)
             await interaction.response.send_message(msg, ephemeral=True)
-            await self.parent.retry_step(interaction)
+            return
+        await self.wizard.answer(interaction, "studio_year", year)
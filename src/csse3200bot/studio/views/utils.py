@@ -26,3 +26,13 @@ def make_step_embed(step: int, title: str, description: str, color: int = 0x7289
         description=description,
         color=color,
     )
+
+
+def static_view[V: discord.ui.View](view: V) -> V:
+    """Stop a view, so sending it only renders its components.
+
+    Interactions with it are then handled by the persistent view with the same custom ids, rather than the bot
+    keeping a view for every message it's sent in.
+    """
+    view.stop()
+    return view
@@ -0,0 +1,101 @@
+"""Application command syncing, only syncing scopes whose commands changed since they were last synced."""
+
+import hashlib
+import json
+from collections.abc import Mapping
+from typing import Any, TypedDict
+
+import discord
+from discord import app_commands
+from sqlalchemy import JSON
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Mapped, mapped_column
+
+from csse3200bot.database.base import BaseDBModel
+from csse3200bot.database.mixins import TimestampMixin
+
+GLOBAL_SCOPE = "global"
+
+
+class CommandSyncModel(BaseDBModel, TimestampMixin):
+    """DB Model for the commands last synced to a scope, as hashes of their payloads."""
+
+    __tablename__ = "command_sync"
+
+    scope: Mapped[str] = mapped_column(primary_key=True)  # GLOBAL_SCOPE or a guild id
+    command_hashes: Mapped[dict[str, str]] = mapped_column(JSON)  # command -> hash of its payload
+
+
+class CommandDiff(TypedDict):
+    """Names of the commands that differ from those last synced."""
+
+    added: list[str]
+    removed: list[str]
+    changed: list[str]
+
+
+def scope_name(guild: discord.abc.Snowflake | None) -> str:
+    """Scope commands are synced to, either globally or to a guild."""
+    return GLOBAL_SCOPE if guild is None else str(guild.id)
+
+
+def _command_key(command: app_commands.Command[Any, ..., Any] | app_commands.Group | app_commands.ContextMenu) -> str:
+    if isinstance(command, app_commands.ContextMenu):
+        return f"{command.type.name}:{command.name}"
+    return command.name
+
+
+def hash_commands(tree: app_commands.CommandTree, guild: discord.abc.Snowflake | None) -> dict[str, str]:
+    """Hash the payload of each command that would be synced to the scope."""
+    return {
+        _command_key(command): hashlib.sha256(
+            json.dumps(command.to_dict(tree), sort_keys=True, default=str).encode()
+        ).hexdigest()
+        for command in tree.get_commands(guild=guild)
+    }
+
+
+def diff_commands(synced: Mapping[str, str], current: Mapping[str, str]) -> CommandDiff:
+    """Commands added, removed and changed since the hashes were synced."""
+    return {
+        "added": sorted(current.keys() - synced.keys()),
+        "removed": sorted(synced.keys() - current.keys()),
+        "changed": sorted(name for name in current.keys() & synced.keys() if current[name] != synced[name]),
+    }
+
+
+def is_empty(diff: CommandDiff) -> bool:
+    """Whether nothing differs."""
+    return not (diff["added"] or diff["removed"] or diff["changed"])
+
+
+def describe_diff(diff: CommandDiff) -> str:
+    """Short description of a diff, e.g. '+gh, ~team, -say'."""
+    parts = [
+        *(f"+{name}" for name in diff["added"]),
+        *(f"~{name}" for name in diff["changed"]),
+        *(f"-{name}" for name in diff["removed"]),
+    ]
+    return ", ".join(parts) or "no changes"
+
+
+async def get_synced_hashes(session: AsyncSession, scope: str) -> dict[str, str]:
+    """Hashes of the commands last synced to the scope, empty if it never has been."""
+    existing = await session.get(CommandSyncModel, scope)
+    return dict(existing.command_hashes) if existing is not None else {}
+
+
+async def has_synced(session: AsyncSession, scope: str) -> bool:
+    """Whether commands have ever been synced to the scope, even if none were."""
+    return await session.get(CommandSyncModel, scope) is not None
+
+
+async def save_synced_hashes(session: AsyncSession, scope: str, command_hashes: dict[str, str]) -> None:
+    """Create or update the hashes of the commands synced to the scope."""
+    existing = await session.get(CommandSyncModel, scope)
+    if existing:
+        existing.command_hashes = command_hashes
+        session.add(existing)
+    else:
+        session.add(CommandSyncModel(scope=scope, command_hashes=command_hashes))
+    await session.commit()
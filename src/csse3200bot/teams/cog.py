@@ -1,31 +1,222 @@
 """Teams cog."""
 
+import asyncio
+import datetime as dt
 import logging
+from collections import defaultdict
+from collections.abc import Awaitable, Callable
 from typing import Literal
+from uuid import UUID
 
 import discord
 from discord import Role, app_commands
 from discord.ext import commands
+from github.GithubException import GithubException
 
 from csse3200bot import constants
-from csse3200bot.bot import CSSEBot
+from csse3200bot.bot import CACHE_SWEEP_INTERVAL, CSSEBot
+from csse3200bot.interactions import auto_defer, respond
 from csse3200bot.studio.utils import studio_required
-from csse3200bot.teams.service import create_or_update_sprint_feature, get_features_for_sprint
-from csse3200bot.teams.utils import get_member_team, get_team_roles
+from csse3200bot.teams.models import TeamSprintModel
+from csse3200bot.teams.report import render_sprint_report, render_sprint_update, render_team_stats
+from csse3200bot.teams.service import (
+    create_or_update_sprint_feature,
+    get_contribution_cursor,
+    get_contributor_totals,
+    get_features_for_sprint,
+    save_contribution_cursor,
+    save_contribution_weeks,
+    save_pull_requests,
+)
+from csse3200bot.teams.stats import aggregate_team_stats, fetch_contributor_weeks, fetch_pull_requests
+from csse3200bot.teams.views import PaginatorView
+from csse3200bot.utils import AsyncCache, as_utc
 
 log = logging.getLogger(__name__)
 
 SprintNumber = Literal[1, 2, 3, 4]  # Need to find a better way to do this
 
+SPRINT_FEATURES_NAMESPACE = "teams.sprint_features"
+STATS_NAMESPACE = "teams.stats"
+
+# Background job intervals (seconds)
+STATS_REFRESH_INTERVAL = 1800
+
+StatsKey = tuple[str, int, int | None]  # (repo_name, guild_id, sprint_number), no sprint number for all time
+
+
+def _sprint_key_to_str(key: tuple[UUID, int]) -> str:
+    return f"{key[0]}:{key[1]}"
+
+
+def _sprint_key_from_str(key: str) -> tuple[UUID, int]:
+    studio_id, sprint_number = key.rsplit(":", 1)
+    return UUID(studio_id), int(sprint_number)
+
 
 class TeamsCog(commands.GroupCog, name="team"):
     """Teams cog."""
 
     _bot: CSSEBot
 
+    # Both keyed by (studio_id, sprint_number)
+    _features_cache: AsyncCache[tuple[UUID, int], list[TeamSprintModel]]
+    _report_cache: AsyncCache[tuple[UUID, int], list[discord.Embed]]
+    _stats_cache: AsyncCache[StatsKey, discord.Embed]
+    _stats_locks: defaultdict[str, asyncio.Lock]  # keyed by repo name
+
     def __init__(self, bot: CSSEBot) -> None:
         """Constructor."""
         self._bot = bot
+        self._features_cache = AsyncCache[tuple[UUID, int], list[TeamSprintModel]](
+            self._get_features_wrapper(), ttl=bot.cache_ttl
+        )
+        self._report_cache = AsyncCache[tuple[UUID, int], list[discord.Embed]](
+            self._get_report_wrapper(), ttl=bot.cache_ttl
+        )
+        self._stats_cache = AsyncCache[StatsKey, discord.Embed](self._get_stats_wrapper(), ttl=bot.cache_ttl)
+        self._stats_locks = defaultdict(asyncio.Lock)
+
+    async def cog_load(self) -> None:
+        """Load cog."""
+        await super().cog_load()
+        self._bot.invalidation_bus.subscribe(
+            SPRINT_FEATURES_NAMESPACE, self._on_sprint_invalidated, self._on_sprint_reset
+        )
+        self._bot.invalidation_bus.subscribe(STATS_NAMESPACE, self._invalidate_stats, self._stats_cache.clear)
+        self._bot.scheduler.add_job("teams.sweep_caches", self._sweep_caches, CACHE_SWEEP_INTERVAL)
+        self._bot.scheduler.add_job("teams.refresh_stats", self._refresh_studio_stats, STATS_REFRESH_INTERVAL)
+
+    async def cog_unload(self) -> None:
+        """Unload cog."""
+        self._bot.invalidation_bus.unsubscribe(SPRINT_FEATURES_NAMESPACE, self._on_sprint_invalidated)
+        self._bot.invalidation_bus.unsubscribe(STATS_NAMESPACE, self._invalidate_stats)
+        self._bot.scheduler.remove_job("teams.sweep_caches")
+        self._bot.scheduler.remove_job("teams.refresh_stats")
+        await super().cog_unload()
+
+    def _get_features_wrapper(self) -> Callable[[tuple[UUID, int]], Awaitable[list[TeamSprintModel] | None]]:
+        """A wrapper for getting the features for a sprint."""
+
+        async def fetch(key: tuple[UUID, int]) -> list[TeamSprintModel] | None:
+            studio_id, sprint_number = key
+            async with self._bot.get_db() as session:
+                return await get_features_for_sprint(session, studio_id, sprint_number)
+
+        return fetch
+
+    def _get_report_wrapper(self) -> Callable[[tuple[UUID, int]], Awaitable[list[discord.Embed] | None]]:
+        """A wrapper for rendering a sprint report."""
+
+        async def fetch(key: tuple[UUID, int]) -> list[discord.Embed] | None:
+            features = await self._features_cache.get(key)
+            return render_sprint_report(key[1], features or [])
+
+        return fetch
+
+    def _get_stats_wrapper(self) -> Callable[[StatsKey], Awaitable[discord.Embed | None]]:
+        """A wrapper for rendering a repo's stats by team, fetching its contributions first if they're stale."""
+
+        async def fetch(key: StatsKey) -> discord.Embed | None:
+            repo_name, guild_id, sprint_number = key
+            guild = self._bot.get_guild(guild_id)
+            if guild is None:
+                return None
+            start, end = None, None
+            if sprint_number is not None:
+                window = self._bot.get_sprint_window(sprint_number)
+                if window is None:
+                    return None
+                start, end = window
+
+            await self.refresh_stats(repo_name, max_age=dt.timedelta(seconds=STATS_REFRESH_INTERVAL))
+            async with self._bot.get_db() as session:
+                totals = await get_contributor_totals(session, repo_name, start, end)
+
+            role_index = self._bot.get_role_index(guild)
+            teams = {}
+            for member in await self._bot.get_guild_members(guild):
+                team = role_index.get_member_team(member)
+                if team is not None:
+                    teams[str(member.id)] = team.name
+
+            title = f"{repo_name} - Sprint {sprint_number}" if sprint_number is not None else f"{repo_name} - All time"
+            return render_team_stats(title, aggregate_team_stats(totals, teams))
+
+        return fetch
+
+    async def _sweep_caches(self) -> None:
+        self._features_cache.purge_expired()
+        self._report_cache.purge_expired()
+        self._stats_cache.purge_expired()
+
+    def _invalidate_stats(self, repo_name: str) -> None:
+        """Drop the cached stats of every guild and sprint for a repo."""
+        for key in self._stats_cache.cached_keys():
+            if key[0] == repo_name:
+                self._stats_cache.remove(key)
+
+    async def refresh_stats(self, repo_name: str, max_age: dt.timedelta | None = None) -> bool:
+        """Fetch the repo's new contributions, returning whether any were found.
+
+        Skipped if the repo was refreshed within `max_age`.
+        """
+        async with self._stats_locks[repo_name]:
+            async with self._bot.get_db() as session:
+                cursor = await get_contribution_cursor(session, repo_name)
+            if (
+                cursor is not None
+                and max_age is not None
+                and dt.datetime.now(dt.UTC) - as_utc(cursor.refreshed_at) < max_age
+            ):
+                return False
+
+            stats_etag = cursor.stats_etag if cursor is not None else None
+            pulls_since = as_utc(cursor.pulls_since) if cursor is not None and cursor.pulls_since else None
+            requester = self._bot.github_client.requester
+            full_name = f"{constants.GH_ORG_NAME}/{repo_name}"
+            try:
+                stats = await asyncio.to_thread(fetch_contributor_weeks, requester, full_name, stats_etag)
+                pulls, new_pulls_since = await asyncio.to_thread(fetch_pull_requests, requester, full_name, pulls_since)
+            except GithubException:
+                log.exception(f"Couldn't fetch the contributions of repo '{repo_name}'")
+                return False
+
+            async with self._bot.get_db() as session:
+                changed = await save_contribution_weeks(session, repo_name, stats["weeks"]) > 0
+                changed |= await save_pull_requests(session, repo_name, pulls) > 0
+                await save_contribution_cursor(session, repo_name, stats["etag"], new_pulls_since)
+
+                if changed:
+                    log.info(f"Found new contributions in repo '{repo_name}'")
+                    await self._bot.invalidation_bus.publish(session, STATS_NAMESPACE, repo_name)
+            if changed:
+                self._invalidate_stats(repo_name)
+            return changed
+
+    async def _refresh_studio_stats(self) -> None:
+        """Fetch the new contributions of every studio's repo."""
+        repos = set()
+        for guild in self._bot.guilds:
+            studio = await self._bot.get_studio(guild)
+            if studio is not None:
+                repos.add(studio.repo_name)
+        for repo_name in repos:
+            await self.refresh_stats(repo_name)
+
+    def _invalidate_sprint(self, key: tuple[UUID, int]) -> None:
+        """Drop the cached features and report for a sprint."""
+        self._features_cache.remove(key)
+        self._report_cache.remove(key)
+
+    def _on_sprint_invalidated(self, key: str) -> None:
+        """Sprint features were changed by another process."""
+        self._invalidate_sprint(_sprint_key_from_str(key))
+
+    def _on_sprint_reset(self) -> None:
+        """Sprint features may have been changed by another process."""
+        self._features_cache.clear()
+        self._report_cache.clear()
 
     @commands.Cog.listener()
     async def on_guild_join(self, guild: discord.Guild) -> None:
@@ -61,12 +252,13 @@ class TeamsCog(commands.GroupCog, name="team"):
             await interaction.response.send_message("This command must be used in a server.", ephemeral=True)
             return
 
-        member = guild.get_member(interaction.user.id)
+        member = await self._bot.find_member(guild, interaction.user.id)
         if member is None:
             await interaction.response.send_message("Member not found in this server.", ephemeral=True)
             return
 
-        current_team = get_member_team(member)
+        role_index = self._bot.get_role_index(guild)
+        current_team = role_index.get_member_team(member)
         if current_team:
             msg = (
                 f"You've already been assigned to '{current_team.name}'."
@@ -78,9 +270,7 @@ class TeamsCog(commands.GroupCog, name="team"):
             )
             return
 
-        team_roles = await self._get_team_roles(interaction)
-
-        role_to_assign = discord.utils.get(team_roles, name=team)
+        role_to_assign = role_index.get_team_role(team)
         if role_to_assign is None:
             await interaction.response.send_message(f"Team role '{team}' not found.", ephemeral=True)
             return
@@ -102,7 +292,7 @@ class TeamsCog(commands.GroupCog, name="team"):
             await interaction.response.send_message("This command must be used in a server.", ephemeral=True)
             return []
 
-        return get_team_roles(guild)
+        return self._bot.get_role_index(guild).team_roles
 
     @assign_team.autocomplete("team")
     async def assign_autocomplete(self, interaction: discord.Interaction, __: str) -> list[app_commands.Choice[str]]:
@@ -116,7 +306,7 @@ class TeamsCog(commands.GroupCog, name="team"):
     @app_commands.checks.has_permissions(manage_guild=True)
     async def unassign_team(self, interaction: discord.Interaction, member: discord.Member) -> None:
         """Unassign a user from a team."""
-        team_role = get_member_team(member)
+        team_role = self._bot.get_role_index(member.guild).get_member_team(member)
 
         if not team_role:
             await interaction.response.send_message(f"{member.display_name} is not in a team.", ephemeral=True)
@@ -150,7 +340,7 @@ class TeamsCog(commands.GroupCog, name="team"):
             await interaction.response.send_message("Must be used in a server.", ephemeral=True)
             return
 
-        team_role = get_member_team(member)
+        team_role = self._bot.get_role_index(guild).get_member_team(member)
         if team_role is None:
             await interaction.response.send_message("You must be in a team to use this command.", ephemeral=True)
             return
@@ -161,6 +351,7 @@ class TeamsCog(commands.GroupCog, name="team"):
             await interaction.response.send_message("Studio not fully setup yet", ephemeral=True)
             return
 
+        key = (studio.studio_id, sprint_number)
         async with self._bot.get_db() as session:
             await create_or_update_sprint_feature(
                 session,
@@ -169,33 +360,73 @@ class TeamsCog(commands.GroupCog, name="team"):
                 sprint_number=sprint_number,
                 description=features,
             )
+            await self._bot.invalidation_bus.publish(session, SPRINT_FEATURES_NAMESPACE, _sprint_key_to_str(key))
+        self._invalidate_sprint(key)
         await interaction.response.send_message(f"Updated features for **{team_role.name}** (Sprint {sprint_number}).")
+        await self._bot.broadcast_to_studio(
+            studio, embed=render_sprint_update(team_role.name, sprint_number, features, guild.name)
+        )
 
     @app_commands.command(name="sprint_get", description="Get what features each team is working on for a given sprint")
     @app_commands.describe(sprint_number="Sprint in which you are completing the features")
+    @auto_defer()
     @studio_required
     async def sprint_get(self, interaction: discord.Interaction, sprint_number: SprintNumber) -> None:
         """Get what features each team is doing for a given sprint."""
         guild = interaction.guild
         if guild is None:
-            await interaction.response.send_message("Must be used in a server.", ephemeral=True)
+            await respond(interaction, "Must be used in a server.", ephemeral=True)
             return
 
         studio = await self._bot.get_studio(guild)
         if studio is None:
             log.error("This should not occur as caught by 'studio_required' decorator")
-            await interaction.response.send_message("Studio not fully setup yet", ephemeral=True)
+            await respond(interaction, "Studio not fully setup yet", ephemeral=True)
             return
 
-        async with self._bot.get_db() as session:
-            features = await get_features_for_sprint(session, studio.studio_id, sprint_number)
+        pages = await self._report_cache.get((studio.studio_id, sprint_number))
+        if not pages:
+            await respond(interaction, f"No teams have set features for sprint {sprint_number}.")
+            return
+
+        if len(pages) == 1:
+            await respond(interaction, embed=pages[0])
+            return
+
+        view = PaginatorView(pages)
+        await respond(interaction, embed=view.first_page, view=view)
+
+    @app_commands.command(
+        name="stats", description="Commits, pull requests and lines changed by each team - Staff Only"
+    )
+    @app_commands.describe(sprint_number="Sprint to count contributions in, leave empty for all time")
+    @app_commands.checks.has_permissions(manage_guild=True)
+    @auto_defer(ephemeral=True)
+    @studio_required
+    async def team_stats(self, interaction: discord.Interaction, sprint_number: SprintNumber | None = None) -> None:
+        """Show each team's contributions to the studio's repo."""
+        guild = interaction.guild
+        if guild is None:
+            await respond(interaction, "Must be used in a server.", ephemeral=True)
+            return
+
+        studio = await self._bot.get_studio(guild)
+        if studio is None:
+            log.error("This should not occur as caught by 'studio_required' decorator")
+            await respond(interaction, "Studio not fully setup yet", ephemeral=True)
+            return
+
+        if sprint_number is not None and self._bot.get_sprint_window(sprint_number) is None:
+            await respond(interaction, f"The dates of sprint {sprint_number} haven't been configured.", ephemeral=True)
+            return
 
-        if not features:
-            await interaction.response.send_message(f"No teams have set features for sprint {sprint_number}.")
+        embed = await self._stats_cache.get((studio.repo_name, guild.id, sprint_number))
+        if embed is None:
+            await respond(interaction, f"Unable to get the contributions to '{studio.repo_name}'", ephemeral=True)
             return
+        await respond(interaction, embed=embed, ephemeral=True)
 
-        msg = f"**Sprint {sprint_number} Features**\n"
-        for item in features:
-            msg += f"- **{item.team_number}**: {item.description}\n"
 
-        await interaction.response.send_message(msg)
+async def setup(bot: CSSEBot) -> None:
+    """Extension entry point."""
+    await bot.add_cog(TeamsCog(bot))
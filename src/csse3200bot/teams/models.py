@@ -1,8 +1,10 @@
 """Teams models."""
 
+import datetime as dt
 from uuid import UUID
 
-from sqlalchemy import ForeignKey, PrimaryKeyConstraint
+from sqlalchemy import DateTime as SQLDatetime
+from sqlalchemy import ForeignKey, Index, PrimaryKeyConstraint
 from sqlalchemy.orm import Mapped, mapped_column
 
 from csse3200bot.database.base import BaseDBModel
@@ -18,3 +20,47 @@ class TeamSprintModel(BaseDBModel):
     team_number: Mapped[str]
     sprint_number: Mapped[int]
     description: Mapped[str]
+
+
+class ContributionWeekModel(BaseDBModel):
+    """DB Model for a github user's contributions to a repo in a week, from github's contributor stats."""
+
+    __tablename__ = "contribution_week"
+    __table_args__ = (PrimaryKeyConstraint("repo_name", "gh_id", "week_start"),)
+
+    repo_name: Mapped[str]
+    gh_id: Mapped[str]
+    week_start: Mapped[dt.datetime] = mapped_column(SQLDatetime(timezone=True))
+
+    commits: Mapped[int]
+    additions: Mapped[int]
+    deletions: Mapped[int]
+
+
+class PullRequestModel(BaseDBModel):
+    """DB Model for a pull request in a repo."""
+
+    __tablename__ = "pull_request"
+    __table_args__ = (
+        PrimaryKeyConstraint("repo_name", "number"),
+        Index("ix_pull_request_repo_name_created_at", "repo_name", "created_at"),
+    )
+
+    repo_name: Mapped[str]
+    number: Mapped[int]
+
+    gh_id: Mapped[str | None]  # of the author, None if their account was deleted
+    created_at: Mapped[dt.datetime] = mapped_column(SQLDatetime(timezone=True))
+    merged_at: Mapped[dt.datetime | None] = mapped_column(SQLDatetime(timezone=True))
+
+
+class ContributionCursorModel(BaseDBModel):
+    """DB Model for how far a repo's contributions have been fetched."""
+
+    __tablename__ = "contribution_cursor"
+
+    repo_name: Mapped[str] = mapped_column(primary_key=True)
+
+    stats_etag: Mapped[str | None]  # of the last contributor stats response
+    pulls_since: Mapped[dt.datetime | None] = mapped_column(SQLDatetime(timezone=True))  # newest update fetched
+    refreshed_at: Mapped[dt.datetime] = mapped_column(SQLDatetime(timezone=True))
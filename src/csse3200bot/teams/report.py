@@ -0,0 +1,118 @@
+"""Sprint feature report rendering."""
+
+from collections.abc import Iterable, Iterator, Sequence
+
+import discord
+
+from csse3200bot.teams.models import TeamSprintModel
+from csse3200bot.teams.stats import TeamStats
+
+# Discord embed limits - https://discord.com/developers/docs/resources/message#embed-object-embed-limits
+EMBED_TOTAL_LIMIT = 6000
+EMBED_FIELD_LIMIT = 25
+FIELD_NAME_LIMIT = 256
+FIELD_VALUE_LIMIT = 1024
+EMBED_DESCRIPTION_LIMIT = 4096
+
+# Leaves room for the title and footer in the total embed limit
+_PAGE_BUDGET = EMBED_TOTAL_LIMIT - 500
+
+REPORT_COLOUR = 0x7289DA
+STATS_COLOUR = 0x2DA44E
+_THOUSANDS_FROM = 10_000
+
+
+def _split_value(text: str) -> Iterator[str]:
+    """Split text into chunks that fit in an embed field, preferring to break on newlines."""
+    text = text.strip() or "-"
+    while len(text) > FIELD_VALUE_LIMIT:
+        cut = text.rfind("\n", 0, FIELD_VALUE_LIMIT)
+        if cut <= 0:
+            cut = FIELD_VALUE_LIMIT
+        yield text[:cut]
+        text = text[cut:].lstrip("\n")
+    yield text
+
+
+def _make_page(sprint_number: int) -> discord.Embed:
+    return discord.Embed(title=f"Sprint {sprint_number} Features", color=REPORT_COLOUR)
+
+
+def render_sprint_report(sprint_number: int, features: Iterable[TeamSprintModel]) -> list[discord.Embed]:
+    """Render the sprint features as pages of embeds.
+
+    Each team gets a field (or several, if its description is too long for one) and a new page is started
+    whenever the next field would go over the embed limits.
+    """
+    pages: list[discord.Embed] = []
+    page = _make_page(sprint_number)
+    page_size = 0
+
+    for item in features:
+        for i, chunk in enumerate(_split_value(item.description)):
+            name = item.team_number if i == 0 else f"{item.team_number} (cont.)"
+            name = name[:FIELD_NAME_LIMIT]
+            size = len(name) + len(chunk)
+
+            if len(page.fields) >= EMBED_FIELD_LIMIT or page_size + size > _PAGE_BUDGET:
+                pages.append(page)
+                page = _make_page(sprint_number)
+                page_size = 0
+
+            page.add_field(name=name, value=chunk, inline=False)
+            page_size += size
+
+    if page.fields:
+        pages.append(page)
+
+    if len(pages) > 1:
+        for num, embed in enumerate(pages, start=1):
+            embed.set_footer(text=f"Page {num}/{len(pages)}")
+
+    return pages
+
+
+def _format_count(value: int) -> str:
+    return f"{value / 1000:.1f}k" if value >= _THOUSANDS_FROM else str(value)
+
+
+def render_team_stats(title: str, stats: Sequence[TeamStats]) -> discord.Embed:
+    """Render each team's contributions as a table."""
+    embed = discord.Embed(title=title, color=STATS_COLOUR)
+    if not stats:
+        embed.description = "No contributions."
+        return embed
+
+    rows = [("Team", "Commits", "PRs (merged)", "+/-")]
+    rows.extend(
+        (
+            team["team"],
+            str(team["commits"]),
+            f"{team['pull_requests']} ({team['merged']})",
+            f"+{_format_count(team['additions'])}/-{_format_count(team['deletions'])}",
+        )
+        for team in stats
+    )
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    lines = ["  ".join(cell.ljust(width) for cell, width in zip(row, widths, strict=True)).rstrip() for row in rows]
+
+    table = ""
+    for i, line in enumerate(lines):
+        if len(table) + len(line) + 8 > EMBED_DESCRIPTION_LIMIT:
+            embed.set_footer(text=f"{len(lines) - i} more teams not shown")
+            break
+        table += line + "\n"
+    embed.description = f"```\n{table}```"
+    return embed
+
+
+def render_sprint_update(team: str, sprint_number: int, features: str, guild_name: str) -> discord.Embed:
+    """Render a team's newly set sprint features, to broadcast to the studio's guilds."""
+    description = (
+        features if len(features) <= EMBED_DESCRIPTION_LIMIT else features[: EMBED_DESCRIPTION_LIMIT - 1] + "…"
+    )
+    embed = discord.Embed(
+        title=f"{team} - Sprint {sprint_number} Features", description=description, color=REPORT_COLOUR
+    )
+    embed.set_footer(text=f"Set in {guild_name}")
+    return embed
@@ -1,11 +1,23 @@
 """Team Sprint services."""
 
+import datetime as dt
+from collections.abc import Sequence
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from csse3200bot.teams.models import TeamSprintModel
+from csse3200bot.gh.models import DiscordUserModel
+from csse3200bot.teams.models import (
+    ContributionCursorModel,
+    ContributionWeekModel,
+    PullRequestModel,
+    TeamSprintModel,
+)
+from csse3200bot.teams.stats import ContributionWeek, ContributorTotals, PullRequest
+from csse3200bot.utils import as_utc
+
+_HALF_WEEK = dt.timedelta(days=3, hours=12)
 
 
 async def get_sprint_feature(
@@ -62,9 +74,163 @@ async def get_features_for_sprint(
     sprint_number: int,
 ) -> list[TeamSprintModel]:
     """Get sprint features."""
-    stmt = select(TeamSprintModel).where(
-        TeamSprintModel.studio_id == studio_id,
-        TeamSprintModel.sprint_number == sprint_number,
+    stmt = (
+        select(TeamSprintModel)
+        .where(
+            TeamSprintModel.studio_id == studio_id,
+            TeamSprintModel.sprint_number == sprint_number,
+        )
+        .order_by(TeamSprintModel.team_number)
     )
     result = await session.execute(stmt)
     return list(result.scalars().all())
+
+
+async def get_contribution_cursor(session: AsyncSession, repo_name: str) -> ContributionCursorModel | None:
+    """Get how far a repo's contributions have been fetched."""
+    return await session.get(ContributionCursorModel, repo_name)
+
+
+async def save_contribution_cursor(
+    session: AsyncSession, repo_name: str, stats_etag: str | None, pulls_since: dt.datetime | None
+) -> None:
+    """Create or update how far a repo's contributions have been fetched, as refreshed now."""
+    refreshed_at = dt.datetime.now(dt.UTC)
+    existing = await session.get(ContributionCursorModel, repo_name)
+    if existing:
+        existing.stats_etag = stats_etag
+        existing.pulls_since = pulls_since
+        existing.refreshed_at = refreshed_at
+        session.add(existing)
+    else:
+        session.add(
+            ContributionCursorModel(
+                repo_name=repo_name, stats_etag=stats_etag, pulls_since=pulls_since, refreshed_at=refreshed_at
+            )
+        )
+    await session.commit()
+
+
+async def save_contribution_weeks(session: AsyncSession, repo_name: str, weeks: Sequence[ContributionWeek]) -> int:
+    """Save a repo's contributor stats, returning how many weeks were new or changed.
+
+    Github always sends every week, and past weeks do change (e.g. merging a long lived branch adds its commits to
+    the weeks they were authored in), so every week is compared against the repo's saved weeks, loaded in one query.
+    """
+    if not weeks:
+        return 0
+
+    stmt = select(ContributionWeekModel).where(ContributionWeekModel.repo_name == repo_name)
+    result = await session.execute(stmt)
+    existing = {(model.gh_id, as_utc(model.week_start)): model for model in result.scalars().all()}
+
+    changed = 0
+    for week in weeks:
+        model = existing.get((week["gh_id"], week["week_start"]))
+        if model is None:
+            session.add(ContributionWeekModel(**week))
+            changed += 1
+        elif (model.commits, model.additions, model.deletions) != (
+            week["commits"],
+            week["additions"],
+            week["deletions"],
+        ):
+            model.commits = week["commits"]
+            model.additions = week["additions"]
+            model.deletions = week["deletions"]
+            changed += 1
+    await session.commit()
+    return changed
+
+
+async def save_pull_requests(session: AsyncSession, repo_name: str, pulls: Sequence[PullRequest]) -> int:
+    """Create or update a repo's pull requests, returning how many were new or changed."""
+    if not pulls:
+        return 0
+
+    stmt = select(PullRequestModel).where(
+        PullRequestModel.repo_name == repo_name, PullRequestModel.number.in_([pull["number"] for pull in pulls])
+    )
+    result = await session.execute(stmt)
+    existing = {model.number: model for model in result.scalars().all()}
+
+    changed = 0
+    for pull in pulls:
+        model = existing.get(pull["number"])
+        if model is None:
+            model = PullRequestModel(**pull)
+            existing[pull["number"]] = model
+            session.add(model)
+            changed += 1
+        elif (as_utc(model.merged_at) if model.merged_at else None) != pull["merged_at"]:
+            model.merged_at = pull["merged_at"]
+            changed += 1
+    await session.commit()
+    return changed
+
+
+async def get_contributor_totals(
+    session: AsyncSession, repo_name: str, start: dt.datetime | None, end: dt.datetime | None
+) -> list[ContributorTotals]:
+    """Sum each contributor's commits, lines changed and pull requests in the window, with their discord user.
+
+    The sums are done by the database, in one grouped query for the weekly stats and one for pull requests.
+    Github's weeks start on sunday, so weeks are counted if their middle is in the window (a sprint starting on
+    monday gets the week starting the day before). Pull requests are counted if they were opened in the window.
+    """
+    weeks_stmt = (
+        select(
+            ContributionWeekModel.gh_id,
+            DiscordUserModel.discord_user_id,
+            func.sum(ContributionWeekModel.commits),
+            func.sum(ContributionWeekModel.additions),
+            func.sum(ContributionWeekModel.deletions),
+        )
+        .outerjoin(DiscordUserModel, DiscordUserModel.gh_id == ContributionWeekModel.gh_id)
+        .where(ContributionWeekModel.repo_name == repo_name)
+        .group_by(ContributionWeekModel.gh_id, DiscordUserModel.discord_user_id)
+    )
+    pulls_stmt = (
+        select(
+            PullRequestModel.gh_id,
+            DiscordUserModel.discord_user_id,
+            func.count(),
+            func.count(PullRequestModel.merged_at),
+        )
+        .outerjoin(DiscordUserModel, DiscordUserModel.gh_id == PullRequestModel.gh_id)
+        .where(PullRequestModel.repo_name == repo_name, PullRequestModel.gh_id.is_not(None))
+        .group_by(PullRequestModel.gh_id, DiscordUserModel.discord_user_id)
+    )
+    if start is not None:
+        weeks_stmt = weeks_stmt.where(ContributionWeekModel.week_start >= start - _HALF_WEEK)
+        pulls_stmt = pulls_stmt.where(PullRequestModel.created_at >= start)
+    if end is not None:
+        weeks_stmt = weeks_stmt.where(ContributionWeekModel.week_start < end - _HALF_WEEK)
+        pulls_stmt = pulls_stmt.where(PullRequestModel.created_at < end)
+
+    totals: dict[str, ContributorTotals] = {}
+
+    def get_totals(gh_id: str, discord_user_id: str | None) -> ContributorTotals:
+        return totals.setdefault(
+            gh_id,
+            {
+                "gh_id": gh_id,
+                "discord_user_id": discord_user_id,
+                "commits": 0,
+                "additions": 0,
+                "deletions": 0,
+                "pull_requests": 0,
+                "merged": 0,
+            },
+        )
+
+    for gh_id, discord_user_id, commits, additions, deletions in await session.execute(weeks_stmt):
+        contributor = get_totals(gh_id, discord_user_id)
+        contributor["commits"] = commits
+        contributor["additions"] = additions
+        contributor["deletions"] = deletions
+    for author_id, discord_user_id, pull_requests, merged in await session.execute(pulls_stmt):
+        contributor = get_totals(author_id, discord_user_id)  # type: ignore[arg-type]  # authorless pulls are excluded
+        contributor["pull_requests"] = pull_requests
+        contributor["merged"] = merged
+    return list(totals.values())
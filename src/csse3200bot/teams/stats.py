@@ -0,0 +1,194 @@
+"""Team contribution stats, fetching contributions from github."""
+
+import datetime as dt
+import json
+import logging
+from collections.abc import Iterable, Mapping
+from typing import Any, TypedDict
+
+from github.GithubException import GithubException
+from github.Requester import Requester
+
+from csse3200bot.utils import as_utc
+
+log = logging.getLogger(__name__)
+
+PER_PAGE = 100
+MAX_PAGES = 50
+
+_STATS_COMPUTING = 202
+_NO_CONTENT = 204
+_NOT_MODIFIED = 304
+_FIRST_ERROR_STATUS = 400
+
+
+class ContributionWeek(TypedDict):
+    """A user's contributions in a week, named like the `ContributionWeekModel` columns."""
+
+    repo_name: str
+    gh_id: str
+    week_start: dt.datetime
+    commits: int
+    additions: int
+    deletions: int
+
+
+class PullRequest(TypedDict):
+    """A pull request, named like the `PullRequestModel` columns."""
+
+    repo_name: str
+    number: int
+    gh_id: str | None
+    created_at: dt.datetime
+    merged_at: dt.datetime | None
+
+
+class ContributorStatsResult(TypedDict):
+    """Contributor stats, if github had them ready and they changed."""
+
+    modified: bool  # False when github responded 304 Not Modified, or is still computing them
+    etag: str | None
+    weeks: list[ContributionWeek]
+
+
+class ContributorTotals(TypedDict):
+    """A contributor's totals over a window, with the discord user they're linked to."""
+
+    gh_id: str
+    discord_user_id: str | None
+    commits: int
+    additions: int
+    deletions: int
+    pull_requests: int
+    merged: int
+
+
+class TeamStats(TypedDict):
+    """A team's totals over a window."""
+
+    team: str
+    contributors: int
+    commits: int
+    additions: int
+    deletions: int
+    pull_requests: int
+    merged: int
+
+
+def _check_status(status: int, headers: dict[str, Any], body: str) -> None:
+    if status >= _FIRST_ERROR_STATUS:
+        raise GithubException(status, body, headers)
+
+
+def fetch_contributor_weeks(requester: Requester, repo_full_name: str, etag: str | None) -> ContributorStatsResult:
+    """Fetch the weekly commits and lines changed by each contributor, blocking.
+
+    Github computes these in the background, so the first request for a repo (or after a push) may respond 202
+    with nothing, to be tried again later. Github reports no lines changed for repos with 10k+ commits.
+    """
+    repo_name = repo_full_name.split("/", 1)[1]
+    headers = {"If-None-Match": etag} if etag is not None else None
+    status, response_headers, body = requester.requestJson(
+        "GET", f"/repos/{repo_full_name}/stats/contributors", None, headers
+    )
+    if status == _NOT_MODIFIED:
+        return {"modified": False, "etag": etag, "weeks": []}
+    if status == _STATS_COMPUTING:
+        log.info(f"Github is still computing the contributor stats of '{repo_name}'")
+        return {"modified": False, "etag": etag, "weeks": []}
+    _check_status(status, response_headers, body)
+
+    weeks: list[ContributionWeek] = []
+    for contributor in json.loads(body) if status != _NO_CONTENT and body else []:
+        if contributor.get("author") is None:
+            continue
+        gh_id = str(contributor["author"]["id"])
+        weeks.extend(
+            {
+                "repo_name": repo_name,
+                "gh_id": gh_id,
+                "week_start": dt.datetime.fromtimestamp(week["w"], dt.UTC),
+                "commits": week["c"],
+                "additions": week["a"],
+                "deletions": week["d"],
+            }
+            for week in contributor["weeks"]
+            if week["c"] or week["a"] or week["d"]
+        )
+    return {"modified": True, "etag": response_headers.get("etag"), "weeks": weeks}
+
+
+def _parse_pull_request(repo_name: str, data: dict[str, Any]) -> PullRequest:
+    user = data.get("user")
+    return {
+        "repo_name": repo_name,
+        "number": data["number"],
+        "gh_id": str(user["id"]) if user else None,
+        "created_at": as_utc(dt.datetime.fromisoformat(data["created_at"])),
+        "merged_at": as_utc(dt.datetime.fromisoformat(data["merged_at"])) if data.get("merged_at") else None,
+    }
+
+
+def fetch_pull_requests(
+    requester: Requester, repo_full_name: str, since: dt.datetime | None
+) -> tuple[list[PullRequest], dt.datetime | None]:
+    """Fetch the pull requests updated since the cursor, blocking, returning them and the new cursor.
+
+    Pull requests are fetched most recently updated first, stopping at the first one already fetched.
+    """
+    repo_name = repo_full_name.split("/", 1)[1]
+    parameters: dict[str, Any] = {"state": "all", "sort": "updated", "direction": "desc", "per_page": PER_PAGE}
+    pulls: list[PullRequest] = []
+    newest = since
+    for page in range(1, MAX_PAGES + 1):
+        status, headers, body = requester.requestJson(
+            "GET", f"/repos/{repo_full_name}/pulls", parameters | {"page": page}
+        )
+        _check_status(status, headers, body)
+        data = json.loads(body)
+        for item in data:
+            updated_at = as_utc(dt.datetime.fromisoformat(item["updated_at"]))
+            if since is not None and updated_at < since:
+                return pulls, newest
+            newest = max(newest, updated_at) if newest is not None else updated_at
+            pulls.append(_parse_pull_request(repo_name, item))
+        if len(data) < PER_PAGE:
+            break
+    else:
+        log.warning(f"Stopped fetching pull requests of '{repo_name}' after {MAX_PAGES} pages")
+    return pulls, newest
+
+
+UNLINKED_TEAM = "Unlinked"
+NO_TEAM = "No team"
+
+
+def aggregate_team_stats(totals: Iterable[ContributorTotals], teams: Mapping[str, str]) -> list[TeamStats]:
+    """Sum contributor totals by team, most commits first.
+
+    `teams` maps discord user ids to team names. Contributors without a linked discord user are counted under
+    `UNLINKED_TEAM`, and linked users who aren't in a team under `NO_TEAM`.
+    """
+    stats: dict[str, TeamStats] = {}
+    for contributor in totals:
+        discord_user_id = contributor["discord_user_id"]
+        team = UNLINKED_TEAM if discord_user_id is None else teams.get(discord_user_id, NO_TEAM)
+        team_stats = stats.setdefault(
+            team,
+            {
+                "team": team,
+                "contributors": 0,
+                "commits": 0,
+                "additions": 0,
+                "deletions": 0,
+                "pull_requests": 0,
+                "merged": 0,
+            },
+        )
+        team_stats["contributors"] += 1
+        team_stats["commits"] += contributor["commits"]
+        team_stats["additions"] += contributor["additions"]
+        team_stats["deletions"] += contributor["deletions"]
+        team_stats["pull_requests"] += contributor["pull_requests"]
+        team_stats["merged"] += contributor["merged"]
+    return sorted(stats.values(), key=lambda team_stats: (-team_stats["commits"], team_stats["team"]))
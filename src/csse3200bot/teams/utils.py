@@ -1,7 +1,11 @@
 """Utils for teams and roles."""
 
+from collections.abc import Iterable
+
 from discord import Guild, Member, Role
 
+from csse3200bot.constants import STUDENT_ROLE, TUTOR_ROLES
+
 TEAM_PREFIX = "Team "
 
 
@@ -10,16 +14,89 @@ def _is_team_role(role: Role) -> bool:
     return role.name.startswith(TEAM_PREFIX)
 
 
-def get_team_roles(guild: Guild) -> list[Role]:
-    """Get all team roles in a guild."""
-    return [role for role in guild.roles if _is_team_role(role)]
+def _has_any_role(member: Member, role_ids: Iterable[int]) -> bool:
+    """Check whether a member has any of the roles.
+
+    `Member.get_role` is a binary search of the member's role ids, where `Member.roles` resolves and sorts every
+    role on each access.
+    """
+    return any(member.get_role(role_id) is not None for role_id in role_ids)
+
+
+class GuildRoleIndex:
+    """Index of the team, tutor and student roles in a guild, keyed by role id and team name.
+
+    Built once per guild and thrown away whenever the guild's roles change, so membership checks become
+    lookups by role id instead of name comparisons over every role.
+    """
+
+    _guild: Guild
+    _team_roles: dict[int, Role]  # role_id -> team role
+    _team_roles_by_name: dict[str, Role]  # role name -> team role
+    _team_numbers: dict[int, int]  # role_id -> team number
+    _tutor_role_ids: frozenset[int]
+    _student_role: Role | None
+
+    def __init__(self, guild: Guild) -> None:
+        """Build the index from the guild's current roles."""
+        self._guild = guild
+        self._team_roles = {}
+        self._team_roles_by_name = {}
+        self._team_numbers = {}
+        tutor_role_ids: set[int] = set()
+        self._student_role = None
+
+        for role in guild.roles:
+            if _is_team_role(role):
+                self._team_roles[role.id] = role
+                # the lowest role wins if names are duplicated, as `guild.roles` is sorted by position
+                self._team_roles_by_name.setdefault(role.name, role)
+                suffix = role.name.removeprefix(TEAM_PREFIX)
+                if suffix.isdigit():
+                    self._team_numbers[role.id] = int(suffix)
+            elif role.name in TUTOR_ROLES:
+                tutor_role_ids.add(role.id)
+            elif role.name == STUDENT_ROLE:
+                self._student_role = role
+
+        self._tutor_role_ids = frozenset(tutor_role_ids)
+
+    @property
+    def guild(self) -> Guild:
+        """Guild the index was built from."""
+        return self._guild
+
+    @property
+    def team_roles(self) -> list[Role]:
+        """All team roles in the guild."""
+        return list(self._team_roles.values())
+
+    @property
+    def student_role(self) -> Role | None:
+        """The student role, if the guild has one."""
+        return self._student_role
+
+    def get_team_role(self, name: str) -> Role | None:
+        """Get a team role by name."""
+        return self._team_roles_by_name.get(name)
+
+    def get_member_team(self, member: Member) -> Role | None:
+        """Return the team role the member has."""
+        return next((role for role_id, role in self._team_roles.items() if member.get_role(role_id) is not None), None)
 
+    def get_member_team_number(self, member: Member) -> int | None:
+        """Return the number of the team the member is in."""
+        role = self.get_member_team(member)
+        return None if role is None else self._team_numbers.get(role.id)
 
-def get_member_team(member: Member) -> Role | None:
-    """Return the team role the member has."""
-    return next((role for role in member.roles if _is_team_role(role)), None)
+    def is_in_team(self, member: Member) -> bool:
+        """Check whether a member is in any team."""
+        return _has_any_role(member, self._team_roles)
 
+    def is_tutor(self, member: Member) -> bool:
+        """Check whether a member has any of the tutor roles."""
+        return _has_any_role(member, self._tutor_role_ids)
 
-def is_in_team(member: Member) -> bool:
-    """Check whether a member is in any team."""
-    return get_member_team(member) is not None
+    def is_student(self, member: Member) -> bool:
+        """Check whether a member has the student role."""
+        return self._student_role is not None and member.get_role(self._student_role.id) is not None
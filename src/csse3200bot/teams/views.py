@@ -0,0 +1,53 @@
+"""Views for teams."""
+
+import discord
+
+from csse3200bot.interactions import BotView
+
+
+class PaginatorView(BotView):
+    """View to page through a list of embeds."""
+
+    _pages: list[discord.Embed]
+    _current: int
+
+    def __init__(self, pages: list[discord.Embed]) -> None:
+        """Creates a paginator over already rendered pages.
+
+        Args:
+            pages (list[discord.Embed]): pages to display, must not be empty
+        """
+        super().__init__(timeout=300)
+        self._pages = pages
+        self._current = 0
+        self._refresh_buttons()
+
+    @property
+    def first_page(self) -> discord.Embed:
+        """The page to send with the view."""
+        return self._pages[0]
+
+    def _refresh_buttons(self) -> None:
+        self.previous_page.disabled = self._current == 0
+        self.next_page.disabled = self._current >= len(self._pages) - 1
+        self.page_counter.label = f"{self._current + 1}/{len(self._pages)}"
+
+    async def _show(self, interaction: discord.Interaction, page: int) -> None:
+        self._current = page
+        self._refresh_buttons()
+        await interaction.response.edit_message(embed=self._pages[page], view=self)
+
+    @discord.ui.button(emoji="◀️", style=discord.ButtonStyle.secondary)
+    async def previous_page(self, interaction: discord.Interaction, _: discord.ui.Button) -> None:
+        """Go back a page."""
+        await self._show(interaction, max(self._current - 1, 0))
+
+    @discord.ui.button(label="1/1", style=discord.ButtonStyle.secondary, disabled=True)
+    async def page_counter(self, interaction: discord.Interaction, _: discord.ui.Button) -> None:
+        """Page counter, only here for display."""
+        await interaction.response.defer()
+
+    @discord.ui.button(emoji="▶️", style=discord.ButtonStyle.secondary)
+    async def next_page(self, interaction: discord.Interaction, _: discord.ui.Button) -> None:
+        """Go forward a page."""
+        await self._show(interaction, min(self._current + 1, len(self._pages) - 1))
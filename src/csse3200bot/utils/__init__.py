@@ -4,5 +4,24 @@ These are generic utilities that do not contain any 'discord bot' context.
 """
 
 from .collections import AsyncCache, SyncCache
+from .dates import as_utc
+from .diagnostics import LoopStallDetector, ProfileInProgressError, SamplingProfiler, profile
+from .ratelimit import Budget, MemoryRateLimiter, RateLimiter
+from .scheduler import JobStats, Scheduler
+from .shutdown import ShutdownCoordinator
 
-__all__ = ["AsyncCache", "SyncCache"]
+__all__ = [
+    "AsyncCache",
+    "Budget",
+    "JobStats",
+    "LoopStallDetector",
+    "MemoryRateLimiter",
+    "ProfileInProgressError",
+    "RateLimiter",
+    "SamplingProfiler",
+    "Scheduler",
+    "ShutdownCoordinator",
+    "SyncCache",
+    "as_utc",
+    "profile",
+]
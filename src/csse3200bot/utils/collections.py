@@ -38,6 +38,24 @@ class _BaseCache[T, S](ABC):
         found = self._cache.pop(key, None)
         return found is not None
 
+    def purge_expired(self) -> int:
+        """Remove all expired items from the cache, returning how many were removed."""
+        expired = [key for key, (timestamp, _) in self._cache.items() if not self._is_valid(timestamp)]
+        for key in expired:
+            self._cache.pop(key, None)
+        return len(expired)
+
+    def _store_refreshed(self, key: T, entry: tuple[float, S | None] | None, result: S | None) -> None:
+        """Cache a refetched item, unless the key was removed or set since `entry` was read, as it's then stale."""
+        if self._cache.get(key) is entry:
+            self._cache[key] = (time(), result)
+        else:
+            log.debug(f"Dropping refreshed result for key: {key}, it changed while fetching")
+
+    def cached_keys(self) -> list[T]:
+        """Keys of all items in the cache, including expired ones."""
+        return list(self._cache.keys())
+
     def __contains__(self, key: T) -> bool:
         cached = self._cache.get(key)
         return cached is not None and self._is_valid(cached[0])
@@ -74,6 +92,16 @@ class SyncCache[T, S](_BaseCache[T, S]):
         log.debug(f"[SyncCache] Cached result for key: {key}")
         return result
 
+    def refresh(self, key: T) -> S | None:
+        """Fetch an item and cache it, whether or not it is already cached.
+
+        The result isn't cached if the key is removed or set while fetching.
+        """
+        entry = self._cache.get(key)
+        result = self._fetch_callback(key)
+        self._store_refreshed(key, entry, result)
+        return result
+
 
 class AsyncCache[T, S](_BaseCache[T, S]):
     """Asynchronous cache."""
@@ -105,3 +133,13 @@ class AsyncCache[T, S](_BaseCache[T, S]):
         self._cache[key] = (time(), result)
         log.debug(f"Cached result for key: {key}")
         return result
+
+    async def refresh(self, key: T) -> S | None:
+        """Fetch an item and cache it, whether or not it is already cached.
+
+        The result isn't cached if the key is removed or set while fetching.
+        """
+        entry = self._cache.get(key)
+        result = await self._fetch_callback(key)
+        self._store_refreshed(key, entry, result)
+        return result
@@ -0,0 +1,8 @@
+"""Date and time helpers."""
+
+import datetime as dt
+
+
+def as_utc(value: dt.datetime) -> dt.datetime:
+    """Some databases (sqlite) drop the timezone, the timestamps stored are always UTC."""
+    return value if value.tzinfo is not None else value.replace(tzinfo=dt.UTC)
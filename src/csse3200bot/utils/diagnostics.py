@@ -0,0 +1,171 @@
+"""Event loop stall detection and sampling profiling, for diagnosing latency in a running process."""
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+from pathlib import Path
+from time import perf_counter
+from types import FrameType
+
+DEFAULT_SAMPLE_INTERVAL = 0.005
+DEFAULT_PROFILE_DIR = Path("profiles")
+
+log = logging.getLogger(__name__)
+
+
+class ProfileInProgressError(Exception):
+    """Raised when starting a profile while another one is running."""
+
+
+class LoopStallDetector:
+    """Logs the stack of whatever blocks the event loop for longer than the threshold.
+
+    A heartbeat task on the loop records when it last ran, and a watchdog thread grabs the loop thread's stack
+    when the heartbeat is late, so the stack is of the blocking code, not of whatever ran after it.
+    """
+
+    threshold: float  # seconds
+    stalls: int
+    longest_stall: float  # seconds
+    _interval: float
+    _loop_thread_id: int | None
+    _last_beat: float
+    _reported_beat: float | None
+    _heartbeat_task: asyncio.Task[None] | None
+    _watchdog: threading.Thread | None
+    _stopped: threading.Event
+
+    def __init__(self, threshold_ms: int) -> None:
+        """Creates a stopped detector, see `start`."""
+        self.threshold = threshold_ms / 1000
+        self.stalls = 0
+        self.longest_stall = 0.0
+        self._interval = self.threshold / 2
+        self._loop_thread_id = None
+        self._last_beat = perf_counter()
+        self._reported_beat = None
+        self._heartbeat_task = None
+        self._watchdog = None
+        self._stopped = threading.Event()
+
+    def start(self) -> None:
+        """Start watching the running loop."""
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = perf_counter()
+        self._stopped.clear()
+        self._heartbeat_task = asyncio.create_task(self._heartbeat(), name="loop-stall-heartbeat")
+        self._watchdog = threading.Thread(target=self._watch, name="loop-stall-watchdog", daemon=True)
+        self._watchdog.start()
+        log.info(f"Watching for event loop stalls over {self.threshold * 1000:.0f}ms")
+
+    async def stop(self) -> None:
+        """Stop watching."""
+        self._stopped.set()
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+            await asyncio.gather(self._heartbeat_task, return_exceptions=True)
+        if self._watchdog is not None:
+            await asyncio.to_thread(self._watchdog.join)
+
+    def _lag(self, now: float) -> float:
+        """How late the heartbeat is."""
+        return now - self._last_beat - self._interval
+
+    async def _heartbeat(self) -> None:
+        while True:
+            now = perf_counter()
+            lag = self._lag(now)
+            if lag > self.threshold:
+                self.stalls += 1
+                self.longest_stall = max(self.longest_stall, lag)
+                log.warning(f"Event loop was blocked for {lag * 1000:.0f}ms")
+            self._last_beat = now
+            await asyncio.sleep(self._interval)
+
+    def _watch(self) -> None:
+        while not self._stopped.wait(self._interval):
+            last_beat = self._last_beat
+            lag = self._lag(perf_counter())
+            # one stack per stall
+            if lag <= self.threshold or last_beat == self._reported_beat:
+                continue
+            self._reported_beat = last_beat
+
+            frame = sys._current_frames().get(self._loop_thread_id)  # type: ignore[arg-type] # noqa: SLF001
+            stack = "".join(traceback.format_stack(frame)) if frame is not None else "  <unknown>\n"
+            log.warning(f"Event loop blocked for over {lag * 1000:.0f}ms, currently at:\n{stack}")
+
+
+def _fold(frame: FrameType, thread_name: str) -> str:
+    """Stack of the frame in the folded format, root first, e.g. `thread;module:func;module:func`."""
+    frames = []
+    current: FrameType | None = frame
+    while current is not None:
+        code = current.f_code
+        frames.append(f"{current.f_globals.get('__name__', code.co_filename)}:{code.co_qualname}")
+        current = current.f_back
+    frames.append(thread_name)
+    return ";".join(reversed(frames))
+
+
+class SamplingProfiler:
+    """Periodically samples the stack of every thread, aggregating them as folded stacks.
+
+    The output is the format read by flamegraph.pl, speedscope and most other flamegraph tools. Sampling happens
+    in its own thread, so it sees blocking code in the event loop as well as idle time.
+    """
+
+    interval: float
+    samples: int
+    stacks: Counter[str]  # folded stack -> samples
+
+    def __init__(self, interval: float = DEFAULT_SAMPLE_INTERVAL) -> None:
+        """Creates a profiler with no samples."""
+        self.interval = interval
+        self.samples = 0
+        self.stacks = Counter()
+
+    def run(self, duration: float) -> None:
+        """Sample for `duration` seconds, blocking."""
+        me = threading.get_ident()
+        end = perf_counter() + duration
+        while perf_counter() < end:
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():  # noqa: SLF001
+                if thread_id != me:
+                    self.stacks[_fold(frame, names.get(thread_id, str(thread_id)))] += 1
+            self.samples += 1
+            time.sleep(self.interval)
+
+    def write(self, path: Path) -> None:
+        """Write the folded stacks, one `stack count` per line."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("w") as file:
+            file.writelines(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+_profile_lock = asyncio.Lock()
+
+
+async def profile(duration: float, directory: Path = DEFAULT_PROFILE_DIR) -> Path:
+    """Profile the process for `duration` seconds without blocking the loop, returning the folded stacks file.
+
+    Raises:
+        ProfileInProgressError: if a profile is already running.
+    """
+    if _profile_lock.locked():
+        msg = "A profile is already running"
+        raise ProfileInProgressError(msg)
+
+    async with _profile_lock:
+        log.info(f"Profiling for {duration}s")
+        profiler = SamplingProfiler()
+        await asyncio.to_thread(profiler.run, duration)
+        path = directory / f"profile-{time.strftime('%Y%m%d-%H%M%S')}.folded"
+        profiler.write(path)
+        log.info(f"Wrote {profiler.samples} samples to {path}")
+        return path
@@ -0,0 +1,84 @@
+"""Rate limiting, with token buckets."""
+
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from time import time
+from typing import NamedTuple
+
+# Arrivals are sums of intervals that usually aren't exact in binary, on top of unix times whose precision is only
+# ~1e-7, so the full bucket check allows this much rounding error rather than losing a use from the burst.
+TOLERANCE = 1e-3
+
+
+class Budget(NamedTuple):
+    """`rate` uses every `per` seconds, all of which can be used at once."""
+
+    rate: int
+    per: float
+
+    @property
+    def interval(self) -> float:
+        """Seconds for one use to be refilled."""
+        return self.per / self.rate
+
+
+def next_arrival(arrival: float | None, now: float, budget: Budget) -> float | None:
+    """Use one of a bucket's tokens, returning the bucket's new state or None if it's empty.
+
+    A bucket is stored as the (theoretical) time it will be full again, rather than a token count and when it was
+    last refilled. That's the generic cell rate algorithm, which behaves the same as a token bucket while only
+    needing one number per bucket, and a bucket past its time is full so can be forgotten.
+    """
+    arrival = max(arrival or now, now) + budget.interval
+    return arrival if arrival - now <= budget.per + TOLERANCE else None
+
+
+def retry_after(arrival: float, now: float, budget: Budget) -> float:
+    """Seconds until an empty bucket has a token again."""
+    return max(arrival + budget.interval - budget.per - now, 0.0)
+
+
+class RateLimiter(ABC):
+    """Rate limits uses of keys, each with their own bucket."""
+
+    @abstractmethod
+    async def acquire(self, key: str, budget: Budget) -> float:
+        """Use a token of the key's bucket, returning 0 if there was one, otherwise the seconds until there is."""
+
+    @abstractmethod
+    async def purge_expired(self) -> int:
+        """Forget buckets that are full, returning how many were forgotten."""
+
+
+class MemoryRateLimiter(RateLimiter):
+    """Rate limiter keeping its buckets in memory, only limiting uses in this process."""
+
+    _clock: Callable[[], float]
+    _buckets: dict[str, float]  # key -> time the bucket is full
+
+    def __init__(self, clock: Callable[[], float] = time) -> None:
+        """Creates a rate limiter with no buckets, telling the time with `clock`."""
+        self._clock = clock
+        self._buckets = {}
+
+    async def acquire(self, key: str, budget: Budget) -> float:
+        """See `RateLimiter.acquire`."""
+        now = self._clock()
+        arrival = self._buckets.get(key)
+        new_arrival = next_arrival(arrival, now, budget)
+        if new_arrival is None:
+            return retry_after(arrival or now, now, budget)
+        self._buckets[key] = new_arrival
+        return 0.0
+
+    async def purge_expired(self) -> int:
+        """See `RateLimiter.purge_expired`."""
+        now = self._clock()
+        full = [key for key, arrival in self._buckets.items() if arrival <= now]
+        for key in full:
+            del self._buckets[key]
+        return len(full)
+
+    def __len__(self) -> int:
+        """Number of buckets kept."""
+        return len(self._buckets)
@@ -0,0 +1,174 @@
+"""Scheduler for periodic background jobs."""
+
+import asyncio
+import logging
+import random
+from collections.abc import Awaitable, Callable
+from time import perf_counter, time
+
+DEFAULT_JITTER = 0.1
+DEFAULT_GRACE_PERIOD = 10.0
+
+log = logging.getLogger(__name__)
+
+
+class JobStats:
+    """Metrics for a scheduled job."""
+
+    runs: int
+    failures: int
+    skipped: int  # ticks skipped because the previous run was still going
+    last_run_at: float | None
+    last_duration: float | None
+    total_duration: float
+    last_error: str | None
+
+    def __init__(self) -> None:
+        """Empty stats."""
+        self.runs = 0
+        self.failures = 0
+        self.skipped = 0
+        self.last_run_at = None
+        self.last_duration = None
+        self.total_duration = 0.0
+        self.last_error = None
+
+    @property
+    def average_duration(self) -> float | None:
+        """Average duration of a run."""
+        return self.total_duration / self.runs if self.runs else None
+
+
+class _Job:
+    """A job and its state."""
+
+    name: str
+    callback: Callable[[], Awaitable[None]]
+    interval: float
+    jitter: float
+    run_at_start: bool
+    stats: JobStats
+    loop_task: asyncio.Task[None] | None
+    run_task: asyncio.Task[None] | None
+
+    def __init__(
+        self, name: str, callback: Callable[[], Awaitable[None]], interval: float, jitter: float, *, run_at_start: bool
+    ) -> None:
+        self.name = name
+        self.callback = callback
+        self.interval = interval
+        self.jitter = jitter
+        self.run_at_start = run_at_start
+        self.stats = JobStats()
+        self.loop_task = None
+        self.run_task = None
+
+    def next_delay(self) -> float:
+        """Interval with jitter applied, so jobs added together don't all fire together."""
+        spread = self.interval * self.jitter
+        return max(0.0, self.interval + random.uniform(-spread, spread))  # noqa: S311
+
+
+class Scheduler:
+    """Runs async jobs periodically in the background.
+
+    Runs of the same job never overlap, if a run is still going when the next is due the tick is skipped.
+    Jobs can be added before or after the scheduler is started.
+    """
+
+    _jobs: dict[str, _Job]
+    _running: bool
+
+    def __init__(self) -> None:
+        """Creates a scheduler with no jobs."""
+        self._jobs = {}
+        self._running = False
+
+    def add_job(
+        self,
+        name: str,
+        callback: Callable[[], Awaitable[None]],
+        interval: float,
+        *,
+        jitter: float = DEFAULT_JITTER,
+        run_at_start: bool = False,
+    ) -> None:
+        """Add a job, replacing any existing job with the same name.
+
+        Args:
+            name (str): unique job name
+            callback (Callable[[], Awaitable[None]]): async callable to run
+            interval (float): seconds between runs
+            jitter (float, optional): fraction of the interval to randomly vary it by. Defaults to DEFAULT_JITTER.
+            run_at_start (bool, optional): run once straight away. Defaults to False.
+        """
+        self.remove_job(name)
+        job = _Job(name, callback, interval, jitter, run_at_start=run_at_start)
+        self._jobs[name] = job
+        if self._running:
+            job.loop_task = asyncio.create_task(self._job_loop(job), name=f"job-{name}")
+
+    def remove_job(self, name: str) -> None:
+        """Stop and remove a job, a run already in progress is left to finish."""
+        job = self._jobs.pop(name, None)
+        if job is not None and job.loop_task is not None:
+            job.loop_task.cancel()
+
+    def start(self) -> None:
+        """Start running jobs."""
+        if self._running:
+            return
+        self._running = True
+        for job in self._jobs.values():
+            job.loop_task = asyncio.create_task(self._job_loop(job), name=f"job-{job.name}")
+        log.info(f"Scheduler started with {len(self._jobs)} job(s)")
+
+    async def shutdown(self, grace_period: float = DEFAULT_GRACE_PERIOD) -> None:
+        """Stop scheduling runs and wait (up to the grace period) for in progress runs to finish."""
+        self._running = False
+        for job in self._jobs.values():
+            if job.loop_task is not None:
+                job.loop_task.cancel()
+
+        in_progress = [
+            job.run_task for job in self._jobs.values() if job.run_task is not None and not job.run_task.done()
+        ]
+        if not in_progress:
+            return
+
+        log.info(f"Waiting for {len(in_progress)} job(s) to finish")
+        _, pending = await asyncio.wait(in_progress, timeout=grace_period)
+        for task in pending:
+            log.warning(f"Cancelling job '{task.get_name()}' that didn't finish in time")
+            task.cancel()
+
+    def stats(self) -> dict[str, JobStats]:
+        """Stats of every job."""
+        return {name: job.stats for name, job in self._jobs.items()}
+
+    async def _job_loop(self, job: _Job) -> None:
+        if not job.run_at_start:
+            await asyncio.sleep(job.next_delay())
+
+        while True:
+            if job.run_task is not None and not job.run_task.done():
+                log.warning(f"Job '{job.name}' is still running, skipping this run")
+                job.stats.skipped += 1
+            else:
+                job.run_task = asyncio.create_task(self._run(job), name=job.name)
+            await asyncio.sleep(job.next_delay())
+
+    async def _run(self, job: _Job) -> None:
+        stats = job.stats
+        stats.last_run_at = time()
+        start = perf_counter()
+        try:
+            await job.callback()
+        except Exception as e:
+            log.exception(f"Job '{job.name}' failed")
+            stats.failures += 1
+            stats.last_error = repr(e)
+        finally:
+            stats.runs += 1
+            stats.last_duration = perf_counter() - start
+            stats.total_duration += stats.last_duration
@@ -0,0 +1,89 @@
+"""Graceful shutdown, draining in progress work before anything is closed."""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+
+# Seconds to drain for, within kubernetes' default 30 second termination grace period
+DEFAULT_SHUTDOWN_TIMEOUT = 25.0
+
+log = logging.getLogger(__name__)
+
+
+class ShutdownCoordinator:
+    """Tracks in progress work so a shutdown can stop new work, wait for what's running, then flush.
+
+    Flush hooks are run in the order they were added, once the work is drained, a failing hook doesn't stop the rest.
+    """
+
+    _accepting: bool
+    _in_flight: set[asyncio.Task]
+    _hooks: dict[str, Callable[[], Awaitable[None]]]
+
+    def __init__(self) -> None:
+        """Creates a coordinator accepting work, with no hooks."""
+        self._accepting = True
+        self._in_flight = set()
+        self._hooks = {}
+
+    @property
+    def accepting(self) -> bool:
+        """Whether new work should be started, False once shutting down."""
+        return self._accepting
+
+    @property
+    def in_flight(self) -> int:
+        """Number of tasks running tracked work."""
+        return len(self._in_flight)
+
+    def add_hook(self, name: str, callback: Callable[[], Awaitable[None]]) -> None:
+        """Add a hook run once the work is drained, e.g. to flush buffered writes, replacing any with the same name."""
+        self._hooks[name] = callback
+
+    def remove_hook(self, name: str) -> None:
+        """Remove a hook, if it was added."""
+        self._hooks.pop(name, None)
+
+    @contextmanager
+    def track(self) -> Iterator[None]:
+        """Track the current task until the block exits, shutdowns wait for it."""
+        task = asyncio.current_task()
+        if task is None:
+            yield
+            return
+        self._in_flight.add(task)
+        try:
+            yield
+        finally:
+            self._in_flight.discard(task)
+
+    def track_current_task(self) -> None:
+        """Track the current task until it finishes, for work admitted by a check rather than wrapped in `track`."""
+        task = asyncio.current_task()
+        if task is None:
+            return
+        self._in_flight.add(task)
+        task.add_done_callback(self._in_flight.discard)
+
+    async def shutdown(self, grace_period: float) -> bool:
+        """Stop accepting work, wait (up to the grace period) for tracked work to finish, then run the hooks.
+
+        Work still running after the grace period is cancelled. Returns whether everything finished in time.
+        """
+        self._accepting = False
+        drained = True
+        if self._in_flight:
+            log.info(f"Waiting for {len(self._in_flight)} task(s) to finish")
+            _, pending = await asyncio.wait(set(self._in_flight), timeout=grace_period)
+            for task in pending:
+                log.warning(f"Cancelling task '{task.get_name()}' that didn't finish in time")
+                task.cancel()
+            drained = not pending
+
+        for name, callback in self._hooks.items():
+            try:
+                await callback()
+            except Exception:
+                log.exception(f"Shutdown hook '{name}' failed")
+        return drained
@@ -0,0 +1,38 @@
+"""Benchmark fixtures."""
+
+from collections.abc import Awaitable, Callable, Coroutine
+from typing import Any
+
+import pytest
+
+from tests.conftest import BENCHMARK_RESULTS
+from tests.timing import Timings, measure
+
+type Bench = Callable[..., Coroutine[Any, Any, Timings]]
+
+
+@pytest.fixture
+def iterations(request: pytest.FixtureRequest) -> int:
+    """Calls per benchmark."""
+    return request.config.getoption("--benchmark-iterations")
+
+
+@pytest.fixture
+def record(request: pytest.FixtureRequest) -> Callable[[Timings], None]:
+    """Record timings for the summary."""
+    results = request.config.stash[BENCHMARK_RESULTS]
+    return lambda timings: results.append(timings.summary())
+
+
+@pytest.fixture
+def bench(record: Callable[[Timings], None]) -> Bench:
+    """Measure a function and record the result for the summary, see `tests.timing.measure`."""
+
+    async def run(
+        name: str, func: Callable[[int], Awaitable[object]], iterations: int, concurrency: int = 1
+    ) -> Timings:
+        timings = await measure(name, func, iterations, concurrency)
+        record(timings)
+        return timings
+
+    return run
@@ -0,0 +1,87 @@
+"""Cache benchmarks."""
+
+import asyncio
+from collections.abc import Callable
+
+import pytest
+
+from csse3200bot.utils import AsyncCache, SyncCache
+from tests.benchmarks.conftest import Bench
+from tests.timing import Timings, measure_sync
+
+pytestmark = pytest.mark.benchmark
+
+KEYS = 1000
+CONCURRENCY = 50
+
+
+def test_sync_cache_get_hit(record: Callable[[Timings], None], iterations: int) -> None:
+    """Gets of cached keys."""
+    cache = SyncCache[int, int](lambda key: key)
+    for key in range(KEYS):
+        cache.get(key)
+
+    record(measure_sync("SyncCache.get hit", lambda i: cache.get(i % KEYS), iterations * 10))
+
+
+def test_sync_cache_set(record: Callable[[Timings], None], iterations: int) -> None:
+    """Sets, over a set of keys that is larger than the cache."""
+    cache = SyncCache[int, int](lambda key: key)
+
+    record(measure_sync("SyncCache.set", lambda i: cache.set(i, i), iterations * 10))
+
+
+def test_async_cache_get_hit(runner: asyncio.Runner, bench: Bench, iterations: int) -> None:
+    """Concurrent gets of cached keys."""
+
+    async def fetch(key: int) -> int:
+        return key
+
+    cache = AsyncCache[int, int](fetch)
+
+    async def run() -> None:
+        for key in range(KEYS):
+            await cache.get(key)
+
+        async def get(i: int) -> None:
+            await cache.get(i % KEYS)
+
+        await bench("AsyncCache.get hit", get, iterations * 10, CONCURRENCY)
+
+    runner.run(run())
+
+
+def test_async_cache_get_miss(runner: asyncio.Runner, bench: Bench, iterations: int) -> None:
+    """Concurrent gets of uncached keys, with a fetch that yields to the loop like a db query would."""
+    fetches = 0
+
+    async def fetch(key: int) -> int:
+        nonlocal fetches
+        fetches += 1
+        await asyncio.sleep(0)
+        return key
+
+    cache = AsyncCache[int, int](fetch)
+
+    async def get(i: int) -> None:
+        await cache.get(i)
+
+    runner.run(bench("AsyncCache.get miss", get, iterations * 10, CONCURRENCY))
+    assert fetches == iterations * 10
+
+
+def test_async_cache_get_contended(runner: asyncio.Runner, bench: Bench, iterations: int) -> None:
+    """Concurrent gets of a few keys that keep getting invalidated, as happens around a write."""
+
+    async def fetch(key: int) -> int:
+        await asyncio.sleep(0)
+        return key
+
+    cache = AsyncCache[int, int](fetch)
+
+    async def get(i: int) -> None:
+        if i % CONCURRENCY == 0:
+            cache.clear()
+        await cache.get(i % 10)
+
+    runner.run(bench("AsyncCache.get contended", get, iterations * 10, CONCURRENCY))
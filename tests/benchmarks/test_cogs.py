@@ -0,0 +1,107 @@
+"""End to end benchmarks of the command handlers, with fake discord and github backends.
+
+Handlers are called directly, skipping the command tree so cooldowns don't get in the way.
+"""
+
+import asyncio
+
+import pytest
+from discord import app_commands
+
+from csse3200bot.bot import CSSEBot
+from tests.benchmarks.conftest import Bench
+from tests.fakes import FakeDiscordHTTP, FakeGithub, add_member, make_guild, make_interaction
+
+pytestmark = pytest.mark.benchmark
+
+CONCURRENCY = 20
+
+
+def _command(bot: CSSEBot, name: str) -> app_commands.Command:
+    group, *parts = name.split()
+    command = bot.tree.get_command(group)
+    for part in parts:
+        assert isinstance(command, app_commands.Group)
+        command = command.get_command(part)
+    assert isinstance(command, app_commands.Command)
+    return command
+
+
+async def _invoke(bot: CSSEBot, name: str, interaction: object, *args: object) -> None:
+    command = _command(bot, name)
+    await command.callback(command.binding, interaction, *args)  # type: ignore[arg-type]
+
+
+def test_gh_commands(
+    runner: asyncio.Runner,
+    bench: Bench,
+    bot: CSSEBot,
+    github: FakeGithub,
+    discord_http: FakeDiscordHTTP,
+    iterations: int,
+) -> None:
+    """`/gh set`, `/gh get` and `/gh repo_info`."""
+    guild = make_guild(bot)
+    members = [add_member(guild, ["Student"]) for _ in range(iterations)]
+    logins = [github.add_user(f"student{i}").login for i in range(iterations)]
+
+    async def run() -> None:
+        await bot.create_or_update_studio(str(guild.id), 1, 2025, "repo")
+        await _command(bot, "gh get").binding._load_members()  # type: ignore[union-attr]
+
+        async def set_gh(i: int) -> None:
+            await _invoke(bot, "gh set", make_interaction(bot, guild, members[i]), logins[i])
+
+        async def get_gh(i: int) -> None:
+            await _invoke(bot, "gh get", make_interaction(bot, guild, members[i]))
+
+        async def repo_info(i: int) -> None:
+            await _invoke(bot, "gh repo_info", make_interaction(bot, guild, members[i]))
+
+        await bench("/gh set", set_gh, iterations)
+        await bench("/gh get", get_gh, iterations, CONCURRENCY)
+        await bench("/gh repo_info", repo_info, iterations, CONCURRENCY)
+
+    runner.run(run())
+    # every member linked their account, so each /gh get looked up a github user
+    assert github.calls.total["get_user_by_id"] == iterations
+    assert discord_http.calls.total
+
+
+def test_team_commands(
+    runner: asyncio.Runner,
+    bench: Bench,
+    bot: CSSEBot,
+    discord_http: FakeDiscordHTTP,
+    iterations: int,
+) -> None:
+    """`/team assign`, `/team sprint_set` and `/team sprint_get`."""
+    guild = make_guild(bot)
+    students = [add_member(guild, ["Student"]) for _ in range(iterations)]
+    team_members = [add_member(guild, ["Student", f"Team {team}"]) for team in range(1, 9)]
+
+    async def run() -> None:
+        await bot.create_or_update_studio(str(guild.id), 1, 2025, "repo")
+        teams_cog = _command(bot, "team sprint_get").binding
+
+        async def assign(i: int) -> None:
+            await _invoke(bot, "team assign", make_interaction(bot, guild, students[i]), f"Team {i % 8 + 1}")
+
+        async def sprint_set(i: int) -> None:
+            member = team_members[i % len(team_members)]
+            await _invoke(bot, "team sprint_set", make_interaction(bot, guild, member), i % 4 + 1, f"Feature {i}")
+
+        async def sprint_get(i: int) -> None:
+            await _invoke(bot, "team sprint_get", make_interaction(bot, guild, students[i]), i % 4 + 1)
+
+        async def sprint_get_cold(i: int) -> None:
+            teams_cog._on_sprint_reset()  # type: ignore[union-attr]
+            await sprint_get(i)
+
+        await bench("/team assign", assign, iterations, CONCURRENCY)
+        await bench("/team sprint_set", sprint_set, iterations)
+        await bench("/team sprint_get", sprint_get, iterations, CONCURRENCY)
+        await bench("/team sprint_get (uncached)", sprint_get_cold, iterations)
+
+    runner.run(run())
+    assert discord_http.calls.total["PUT /guilds/{guild_id}/members/{user_id}/roles/{role_id}"] == iterations
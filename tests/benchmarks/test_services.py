@@ -0,0 +1,185 @@
+"""Database service benchmarks."""
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from csse3200bot.gh.service import create_or_update_user_model, get_user_model, get_user_model_by_gh
+from csse3200bot.studio.models import StudioModel
+from csse3200bot.studio.service import create_studio, get_studio_by_guild, link_guild_to_studio
+from csse3200bot.teams.service import (
+    create_or_update_sprint_feature,
+    get_contributor_totals,
+    get_features_for_sprint,
+    get_sprint_feature,
+    save_contribution_weeks,
+    save_pull_requests,
+)
+from tests.benchmarks.conftest import Bench
+
+if TYPE_CHECKING:
+    from csse3200bot.teams.stats import ContributionWeek, PullRequest
+
+pytestmark = pytest.mark.benchmark
+
+STUDIOS = 4
+GUILDS_PER_STUDIO = 2
+TEAMS = 8
+SPRINTS = 4
+USERS = 500
+CONCURRENCY = 10
+WEEKS = 13
+PULLS_PER_USER = 10
+
+
+async def _seed_studios(sessionmaker: async_sessionmaker) -> list[StudioModel]:
+    studios = []
+    async with sessionmaker() as session:
+        for number in range(1, STUDIOS + 1):
+            studio = await create_studio(session, number, 2025, f"repo-{number}")
+            for guild in range(GUILDS_PER_STUDIO):
+                await link_guild_to_studio(session, studio.studio_id, f"{number}{guild}")
+            studios.append(studio)
+    return studios
+
+
+async def _seed_features(sessionmaker: async_sessionmaker, studios: list[StudioModel]) -> None:
+    async with sessionmaker() as session:
+        for studio in studios:
+            for team in range(1, TEAMS + 1):
+                for sprint in range(1, SPRINTS + 1):
+                    await create_or_update_sprint_feature(
+                        session, studio.studio_id, f"Team {team}", sprint, f"Feature {team}.{sprint}"
+                    )
+
+
+async def _seed_users(sessionmaker: async_sessionmaker) -> None:
+    async with sessionmaker() as session:
+        for user in range(USERS):
+            await create_or_update_user_model(session, str(user), f"gh{user}")
+
+
+def test_studio_queries(
+    runner: asyncio.Runner, bench: Bench, sessionmaker: async_sessionmaker, iterations: int
+) -> None:
+    """Looking up the studio of a guild, done by every studio_required command on a cache miss."""
+
+    async def run() -> None:
+        await _seed_studios(sessionmaker)
+
+        async def get_studio(i: int) -> None:
+            async with sessionmaker() as session:
+                studio = await get_studio_by_guild(session, f"{i % STUDIOS + 1}{i % GUILDS_PER_STUDIO}")
+            assert studio is not None
+
+        await bench("studio.get_studio_by_guild", get_studio, iterations, CONCURRENCY)
+
+    runner.run(run())
+
+
+def test_teams_queries(runner: asyncio.Runner, bench: Bench, sessionmaker: async_sessionmaker, iterations: int) -> None:
+    """Sprint feature reads and writes."""
+
+    async def run() -> None:
+        studios = await _seed_studios(sessionmaker)
+        await _seed_features(sessionmaker, studios)
+
+        async def get_features(i: int) -> None:
+            async with sessionmaker() as session:
+                features = await get_features_for_sprint(session, studios[i % STUDIOS].studio_id, i % SPRINTS + 1)
+            assert len(features) == TEAMS
+
+        async def get_feature(i: int) -> None:
+            async with sessionmaker() as session:
+                await get_sprint_feature(session, studios[i % STUDIOS].studio_id, f"Team {i % TEAMS + 1}", 1)
+
+        async def set_feature(i: int) -> None:
+            async with sessionmaker() as session:
+                await create_or_update_sprint_feature(
+                    session, studios[i % STUDIOS].studio_id, f"Team {i % TEAMS + 1}", 1, f"Updated {i}"
+                )
+
+        await bench("teams.get_features_for_sprint", get_features, iterations, CONCURRENCY)
+        await bench("teams.get_sprint_feature", get_feature, iterations, CONCURRENCY)
+        # writes are sequential, sqlite would only serialise them anyway
+        await bench("teams.create_or_update_sprint_feature", set_feature, iterations)
+
+    runner.run(run())
+
+
+def test_gh_queries(runner: asyncio.Runner, bench: Bench, sessionmaker: async_sessionmaker, iterations: int) -> None:
+    """Discord to github user lookups and writes."""
+
+    async def run() -> None:
+        await _seed_users(sessionmaker)
+
+        async def get_user(i: int) -> None:
+            async with sessionmaker() as session:
+                await get_user_model(session, str(i % USERS))
+
+        async def get_user_by_gh(i: int) -> None:
+            async with sessionmaker() as session:
+                await get_user_model_by_gh(session, f"gh{i % USERS}")
+
+        async def set_user(i: int) -> None:
+            async with sessionmaker() as session:
+                await create_or_update_user_model(session, str(USERS + i), f"gh{USERS + i}")
+
+        await bench("gh.get_user_model", get_user, iterations, CONCURRENCY)
+        await bench("gh.get_user_model_by_gh", get_user_by_gh, iterations, CONCURRENCY)
+        await bench("gh.create_or_update_user_model", set_user, iterations)
+
+    runner.run(run())
+
+
+async def _seed_contributions(sessionmaker: async_sessionmaker) -> None:
+    start = datetime(2025, 8, 3, tzinfo=UTC)
+    weeks: list[ContributionWeek] = [
+        {
+            "repo_name": "repo",
+            "gh_id": f"gh{user}",
+            "week_start": start + timedelta(weeks=week),
+            "commits": user % 7 + 1,
+            "additions": user * 10,
+            "deletions": user,
+        }
+        for user in range(USERS)
+        for week in range(WEEKS)
+    ]
+    pulls: list[PullRequest] = [
+        {
+            "repo_name": "repo",
+            "number": user * PULLS_PER_USER + i,
+            "gh_id": f"gh{user}",
+            "created_at": start + timedelta(days=i * 9),
+            "merged_at": start + timedelta(days=i * 9 + 1) if i % 2 else None,
+        }
+        for user in range(USERS)
+        for i in range(PULLS_PER_USER)
+    ]
+    async with sessionmaker() as session:
+        await save_contribution_weeks(session, "repo", weeks)
+        await save_pull_requests(session, "repo", pulls)
+
+
+def test_contributor_totals(
+    runner: asyncio.Runner, bench: Bench, sessionmaker: async_sessionmaker, iterations: int
+) -> None:
+    """Summing every contributor's contributions in a sprint, done by `/team stats` on a cache miss."""
+
+    async def run() -> None:
+        await _seed_users(sessionmaker)
+        await _seed_contributions(sessionmaker)
+        start = datetime(2025, 8, 25, tzinfo=UTC)
+        end = start + timedelta(weeks=3)
+
+        async def get_totals(_: int) -> None:
+            async with sessionmaker() as session:
+                await get_contributor_totals(session, "repo", start, end)
+
+        await bench("teams.get_contributor_totals", get_totals, iterations, CONCURRENCY)
+
+    runner.run(run())
@@ -0,0 +1,128 @@
+"""Shared pytest configuration and fixtures.
+
+pytest-asyncio isn't a dependency, so tests drive their coroutines through the `runner` fixture.
+"""
+
+import asyncio
+import importlib.util
+import json
+import os
+from collections.abc import Generator
+from pathlib import Path
+from typing import Any
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+
+from csse3200bot.bot import CSSEBot
+from csse3200bot.database.base import BaseDBModel
+from csse3200bot.gh.cog import GitHubCog
+from csse3200bot.studio.cog import StudioCog
+from csse3200bot.teams.cog import TeamsCog
+from tests.fakes import FakeDiscordHTTP, FakeGithub, make_bot, make_database
+from tests.timing import format_table
+
+BENCHMARK_RESULTS = pytest.StashKey[list[dict[str, Any]]]()
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Benchmark options."""
+    group = parser.getgroup("benchmark")
+    group.addoption("--benchmark", action="store_true", help="run the benchmarks in tests/benchmarks")
+    group.addoption("--benchmark-iterations", type=int, default=500, help="calls per benchmark (default: %(default)s)")
+    group.addoption("--benchmark-json", metavar="PATH", help="write the benchmark results to a json file")
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    """Register the benchmark marker."""
+    config.addinivalue_line("markers", "benchmark: benchmark, only run with --benchmark")
+    config.stash[BENCHMARK_RESULTS] = []
+
+
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]) -> None:
+    """Skip the benchmarks unless asked for, they are slow and only meaningful on a quiet machine."""
+    if config.getoption("--benchmark"):
+        return
+    skip = pytest.mark.skip(reason="benchmarks only run with --benchmark")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+
+def pytest_terminal_summary(terminalreporter: pytest.TerminalReporter, config: pytest.Config) -> None:
+    """Report throughput and latency of every benchmark that ran."""
+    results = config.stash[BENCHMARK_RESULTS]
+    if not results:
+        return
+
+    terminalreporter.section("benchmarks")
+    for line in format_table(results):
+        terminalreporter.write_line(line)
+
+    path = config.getoption("--benchmark-json")
+    if path:
+        Path(path).write_text(json.dumps(results, indent=2))
+        terminalreporter.write_line(f"Wrote results to {path}")
+
+
+@pytest.fixture
+def runner() -> Generator[asyncio.Runner]:
+    """Event loop shared by a test and its fixtures."""
+    with asyncio.Runner() as runner:
+        yield runner
+
+
+@pytest.fixture
+def database(runner: asyncio.Runner, tmp_path: Path) -> Generator[tuple[AsyncEngine, async_sessionmaker]]:
+    """A fresh database, sqlite unless TEST_DB_URL is set."""
+    db_url = os.environ.get("TEST_DB_URL")
+    if db_url is None:
+        if importlib.util.find_spec("aiosqlite") is None:
+            pytest.skip("aiosqlite isn't installed and TEST_DB_URL isn't set")
+        db_url = f"sqlite+aiosqlite:///{tmp_path / 'test.db'}"
+
+    engine, sessionmaker = runner.run(make_database(db_url))
+    yield engine, sessionmaker
+
+    async def teardown() -> None:
+        async with engine.begin() as conn:
+            await conn.run_sync(BaseDBModel.metadata.drop_all)
+        await engine.dispose()
+
+    runner.run(teardown())
+
+
+@pytest.fixture
+def sessionmaker(database: tuple[AsyncEngine, async_sessionmaker]) -> async_sessionmaker:
+    """Sessionmaker of the test database."""
+    return database[1]
+
+
+@pytest.fixture
+def github() -> FakeGithub:
+    """Fake github."""
+    return FakeGithub()
+
+
+@pytest.fixture
+def discord_http() -> FakeDiscordHTTP:
+    """Fake discord API."""
+    return FakeDiscordHTTP()
+
+
+@pytest.fixture
+def bot(
+    runner: asyncio.Runner,
+    database: tuple[AsyncEngine, async_sessionmaker],
+    github: FakeGithub,
+    discord_http: FakeDiscordHTTP,
+) -> CSSEBot:
+    """A bot with every cog loaded."""
+
+    async def setup() -> CSSEBot:
+        bot = make_bot(*database, github, discord_http)
+        for cog in (GitHubCog(bot), StudioCog(bot), TeamsCog(bot)):
+            await bot.add_cog(cog)
+        return bot
+
+    return runner.run(setup())
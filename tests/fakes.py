@@ -0,0 +1,580 @@
+"""Fake discord and github backends, for driving the bot without a live discord server or github org.
+
+Discord objects (guilds, members, interactions) are the real discord.py classes built from gateway payloads,
+only the HTTP layer underneath them is stubbed, so the cogs run exactly as they would in production.
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from collections import Counter, defaultdict
+from collections.abc import Sequence
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from itertools import count
+from types import SimpleNamespace
+from typing import Any
+from unittest import mock
+
+import discord
+from discord import app_commands
+from discord.http import Route
+from discord.webhook.async_ import AsyncWebhookAdapter, async_context
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from csse3200bot.bot import CSSEBot
+from csse3200bot.constants import NUM_TEAMS, STUDENT_ROLE, TUTOR_ROLES
+from csse3200bot.database.notify import CacheInvalidationBus
+from csse3200bot.database.profiling import install_query_hooks
+from csse3200bot.database.service import initialise_database
+from csse3200bot.enums import BotExtension
+
+BOT_USER_ID = 1
+APPLICATION_ID = 2
+CHANNEL_ID = 3
+
+_snowflakes = count(10_000)
+
+# Calls to the fakes are also counted under this label, e.g. the command being run
+call_label: ContextVar[str | None] = ContextVar("call_label", default=None)
+
+
+class CallCounter:
+    """Counts calls by name, in total and per `call_label`."""
+
+    total: Counter[str]
+    by_label: defaultdict[str, Counter[str]]
+
+    def __init__(self) -> None:
+        """No calls."""
+        self.total = Counter()
+        self.by_label = defaultdict(Counter)
+
+    def add(self, name: str) -> None:
+        """Count a call."""
+        self.total[name] += 1
+        label = call_label.get()
+        if label is not None:
+            self.by_label[label][name] += 1
+
+
+def next_snowflake() -> int:
+    """Unique id for a fake discord object."""
+    return next(_snowflakes)
+
+
+def _timestamp() -> str:
+    return datetime.now(UTC).isoformat()
+
+
+def user_payload(user_id: int, name: str | None = None, *, bot: bool = False) -> dict[str, Any]:
+    """Gateway payload of a user."""
+    return {
+        "id": str(user_id),
+        "username": name or f"user{user_id}",
+        "discriminator": "0",
+        "global_name": None,
+        "avatar": None,
+        "bot": bot,
+    }
+
+
+def member_payload(user_id: int, role_ids: Sequence[int] = ()) -> dict[str, Any]:
+    """Gateway payload of a guild member."""
+    return {
+        "user": user_payload(user_id),
+        "roles": [str(role_id) for role_id in role_ids],
+        "joined_at": _timestamp(),
+        "deaf": False,
+        "mute": False,
+        "flags": 0,
+        "permissions": "0",
+    }
+
+
+def _role_payload(role_id: int, name: str, position: int) -> dict[str, Any]:
+    return {
+        "id": str(role_id),
+        "name": name,
+        "color": 0,
+        "hoist": False,
+        "position": position,
+        "permissions": "0",
+        "managed": False,
+        "mentionable": False,
+        "flags": 0,
+    }
+
+
+def _message_payload(content: str | None) -> dict[str, Any]:
+    return {
+        "id": str(next_snowflake()),
+        "channel_id": str(CHANNEL_ID),
+        "type": 0,
+        "content": content or "",
+        "author": user_payload(BOT_USER_ID, "bot", bot=True),
+        "attachments": [],
+        "embeds": [],
+        "mentions": [],
+        "mention_roles": [],
+        "pinned": False,
+        "mention_everyone": False,
+        "tts": False,
+        "timestamp": _timestamp(),
+        "edited_timestamp": None,
+        "flags": 0,
+    }
+
+
+class FakeDiscordHTTP(AsyncWebhookAdapter):
+    """Stands in for discord's REST API, counting requests by route instead of sending them.
+
+    Covers both the bot's HTTP client (roles, members, messages) and the webhook adapter interactions and
+    followups are sent through.
+    """
+
+    calls: CallCounter
+    latency: float
+    messages: list[str]  # content of the messages sent to channels
+    forbidden_channels: set[int]  # channels the bot can't send messages to
+    missing_users: set[int]  # users that deleted their account
+    missing_members: set[tuple[int, int]]  # (guild id, user id) of users that aren't in the guild
+
+    def __init__(self, latency: float = 0.0) -> None:
+        """Creates a fake API, each request takes `latency` seconds to respond."""
+        super().__init__()
+        self.calls = CallCounter()
+        self.latency = latency
+        self.messages = []
+        self.forbidden_channels = set()
+        self.missing_users = set()
+        self.missing_members = set()
+
+    def install(self, bot: discord.Client) -> None:
+        """Route the bot's requests, and interaction responses in the current context, to this fake."""
+        bot.http.request = self._request  # type: ignore[method-assign]
+        async_context.set(self)
+
+    async def request(self, route: Route, *_: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+        """Webhook adapter requests (interaction responses and followups)."""
+        return await self._request(route, **kwargs)
+
+    async def _request(self, route: Route, **kwargs: Any) -> Any:  # noqa: ANN401
+        self.calls.add(f"{route.method} {route.path}")
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        if route.path.endswith("/callback"):
+            return {"interaction": {"id": str(next_snowflake()), "type": 2}}
+        if route.method == "POST" and route.path.startswith(("/webhooks/", "/channels/")):
+            payload = kwargs.get("payload") or kwargs.get("json") or {}
+            if route.path.startswith("/channels/"):
+                if route.channel_id in self.forbidden_channels:
+                    raise discord.Forbidden(SimpleNamespace(status=403, reason="Forbidden"), "Missing Access")  # type: ignore[arg-type]
+                self.messages.append(payload.get("content") or "")
+            return _message_payload(payload.get("content"))
+        if route.method == "GET":
+            return self._get(route)
+        if route.method == "PATCH" and route.path == "/guilds/{guild_id}/members/{user_id}":
+            roles = (kwargs.get("json") or {}).get("roles", [])
+            return member_payload(int(route.url.rsplit("/", 1)[1]), [int(role_id) for role_id in roles])
+        return None
+
+    def _get(self, route: Route) -> Any:  # noqa: ANN401
+        if route.path == "/users/{user_id}":
+            user_id = int(route.url.rsplit("/", 1)[1])
+            if user_id in self.missing_users:
+                raise discord.NotFound(SimpleNamespace(status=404, reason="Not Found"), "Unknown User")  # type: ignore[arg-type]
+            return user_payload(user_id)
+        if route.path == "/guilds/{guild_id}/members/{member_id}":
+            user_id = int(route.url.rsplit("/", 1)[1])
+            if user_id in self.missing_users or (route.guild_id, user_id) in self.missing_members:
+                raise discord.NotFound(SimpleNamespace(status=404, reason="Not Found"), "Unknown Member")  # type: ignore[arg-type]
+            return member_payload(user_id)
+        return None
+
+
+@dataclass
+class FakeNamedUser:
+    """Github user, with the attributes the cogs use."""
+
+    id: int
+    login: str
+    bio: str | None = None
+    created_at: datetime = field(default_factory=lambda: datetime(2020, 1, 1, tzinfo=UTC))
+
+    @property
+    def html_url(self) -> str:
+        """Profile url."""
+        return f"https://github.com/{self.login}"
+
+    @property
+    def avatar_url(self) -> str:
+        """Avatar url."""
+        return f"https://avatars.githubusercontent.com/u/{self.id}"
+
+
+@dataclass
+class FakeRepository:
+    """Github repository, with the attributes the cogs use."""
+
+    name: str
+    organization: "FakeOrganization"
+    description: str | None = "A repository"
+    stargazers_count: int = 1
+    forks_count: int = 2
+    subscribers_count: int = 3
+    open_issues_count: int = 4
+    created_at: datetime = field(default_factory=lambda: datetime(2025, 1, 1, tzinfo=UTC))
+    updated_at: datetime = field(default_factory=lambda: datetime.now(UTC))
+
+    @property
+    def full_name(self) -> str:
+        """Org qualified name."""
+        return f"{self.organization.login}/{self.name}"
+
+    @property
+    def html_url(self) -> str:
+        """Repository url."""
+        return f"https://github.com/{self.full_name}"
+
+
+class FakeGithub:
+    """Stands in for the github client, counting calls and blocking for `latency` like PyGithub would."""
+
+    calls: CallCounter
+    latency: float
+    users: dict[int, FakeNamedUser]
+    activity: defaultdict[str, dict[str, list[dict[str, Any]]]]  # repo -> endpoint -> items, oldest first
+    contributions: defaultdict[str, defaultdict[int, list[dict[str, int]]]]  # repo -> user id -> weeks
+    pulls: defaultdict[str, list[dict[str, Any]]]  # repo -> pull requests, oldest first
+    requester: "FakeRequester"
+
+    def __init__(self, latency: float = 0.0) -> None:
+        """Creates a github with no users or repos."""
+        self.calls = CallCounter()
+        self.latency = latency
+        self.users = {}
+        self.activity = defaultdict(lambda: {"commits": [], "issues": []})
+        self.contributions = defaultdict(lambda: defaultdict(list))
+        self.pulls = defaultdict(list)
+        self.requester = FakeRequester(self)
+
+    def _call(self, name: str) -> None:
+        self.calls.add(name)
+        if self.latency:
+            time.sleep(self.latency)
+
+    def add_user(self, login: str) -> FakeNamedUser:
+        """Add a member of the org."""
+        user = FakeNamedUser(id=next_snowflake(), login=login)
+        self.users[user.id] = user
+        return user
+
+    def add_commit(self, repo_name: str, message: str, when: datetime) -> None:
+        """Add a commit to a repo's default branch."""
+        sha = hashlib.sha1(f"{repo_name}{message}{when}".encode()).hexdigest()  # noqa: S324
+        self.activity[repo_name]["commits"].append(
+            {
+                "sha": sha,
+                "html_url": f"https://github.com/org/{repo_name}/commit/{sha}",
+                "author": {"login": "student"},
+                "commit": {"message": message, "author": {"name": "Student"}, "committer": {"date": when.isoformat()}},
+            }
+        )
+
+    def add_issue(self, repo_name: str, title: str, when: datetime, *, pull_request: bool = False) -> None:
+        """Open an issue (or pull request) in a repo."""
+        issues = self.activity[repo_name]["issues"]
+        number = len(issues) + 1
+        issues.append(
+            {
+                "number": number,
+                "title": title,
+                "state": "open",
+                "html_url": f"https://github.com/org/{repo_name}/issues/{number}",
+                "user": {"login": "student"},
+                "updated_at": when.isoformat(),
+                **({"pull_request": {"merged_at": None}} if pull_request else {}),
+            }
+        )
+
+    def add_contributions(self, repo_name: str, user: FakeNamedUser, week_start: datetime, commits: int) -> None:
+        """Add a week of a user's commits to a repo's contributor stats, each adding 10 lines and removing 2."""
+        self.contributions[repo_name][user.id].append(
+            {"w": int(week_start.timestamp()), "c": commits, "a": commits * 10, "d": commits * 2}
+        )
+
+    def add_pull_request(
+        self, repo_name: str, user: FakeNamedUser, when: datetime, merged_at: datetime | None = None
+    ) -> None:
+        """Open (and possibly merge) a pull request in a repo."""
+        pulls = self.pulls[repo_name]
+        pulls.append(
+            {
+                "number": len(pulls) + 1,
+                "user": {"id": user.id, "login": user.login},
+                "created_at": when.isoformat(),
+                "updated_at": (merged_at or when).isoformat(),
+                "merged_at": merged_at.isoformat() if merged_at is not None else None,
+            }
+        )
+
+    def get_organization(self, login: str) -> "FakeOrganization":
+        """See `Github.get_organization`."""
+        return FakeOrganization(self, login)
+
+    def get_user_by_id(self, user_id: int) -> FakeNamedUser:
+        """See `Github.get_user_by_id`."""
+        self._call("get_user_by_id")
+        return self.users[user_id]
+
+
+class FakeOrganization:
+    """Stands in for a github organization."""
+
+    login: str
+    avatar_url: str
+    _github: FakeGithub
+
+    def __init__(self, github: FakeGithub, login: str) -> None:
+        """Organization backed by the given github."""
+        self._github = github
+        self.login = login
+        self.avatar_url = f"https://avatars.githubusercontent.com/{login}"
+
+    def get_members(self) -> list[FakeNamedUser]:
+        """See `Organization.get_members`."""
+        self._github._call("get_members")
+        return list(self._github.users.values())
+
+    def get_repo(self, name: str) -> FakeRepository:
+        """See `Organization.get_repo`."""
+        self._github._call("get_repo")
+        return FakeRepository(name=name, organization=self)
+
+    def get_repos(self) -> list[FakeRepository]:
+        """See `Organization.get_repos`, every repo with activity or contributions."""
+        self._github._call("get_repos")
+        names = sorted({*self._github.activity, *self._github.contributions, *self._github.pulls})
+        return [FakeRepository(name=name, organization=self) for name in names]
+
+
+class FakeRequester:
+    """Stands in for PyGithub's requester, serving the endpoints fetched directly with etags like github does."""
+
+    _github: FakeGithub
+
+    def __init__(self, github: FakeGithub) -> None:
+        """Requester backed by the given github."""
+        self._github = github
+
+    def requestJson(  # noqa: N802
+        self,
+        verb: str,
+        url: str,
+        parameters: dict[str, Any] | None = None,
+        headers: dict[str, Any] | None = None,
+    ) -> tuple[int, dict[str, Any], str]:
+        """See `Requester.requestJson`, only supports the commits, issues, pulls and contributor stats endpoints."""
+        self._github._call(f"{verb} {url.rsplit('/', 1)[-1]}")
+        parameters = parameters or {}
+        _, _, _, repo_name, endpoint = url.split("/", 4)
+        if endpoint == "stats/contributors":
+            contributions = self._github.contributions[repo_name]
+            body = json.dumps([{"author": {"id": user_id}, "weeks": weeks} for user_id, weeks in contributions.items()])
+        else:
+            body = self._list(repo_name, endpoint, parameters)
+
+        etag = f'"{hashlib.sha1(body.encode()).hexdigest()}"'  # noqa: S324
+        if headers is not None and headers.get("If-None-Match") == etag:
+            self._github.calls.add("not_modified")
+            return 304, {"etag": etag}, ""
+        return 200, {"etag": etag}, body
+
+    def _list(self, repo_name: str, endpoint: str, parameters: dict[str, Any]) -> str:
+        if endpoint == "pulls":
+            # most recently updated first, like the bot asks for
+            items = sorted(self._github.pulls[repo_name], key=lambda pull: pull["updated_at"], reverse=True)
+        else:
+            since = datetime.fromisoformat(parameters["since"])
+            items = [
+                item
+                for item in self._github.activity[repo_name][endpoint]
+                if datetime.fromisoformat(
+                    item["commit"]["committer"]["date"] if endpoint == "commits" else item["updated_at"]
+                )
+                >= since
+            ]
+        per_page = parameters.get("per_page", 30)
+        page = parameters.get("page", 1)
+        return json.dumps(items[(page - 1) * per_page : page * per_page])
+
+
+async def make_database(db_url: str) -> tuple[AsyncEngine, async_sessionmaker]:
+    """Engine and sessionmaker set up the same way main does, with the tables created."""
+    engine = create_async_engine(db_url)
+    install_query_hooks(engine)
+    await initialise_database(engine)
+    return engine, async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+
+def make_bot(
+    engine: AsyncEngine,
+    sessionmaker: async_sessionmaker,
+    github: FakeGithub,
+    http: FakeDiscordHTTP,
+    extensions: Sequence[BotExtension] = (),
+) -> CSSEBot:
+    """A bot that looks logged in, talking to the fake github and discord, with the extensions to load."""
+    intents = discord.Intents.default()
+    intents.members = True
+    with mock.patch("csse3200bot.bot.Github", return_value=github):
+        bot = CSSEBot(
+            [],
+            sessionmaker,
+            CacheInvalidationBus(engine),
+            "FakeOrg",
+            "fake-token",
+            extensions=extensions,
+            command_prefix="!",
+            intents=intents,
+        )
+    state = bot._connection
+    state.user = discord.ClientUser(state=state, data=user_payload(BOT_USER_ID, "bot", bot=True))  # type: ignore[arg-type]
+    state.application_id = APPLICATION_ID
+    http.install(bot)
+    return bot
+
+
+def make_guild(bot: discord.Client, name: str = "Studio", num_teams: int = NUM_TEAMS) -> discord.Guild:
+    """A guild with the team, tutor and student roles and the bot as a member, added to the bot's cache."""
+    state = bot._connection
+    guild_id = next_snowflake()
+    role_names = [
+        *(f"Team {number}" for number in range(1, num_teams + 1)),
+        *TUTOR_ROLES,
+        STUDENT_ROLE,
+    ]
+    roles = [_role_payload(guild_id, "@everyone", 0)]  # @everyone shares the guild's id
+    roles.extend(_role_payload(next_snowflake(), role_name, i) for i, role_name in enumerate(role_names, start=1))
+    # the bot is a member of its guilds, like member_count from the gateway
+    bot_member = member_payload(BOT_USER_ID) | {"user": user_payload(BOT_USER_ID, "bot", bot=True)}
+    guild = discord.Guild(
+        data={"id": str(guild_id), "name": name, "roles": roles, "members": [bot_member], "member_count": 1},  # type: ignore[typeddict-item, list-item]
+        state=state,
+    )
+    state._add_guild(guild)
+    return guild
+
+
+def add_system_channel(guild: discord.Guild) -> discord.TextChannel:
+    """Add a text channel to the guild's cache, as the channel join messages are sent to."""
+    payload = {
+        "id": str(next_snowflake()),
+        "type": 0,
+        "name": "general",
+        "position": 0,
+        "guild_id": str(guild.id),
+        "permission_overwrites": [],
+        "nsfw": False,
+        "parent_id": None,
+    }
+    channel = discord.TextChannel(data=payload, guild=guild, state=guild._state)  # type: ignore[arg-type]
+    guild._add_channel(channel)
+    guild._system_channel_id = channel.id
+    return channel
+
+
+def add_member(guild: discord.Guild, role_names: Sequence[str] = ()) -> dict[str, Any]:
+    """Add a member with the named roles to the guild's cache, returning its payload."""
+    role_ids = [role.id for role in guild.roles if role.name in role_names]
+    payload = member_payload(next_snowflake(), role_ids)
+    guild._add_member(discord.Member(data=payload, guild=guild, state=guild._state))  # type: ignore[arg-type]
+    guild._member_count = len(guild._members)
+    return payload
+
+
+def command_data(name: str, options: Sequence[tuple[str, str | int]] = ()) -> dict[str, Any]:
+    """Interaction data for running the (space separated, e.g. "gh set") command with the options."""
+    option_types = {str: 3, int: 4}
+    data: dict[str, Any] = {
+        "type": 1,
+        "options": [{"name": option, "type": option_types[type(value)], "value": value} for option, value in options],
+    }
+    *parents, data["name"] = name.split()
+    for parent in reversed(parents):
+        data = {"name": parent, "type": 1 if parent == parents[0] else 2, "options": [data]}
+    data["id"] = str(next_snowflake())
+    return data
+
+
+def make_interaction(
+    bot: discord.Client,
+    guild: discord.Guild,
+    member: dict[str, Any],
+    data: dict[str, Any] | None = None,
+) -> discord.Interaction[Any]:
+    """An application command interaction from the member, `data` being the command and its options."""
+    payload: dict[str, Any] = {
+        "id": str(next_snowflake()),
+        "type": 2,
+        "token": "fake-token",
+        "version": 1,
+        "application_id": str(APPLICATION_ID),
+        "attachment_size_limit": 8 * 1024 * 1024,
+        "guild_id": str(guild.id),
+        "member": member,
+        "app_permissions": "0",
+    }
+    if data is not None:
+        payload["data"] = data
+    return discord.Interaction(data=payload, state=bot._connection)  # type: ignore[arg-type]
+
+
+async def click(
+    bot: discord.Client,
+    guild: discord.Guild,
+    member: dict[str, Any],
+    message_id: int,
+    custom_id: str,
+    values: Sequence[str] | None = None,
+) -> discord.Interaction[Any]:
+    """Click a button (or pick `values` of a select) in a message, as if discord had sent the interaction.
+
+    Only the views listening to every message (persistent views) or that message are dispatched to, like discord.py
+    does, waiting for their callbacks.
+    """
+    data: dict[str, Any] = {"custom_id": custom_id, "component_type": 2 if values is None else 3}
+    if values is not None:
+        data["values"] = list(values)
+    interaction = make_interaction(bot, guild, member, data)
+    interaction.type = discord.InteractionType.component
+    interaction.message = discord.Message(
+        state=bot._connection,
+        channel=interaction.channel,  # type: ignore[arg-type]
+        data=_message_payload(None) | {"id": str(message_id)},  # type: ignore[arg-type]
+    )
+    bot._connection._view_store.dispatch_view(data["component_type"], custom_id, interaction)
+    dispatched = [task for task in asyncio.all_tasks() if task.get_name().startswith("discord-ui-view-dispatch")]
+    await asyncio.gather(*dispatched)
+    return interaction
+
+
+async def run_command(
+    bot: CSSEBot,
+    guild: discord.Guild,
+    member: dict[str, Any],
+    name: str,
+    options: Sequence[tuple[str, str | int]] = (),
+) -> discord.Interaction[Any]:
+    """Run a command as the member through the bot's command tree, as if discord had sent the interaction."""
+    interaction = make_interaction(bot, guild, member, command_data(name, options))
+    try:
+        await bot.tree._call(interaction)
+    except app_commands.AppCommandError as e:
+        # what the tree does for errors raised before the command is invoked
+        await bot.tree.on_error(interaction, e)
+    return interaction
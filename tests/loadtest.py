@@ -0,0 +1,222 @@
+"""Load test, simulating a cohort of students hitting the bot around a sprint deadline.
+
+Usage:
+    python -m tests.loadtest [--studios 4] [--students 300] [--requests 3000] [--concurrency 100]
+        [--mix "gh set=2,team assign=2,team sprint_get=4"] [--db-url URL]
+        [--discord-latency 0.05] [--github-latency 0.2]
+
+Interactions go through the bot's command tree like they would from the gateway, with discord's REST API and
+github stubbed out (see `tests.fakes`), so only the bot and its database are under load. Reports latency
+percentiles and the db queries (as tracked by the bot), github calls and discord requests made per command.
+Uses sqlite (needs `aiosqlite`) unless `--db-url` is given.
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import sys
+import tempfile
+from collections import Counter
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from time import perf_counter
+from typing import Any
+
+import discord
+
+from csse3200bot.bot import CSSEBot
+from csse3200bot.constants import NUM_SPRINTS, NUM_TEAMS
+from csse3200bot.gh.cog import GitHubCog
+from csse3200bot.studio.cog import StudioCog
+from csse3200bot.teams.cog import TeamsCog
+from tests.fakes import (
+    FakeDiscordHTTP,
+    FakeGithub,
+    add_member,
+    call_label,
+    make_bot,
+    make_database,
+    make_guild,
+    run_command,
+)
+from tests.timing import Timings, format_table, percentile
+
+log = logging.getLogger(__name__)
+
+DEFAULT_MIX = "gh set=2,gh get=1,team assign=2,team sprint_set=1,team sprint_get=4"
+
+
+@dataclass
+class Student:
+    """A simulated student."""
+
+    guild: discord.Guild
+    member: dict[str, Any]
+    gh_login: str
+
+
+type OptionsFactory = Callable[[Student], Sequence[tuple[str, str | int]]]
+
+# command -> options to run it with
+COMMANDS: dict[str, OptionsFactory] = {
+    "gh set": lambda student: [("gh_username", student.gh_login)],
+    "gh get": lambda _: [],
+    "gh repo_info": lambda _: [],
+    "team assign": lambda _: [("team", f"Team {random.randint(1, NUM_TEAMS)}")],  # noqa: S311
+    "team sprint_set": lambda student: [
+        ("sprint_number", random.randint(1, NUM_SPRINTS)),  # noqa: S311
+        ("features", f"Features of {student.gh_login}"),
+    ],
+    "team sprint_get": lambda _: [("sprint_number", random.randint(1, NUM_SPRINTS))],  # noqa: S311
+}
+
+
+def parse_mix(mix: str) -> dict[str, float]:
+    """Parse a command mix like "gh set=2,team sprint_get=4" into command weights."""
+    weights = {}
+    for part in mix.split(","):
+        command, _, weight = part.partition("=")
+        command = command.strip()
+        if command not in COMMANDS:
+            msg = f"Unknown command '{command}', expected one of {', '.join(COMMANDS)}"
+            raise argparse.ArgumentTypeError(msg)
+        weights[command] = float(weight or 1)
+    return weights
+
+
+class LoadTest:
+    """A bot, the fakes behind it and a cohort of students to run commands as."""
+
+    bot: CSSEBot
+    github: FakeGithub
+    discord_http: FakeDiscordHTTP
+    queries: Counter[str]  # command -> queries
+    round_trips: Counter[str]  # command -> db round trips
+    students: list[Student]
+    timings: dict[str, Timings]
+    failures: dict[str, int]
+
+    def __init__(self, bot: CSSEBot, github: FakeGithub, discord_http: FakeDiscordHTTP) -> None:
+        """Creates a load test with no students, see `setup`."""
+        self.bot = bot
+        self.github = github
+        self.discord_http = discord_http
+        self.queries = Counter()
+        self.round_trips = Counter()
+        self.students = []
+        self.timings = {}
+        self.failures = {}
+
+    async def setup(self, studios: int, students: int) -> None:
+        """Create the studio guilds and the students, half of whom are already in a team."""
+        guilds = [make_guild(self.bot, f"Studio {number}") for number in range(1, studios + 1)]
+        for i in range(students):
+            guild = guilds[i % studios]
+            roles = ["Student", f"Team {i % NUM_TEAMS + 1}"] if i % 2 else ["Student"]
+            login = self.github.add_user(f"student{i}").login
+            self.students.append(Student(guild, add_member(guild, roles), login))
+
+        for cog in (GitHubCog(self.bot), StudioCog(self.bot), TeamsCog(self.bot)):
+            await self.bot.add_cog(cog)
+        for number, guild in enumerate(guilds, start=1):
+            await self.bot.create_or_update_studio(str(guild.id), number, 2025, f"studio-{number}")
+
+    async def run_command(self, command: str, student: Student) -> None:
+        """Run a command as the student, through the command tree."""
+        call_label.set(command)
+        start = perf_counter()
+        interaction = await run_command(self.bot, student.guild, student.member, command, COMMANDS[command](student))
+        self.timings[command].latencies.append(perf_counter() - start)
+        if interaction.command_failed:
+            self.failures[command] += 1
+        # tracked by the bot's command tree
+        query_stats = interaction.extras["query_stats"]
+        self.queries[command] += query_stats.queries
+        self.round_trips[command] += query_stats.round_trips
+
+    async def run(self, mix: dict[str, float], requests: int, concurrency: int) -> float:
+        """Run the requests, picking commands by their weight in the mix, returning how long it took."""
+        self.timings = {command: Timings(command, concurrency) for command in mix}
+        self.failures = dict.fromkeys(mix, 0)
+        commands = random.choices(list(mix), weights=list(mix.values()), k=requests)  # noqa: S311
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def limited(command: str) -> None:
+            async with semaphore:
+                await self.run_command(command, random.choice(self.students))  # noqa: S311
+
+        start = perf_counter()
+        await asyncio.gather(*(limited(command) for command in commands))
+        elapsed = perf_counter() - start
+        for timings in self.timings.values():
+            timings.elapsed = elapsed
+        return elapsed
+
+    def report(self) -> list[dict[str, Any]]:
+        """Latency and calls made per command."""
+        rows = []
+        for command, timings in self.timings.items():
+            calls = len(timings.latencies) or 1
+            summary = timings.summary()
+            rows.append(
+                {
+                    "command": command,
+                    "calls": summary["calls"],
+                    "failed": self.failures[command],
+                    "p50_ms": summary["p50_ms"],
+                    "p95_ms": round(percentile(timings.latencies, 95) * 1000, 3),
+                    "p99_ms": summary["p99_ms"],
+                    "max_ms": summary["max_ms"],
+                    "db/call": round(self.queries[command] / calls, 2),
+                    "db_trips/call": round(self.round_trips[command] / calls, 2),
+                    "github/call": round(self.github.calls.by_label[command].total() / calls, 2),
+                    "discord/call": round(self.discord_http.calls.by_label[command].total() / calls, 2),
+                }
+            )
+        return rows
+
+
+async def main(args: argparse.Namespace) -> None:
+    """Set up a bot and run the load test against it."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_url = args.db_url or f"sqlite+aiosqlite:///{Path(tmp) / 'loadtest.db'}"
+        engine, sessionmaker = await make_database(db_url)
+        github = FakeGithub(latency=args.github_latency)
+        discord_http = FakeDiscordHTTP(latency=args.discord_latency)
+        bot = make_bot(engine, sessionmaker, github, discord_http)
+
+        try:
+            load_test = LoadTest(bot, github, discord_http)
+            await load_test.setup(args.studios, args.students)
+            log.info(f"Running {args.requests} requests from {args.students} students, {args.concurrency} at a time")
+            elapsed = await load_test.run(args.mix, args.requests, args.concurrency)
+        finally:
+            await engine.dispose()
+
+    rows = load_test.report()
+    sys.stdout.write("\n".join(format_table(rows)) + "\n")
+    sys.stdout.write(f"{args.requests} requests in {elapsed:.2f}s ({args.requests / elapsed:.1f}/s)\n")
+    sys.stdout.write(f"{load_test.queries.total()} db queries, {github.calls.total.total()} github calls\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulate a cohort of students using the bot")
+    parser.add_argument("--studios", type=int, default=4, help="number of studio guilds")
+    parser.add_argument("--students", type=int, default=300, help="number of students, across all studios")
+    parser.add_argument("--requests", type=int, default=3000, help="total commands to run")
+    parser.add_argument("--concurrency", type=int, default=100, help="commands in flight at once")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX), help="command weights")
+    parser.add_argument("--db-url", help="database to use, defaults to a temporary sqlite database")
+    parser.add_argument("--discord-latency", type=float, default=0.05, help="seconds per discord request")
+    parser.add_argument("--github-latency", type=float, default=0.2, help="seconds per (blocking) github call")
+    parser.add_argument("-v", "--verbose", action="store_true", help="show the bot's logs")
+
+    arguments = parser.parse_args()
+    logging.basicConfig(level=logging.INFO if arguments.verbose else logging.WARNING)
+    log.setLevel(logging.INFO)
+    if not arguments.verbose:
+        # failed commands (e.g. cooldowns) are counted in the report instead
+        logging.getLogger("discord.app_commands.tree").setLevel(logging.CRITICAL)
+    asyncio.run(main(arguments))
@@ -0,0 +1,27 @@
+"""Query budget assertions."""
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from csse3200bot.database.profiling import QueryStats, track_queries
+
+
+@contextmanager
+def assert_query_budget(max_queries: int, max_round_trips: int | None = None) -> Iterator[QueryStats]:
+    """Fail if the block runs more queries (or round trips) than budgeted.
+
+    Budgets should be tight, so an N+1 or a redundant refresh sneaking into a command fails its test.
+
+    Usage:
+        with assert_query_budget(2):
+            await run_command(...)
+    """
+    with track_queries() as stats:
+        yield stats
+
+    statements = "\n".join(f"  {statement}" for statement in stats.statements)
+    assert stats.queries <= max_queries, f"Ran {stats.queries} queries, budget is {max_queries}:\n{statements}"
+    if max_round_trips is not None:
+        assert stats.round_trips <= max_round_trips, (
+            f"Made {stats.round_trips} round trips, budget is {max_round_trips}:\n{statements}"
+        )
@@ -0,0 +1,79 @@
+"""Replay recorded github webhook deliveries against a running bot.
+
+Usage:
+    python -m tests.replay_webhooks --secret SECRET [--url http://localhost:8080/github/webhook]
+        [--delay 0] tests/data/webhooks/*.json
+
+Each file is a recorded delivery, `{"event": "issues", "payload": {...}}`, e.g. copied from the "Recent
+Deliveries" of a repo's webhook settings. Deliveries are signed with the secret like github would, so the
+bot's GITHUB_WEBHOOK_SECRET must match.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import aiohttp
+
+from csse3200bot.gh.webhooks import DELIVERY_HEADER, EVENT_HEADER, SIGNATURE_HEADER, sign
+
+log = logging.getLogger(__name__)
+
+DEFAULT_URL = "http://localhost:8080/github/webhook"
+
+
+@dataclass
+class Delivery:
+    """A recorded webhook delivery."""
+
+    event: str
+    payload: dict[str, Any]
+
+    @classmethod
+    def load(cls, path: Path) -> "Delivery":
+        """Load a recorded delivery from a file."""
+        data = json.loads(path.read_text())
+        return cls(data["event"], data["payload"])
+
+    def request(self, secret: str) -> tuple[bytes, dict[str, str]]:
+        """Body and headers github would send the delivery with."""
+        body = json.dumps(self.payload).encode()
+        headers = {
+            "Content-Type": "application/json",
+            EVENT_HEADER: self.event,
+            DELIVERY_HEADER: str(uuid.uuid4()),
+            SIGNATURE_HEADER: sign(secret, body),
+        }
+        return body, headers
+
+
+async def replay(url: str, secret: str, paths: list[Path], delay: float) -> int:
+    """Send the deliveries in order, returning how many were rejected."""
+    failures = 0
+    async with aiohttp.ClientSession() as session:
+        for path in paths:
+            body, headers = Delivery.load(path).request(secret)
+            async with session.post(url, data=body, headers=headers) as response:
+                log.info(f"{path.name}: {response.status}")
+                if response.status >= 300:
+                    failures += 1
+            await asyncio.sleep(delay)
+    return failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay recorded github webhook deliveries")
+    parser.add_argument("paths", type=Path, nargs="+", help="recorded deliveries, sent in the order given")
+    parser.add_argument("--url", default=DEFAULT_URL, help="the bot's webhook endpoint")
+    parser.add_argument("--secret", required=True, help="webhook secret the bot was configured with")
+    parser.add_argument("--delay", type=float, default=0, help="seconds between deliveries")
+
+    arguments = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    rejected = asyncio.run(replay(arguments.url, arguments.secret, arguments.paths, arguments.delay))
+    raise SystemExit(1 if rejected else 0)
@@ -0,0 +1,95 @@
+"""Repo activity digests, fetched incrementally from the fake github."""
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from csse3200bot.activity.cog import ActivityCog
+from csse3200bot.activity.service import set_activity_channel
+from csse3200bot.bot import CSSEBot
+from tests.fakes import FakeDiscordHTTP, FakeGithub, add_member, make_guild, run_command
+from tests.queries import assert_query_budget
+
+CHANNEL_MESSAGE = "POST /channels/{channel_id}/messages"
+
+
+@pytest.fixture
+def cog(runner: asyncio.Runner, bot: CSSEBot) -> ActivityCog:
+    """The activity cog, added to the bot."""
+    cog = ActivityCog(bot)
+    runner.run(bot.add_cog(cog))
+    return cog
+
+
+def test_refresh_only_fetches_new_activity(runner: asyncio.Runner, cog: ActivityCog, github: FakeGithub) -> None:
+    """Refreshes pick up from the cursors, and unchanged sources respond 304."""
+    now = datetime.now(UTC)
+    github.add_commit("repo", "Add player", now - timedelta(days=2))
+    github.add_commit("repo", "Ancient history", now - timedelta(days=30))
+    github.add_issue("repo", "Player is invisible", now - timedelta(days=1))
+    github.add_issue("repo", "Fix player", now - timedelta(hours=1), pull_request=True)
+
+    assert runner.run(cog.refresh_repo("repo"))
+    # the newest items are fetched again (since is inclusive), which sets the etags
+    assert not runner.run(cog.refresh_repo("repo"))
+
+    github.calls.total.clear()
+    assert not runner.run(cog.refresh_repo("repo"))
+    assert github.calls.total["not_modified"] == 2
+
+    github.add_commit("repo", "Add enemies", now)
+    assert runner.run(cog.refresh_repo("repo"))
+
+
+def test_digest_is_cached(runner: asyncio.Runner, bot: CSSEBot, cog: ActivityCog, github: FakeGithub) -> None:
+    """`/activity digest` fetches once, then is served from the cache until new activity is found."""
+    guild = make_guild(bot)
+    runner.run(bot.create_or_update_studio(str(guild.id), 1, 2025, "repo"))
+    member = add_member(guild, ["Student"])
+    github.add_commit("repo", "Add player", datetime.now(UTC))
+
+    async def run() -> None:
+        interaction = await run_command(bot, guild, member, "activity digest")
+        assert not interaction.command_failed
+        digest = await cog._digest_cache.get("repo")
+        assert digest is not None
+        assert digest.fields[0].name == "📝 Commits (1)"
+
+        github.calls.total.clear()
+        with assert_query_budget(0):
+            await run_command(bot, guild, member, "activity digest")
+        assert github.calls.total.total() == 0
+
+    runner.run(run())
+
+
+def test_digests_are_posted_once(
+    runner: asyncio.Runner, bot: CSSEBot, cog: ActivityCog, github: FakeGithub, discord_http: FakeDiscordHTTP
+) -> None:
+    """Channels are claimed before posting, so runs at once (e.g. in two processes) don't both post.
+
+    Channels that couldn't be posted to are due again.
+    """
+    guilds = [make_guild(bot, f"Studio {i}") for i in range(2)]
+    github.add_commit("repo", "Add player", datetime.now(UTC))
+
+    async def run() -> None:
+        for i, guild in enumerate(guilds):
+            await bot.create_or_update_studio(str(guild.id), 1, 2025, "repo")
+            async with bot.get_db() as session:
+                await set_activity_channel(session, str(guild.id), str(i + 1))
+        await cog._digest_cache.get("repo")
+
+        discord_http.latency = 0.01
+        discord_http.forbidden_channels.add(2)
+        await asyncio.gather(cog._post_digests(), cog._post_digests())
+        assert discord_http.calls.total[CHANNEL_MESSAGE] == 2
+
+        discord_http.forbidden_channels.clear()
+        await cog._post_digests()
+        assert discord_http.calls.total[CHANNEL_MESSAGE] == 3
+        await cog._post_digests()
+        assert discord_http.calls.total[CHANNEL_MESSAGE] == 3
+
+    runner.run(run())
@@ -0,0 +1,55 @@
+"""Studio updates, broadcast to every guild linked to the studio."""
+
+import asyncio
+
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+
+from csse3200bot.bot import CSSEBot
+from csse3200bot.studio.service import set_broadcast_channel
+from tests.fakes import FakeDiscordHTTP, add_member, make_guild, run_command
+
+CHANNEL_MESSAGE = "POST /channels/{channel_id}/messages"
+
+
+def test_sprint_updates_are_broadcast(
+    runner: asyncio.Runner,
+    bot: CSSEBot,
+    discord_http: FakeDiscordHTTP,
+    database: tuple[AsyncEngine, async_sessionmaker],
+) -> None:
+    """Setting sprint features posts to the broadcast channel of each guild in the studio that opted in."""
+    _, sessionmaker = database
+    guilds = [make_guild(bot, f"Studio {i}") for i in range(3)]
+    team_member = add_member(guilds[0], ["Student", "Team 1"])
+
+    async def run() -> None:
+        for guild in guilds:
+            await bot.create_or_update_studio(str(guild.id), 1, 2025, "repo")
+        studio = await bot.get_studio(guilds[0])
+        assert studio is not None
+        assert {link.guild_id for link in studio.guild_links} == {str(guild.id) for guild in guilds}
+
+        # the third guild hasn't opted in
+        async with sessionmaker() as session:
+            await set_broadcast_channel(session, str(guilds[0].id), "10")
+            await set_broadcast_channel(session, str(guilds[1].id), "11")
+
+        discord_http.calls.total.clear()
+        await run_command(bot, guilds[0], team_member, "team sprint_set", [("sprint_number", 1), ("features", "x")])
+        assert discord_http.calls.total[CHANNEL_MESSAGE] == 2
+
+        async with sessionmaker() as session:
+            await set_broadcast_channel(session, str(guilds[1].id), None)
+        await run_command(bot, guilds[0], team_member, "team sprint_set", [("sprint_number", 2), ("features", "y")])
+        assert discord_http.calls.total[CHANNEL_MESSAGE] == 3
+
+    runner.run(run())
+
+
+def test_broadcast_isolates_failures(runner: asyncio.Runner, bot: CSSEBot, discord_http: FakeDiscordHTTP) -> None:
+    """A guild that can't be messaged doesn't stop the others."""
+    discord_http.forbidden_channels.add(2)
+
+    sent = runner.run(bot.broadcast({"1": "1", "2": "2", "3": "3"}, content="Hello"))
+    assert sent == ["1", "3"]
+    assert discord_http.messages == ["Hello", "Hello"]
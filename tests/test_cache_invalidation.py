@@ -0,0 +1,142 @@
+"""Caches dropping keys that other bot processes changed, through the invalidation bus."""
+
+import asyncio
+import json
+
+import asyncpg
+import pytest
+
+from csse3200bot.bot import STUDIO_NAMESPACE, CSSEBot
+from csse3200bot.database import notify
+from csse3200bot.database.notify import INVALIDATION_CHANNEL
+from csse3200bot.gh.cog import USERS_NAMESPACE, GitHubCog
+from csse3200bot.gh.service import create_or_update_user_model
+from csse3200bot.studio.models import StudioModel
+from csse3200bot.teams.cog import SPRINT_FEATURES_NAMESPACE, TeamsCog
+from csse3200bot.teams.service import create_or_update_sprint_feature
+from tests.fakes import make_guild
+
+
+def _notify(bot: CSSEBot, namespace: str, key: str, origin: str = "other-process") -> None:
+    """Deliver a notification as though another process published it."""
+    payload = json.dumps({"origin": origin, "namespace": namespace, "key": key})
+    bot.invalidation_bus._on_notification(None, 0, INVALIDATION_CHANNEL, payload)
+
+
+def test_sprint_report_is_dropped_when_invalidated(runner: asyncio.Runner, bot: CSSEBot) -> None:
+    """A sprint's cached report is served until another process invalidates it, other sprints are kept."""
+    cog = bot.get_cog("team")
+    assert isinstance(cog, TeamsCog)
+    guild = make_guild(bot)
+    studio = runner.run(bot.create_or_update_studio(str(guild.id), 1, 2025, "repo"))
+
+    async def set_features(sprint_number: int, description: str) -> None:
+        # written straight to the database, as another process would
+        async with bot.get_db() as session:
+            await create_or_update_sprint_feature(session, studio.studio_id, "Team 1", sprint_number, description)
+
+    async def report(sprint_number: int) -> str | None:
+        pages = await cog._report_cache.get((studio.studio_id, sprint_number))
+        assert pages is not None
+        return pages[0].fields[0].value
+
+    runner.run(set_features(1, "old"))
+    runner.run(set_features(2, "old"))
+    assert runner.run(report(1)) == "old"
+    assert runner.run(report(2)) == "old"
+    runner.run(set_features(1, "new"))
+    runner.run(set_features(2, "new"))
+    assert runner.run(report(1)) == "old"
+
+    _notify(bot, SPRINT_FEATURES_NAMESPACE, f"{studio.studio_id}:1", origin=bot.invalidation_bus._origin)
+    assert runner.run(report(1)) == "old"
+
+    _notify(bot, SPRINT_FEATURES_NAMESPACE, f"{studio.studio_id}:1")
+    assert runner.run(report(1)) == "new"
+    assert runner.run(report(2)) == "old"
+
+
+def test_malformed_invalidations_are_ignored(runner: asyncio.Runner, bot: CSSEBot) -> None:
+    """Payloads that aren't an object with a namespace and key are logged and dropped."""
+    guild = make_guild(bot)
+    runner.run(bot.create_or_update_studio(str(guild.id), 1, 2025, "repo"))
+    assert str(guild.id) in bot._studio_cache
+
+    for payload in ["not json", "[]", '"studio.guild"', json.dumps({"namespace": STUDIO_NAMESPACE})]:
+        bot.invalidation_bus._on_notification(None, 0, INVALIDATION_CHANNEL, payload)
+    assert str(guild.id) in bot._studio_cache
+
+
+def test_studios_and_links_are_dropped_when_invalidated(runner: asyncio.Runner, bot: CSSEBot) -> None:
+    """The studio and github link caches drop the invalidated key, and everything once the bus reconnects."""
+    cog = bot.get_cog("gh")
+    assert isinstance(cog, GitHubCog)
+    guild = make_guild(bot)
+    other_guild = make_guild(bot, "Other studio")
+    runner.run(bot.create_or_update_studio(str(guild.id), 1, 2025, "repo"))
+    runner.run(bot.create_or_update_studio(str(other_guild.id), 2, 2025, "other"))
+
+    async def link(user_id: str, gh_id: str) -> None:
+        async with bot.get_db() as session:
+            await create_or_update_user_model(session, user_id, gh_id)
+
+    runner.run(link("1", "10"))
+    runner.run(cog._user_cache.get("1"))
+    runner.run(link("1", "11"))
+    runner.run(cog._user_cache.get("2"))
+
+    _notify(bot, STUDIO_NAMESPACE, str(guild.id))
+    assert str(guild.id) not in bot._studio_cache
+    assert str(other_guild.id) in bot._studio_cache
+
+    _notify(bot, USERS_NAMESPACE, "1")
+    assert "1" not in cog._user_cache
+    assert "2" in cog._user_cache
+    user = runner.run(cog._user_cache.get("1"))
+    assert user is not None
+    assert user.gh_id == "11"
+
+    bot.invalidation_bus._reset_all()
+    assert str(other_guild.id) not in bot._studio_cache
+    assert not cog._user_cache.cached_keys()
+
+
+def test_warming_keeps_invalidations(runner: asyncio.Runner, bot: CSSEBot) -> None:
+    """Warming only refetches cached studios, and drops a studio invalidated while it was being fetched."""
+    guild = make_guild(bot)
+    uncached_guild = make_guild(bot, "Uncached studio")
+    runner.run(bot.create_or_update_studio(str(guild.id), 1, 2025, "repo"))
+    runner.run(bot.create_or_update_studio(str(uncached_guild.id), 2, 2025, "other"))
+    bot._studio_cache.remove(str(uncached_guild.id))
+    fetch = bot._studio_cache._fetch_callback
+    fetched: list[str] = []
+
+    async def invalidating_fetch(guild_id: str) -> StudioModel | None:
+        fetched.append(guild_id)
+        studio = await fetch(guild_id)
+        _notify(bot, STUDIO_NAMESPACE, guild_id)
+        return studio
+
+    bot._studio_cache._fetch_callback = invalidating_fetch
+    runner.run(bot._warm_studio_cache())
+    assert fetched == [str(guild.id)]
+    assert str(guild.id) not in bot._studio_cache
+    assert str(uncached_guild.id) not in bot._studio_cache
+
+
+def test_reconnect_retries_any_error(runner: asyncio.Runner, bot: CSSEBot, monkeypatch: pytest.MonkeyPatch) -> None:
+    """The bus keeps trying to reconnect whatever the error, then resets the caches."""
+    monkeypatch.setattr(notify, "RECONNECT_DELAY", 0)
+    bus = bot.invalidation_bus
+    errors: list[Exception] = [asyncpg.InterfaceError("connection is closed"), TimeoutError(), OSError()]
+    resets: list[str] = []
+
+    async def listen() -> None:
+        if errors:
+            raise errors.pop(0)
+
+    monkeypatch.setattr(bus, "_listen", listen)
+    bus.subscribe("test", lambda _: None, lambda: resets.append("reset"))
+    runner.run(bus._reconnect())
+    assert not errors
+    assert resets == ["reset"]
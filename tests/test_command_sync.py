@@ -0,0 +1,82 @@
+"""Application commands are only synced when they've changed since last synced."""
+
+import asyncio
+from unittest import mock
+
+import discord
+
+from csse3200bot.bot import CSSEBot
+from csse3200bot.enums import CommandSyncMode
+from tests.fakes import FakeDiscordHTTP
+
+CLEAR_GLOBAL = "PUT /applications/{application_id}/commands"
+
+
+def test_sync_skips_unchanged_commands(runner: asyncio.Runner, bot: CSSEBot) -> None:
+    """The first sync syncs everything, then only changes are synced, and report what changed."""
+    sync = mock.AsyncMock(return_value=[])
+
+    async def run() -> None:
+        with mock.patch.object(bot.tree, "sync", sync):
+            diffs = await bot.sync_commands()
+            assert list(diffs) == ["global"]
+            assert {"gh", "studio", "team"} <= set(diffs["global"]["added"])
+            assert sync.await_count == 1
+
+            assert await bot.sync_commands() == {}
+            assert sync.await_count == 1
+
+            await bot.remove_cog("team")
+            diffs = await bot.sync_commands()
+            assert diffs["global"] == {"added": [], "removed": ["team"], "changed": []}
+            assert sync.await_count == 2
+
+            assert await bot.sync_commands(force=True) == {"global": {"added": [], "removed": [], "changed": []}}
+            assert sync.await_count == 3
+
+    runner.run(run())
+
+
+def test_sync_to_guilds(runner: asyncio.Runner, bot: CSSEBot, discord_http: FakeDiscordHTTP) -> None:
+    """In guilds mode the global commands are copied to and synced with each configured guild."""
+    guilds = [discord.Object(id=1), discord.Object(id=2)]
+    bot._command_sync = CommandSyncMode.guilds
+    bot._guilds = list(guilds)
+    sync = mock.AsyncMock(return_value=[])
+
+    async def run() -> None:
+        with mock.patch.object(bot.tree, "sync", sync):
+            diffs = await bot.sync_commands()
+            assert list(diffs) == ["1", "2", "global"]
+            assert [call.kwargs["guild"] for call in sync.await_args_list] == guilds
+
+            assert await bot.sync_commands() == {}
+            assert sync.await_count == len(guilds)
+            assert discord_http.calls.total[CLEAR_GLOBAL] == 1
+
+    runner.run(run())
+
+
+def test_switching_to_guilds_clears_global_commands(
+    runner: asyncio.Runner, bot: CSSEBot, discord_http: FakeDiscordHTTP
+) -> None:
+    """Commands synced globally are cleared once switched to guilds mode, so they aren't listed twice."""
+    sync = mock.AsyncMock(return_value=[])
+
+    async def run() -> None:
+        with mock.patch.object(bot.tree, "sync", sync):
+            await bot.sync_commands()
+            bot._command_sync = CommandSyncMode.guilds
+            bot._guilds = [discord.Object(id=1)]
+
+            diffs = await bot.sync_commands()
+            assert {"gh", "studio", "team"} <= set(diffs["global"]["removed"])
+            assert [call.kwargs["guild"] for call in sync.await_args_list] == [None, bot._guilds[0]]
+            assert discord_http.calls.total[CLEAR_GLOBAL] == 1
+            # the global commands are still what's copied to the guilds
+            assert bot.tree.get_command("team") is not None
+
+            assert await bot.sync_commands() == {}
+            assert discord_http.calls.total[CLEAR_GLOBAL] == 1
+
+    runner.run(run())
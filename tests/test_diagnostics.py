@@ -0,0 +1,49 @@
+"""Loop stall detection and sampling profiles."""
+
+import asyncio
+import time
+from pathlib import Path
+
+import pytest
+
+from csse3200bot.utils import LoopStallDetector, ProfileInProgressError, profile
+
+
+def _blocking_call() -> None:
+    time.sleep(0.2)
+
+
+def test_stall_detector_logs_blocking_stack(runner: asyncio.Runner, caplog: pytest.LogCaptureFixture) -> None:
+    """The stack logged is of the code blocking the loop."""
+
+    async def run() -> LoopStallDetector:
+        detector = LoopStallDetector(50)
+        detector.start()
+        await asyncio.sleep(0.05)
+        _blocking_call()
+        await asyncio.sleep(0.05)
+        await detector.stop()
+        return detector
+
+    detector = runner.run(run())
+    assert detector.stalls == 1
+    assert detector.longest_stall >= 0.1
+    assert any("_blocking_call" in record.getMessage() for record in caplog.records)
+
+
+def test_profile_writes_folded_stacks(runner: asyncio.Runner, tmp_path: Path) -> None:
+    """Stacks are written as `frame;frame count`, and only one profile runs at a time."""
+
+    async def run() -> Path:
+        task = asyncio.create_task(profile(0.2, tmp_path))
+        await asyncio.sleep(0.05)
+        with pytest.raises(ProfileInProgressError):
+            await profile(0.1, tmp_path)
+        _blocking_call()
+        return await task
+
+    path = runner.run(run())
+    lines = path.read_text().splitlines()
+    _, count = lines[0].rsplit(" ", 1)
+    assert int(count) > 0
+    assert any(line.startswith("MainThread;") and "_blocking_call" in line for line in lines)
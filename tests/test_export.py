@@ -0,0 +1,157 @@
+"""Exports of studio data, streamed from the database in chunks."""
+
+import asyncio
+import csv
+import io
+import json
+from pathlib import Path
+from unittest import mock
+
+import discord
+import pytest
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+
+from csse3200bot import export
+from csse3200bot.bot import CSSEBot
+from csse3200bot.enums import ExportFormat, ExportTable
+from csse3200bot.export import export_path, stream_export, write_export
+from csse3200bot.gh.service import create_or_update_user_model
+from csse3200bot.teams.service import create_or_update_sprint_feature
+from tests.fakes import add_member, make_guild, run_command
+
+
+@pytest.fixture
+def studios(runner: asyncio.Runner, bot: CSSEBot, database: tuple[AsyncEngine, async_sessionmaker]) -> discord.Guild:
+    """Two studios in 2025 and one in 2024 with sprint features, returning the guild of studio 1 in 2025."""
+    _, sessionmaker = database
+    guild = make_guild(bot)
+
+    async def setup() -> None:
+        for guild_id, number, year in ((str(guild.id), 1, 2025), ("2", 2, 2025), ("3", 1, 2024)):
+            studio = await bot.create_or_update_studio(guild_id, number, year, f"repo-{number}-{year}")
+            async with sessionmaker() as session:
+                for team in range(1, 4):
+                    for sprint in (1, 2):
+                        await create_or_update_sprint_feature(
+                            session, studio.studio_id, f"Team {team}", sprint, f"Feature {team}.{sprint}"
+                        )
+
+    runner.run(setup())
+    return guild
+
+
+async def _export(session_factory: async_sessionmaker, table: ExportTable, export_format: ExportFormat) -> str:
+    file = io.StringIO()
+    async with session_factory() as session:
+        await write_export(stream_export(session, table, studio_year=2025), file, table, export_format)
+    return file.getvalue()
+
+
+@pytest.mark.usefixtures("studios")
+def test_export_streams_in_chunks(
+    runner: asyncio.Runner, database: tuple[AsyncEngine, async_sessionmaker], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Rows are fetched in chunks of the chunk size, and filtered by year."""
+    _, sessionmaker = database
+    monkeypatch.setattr(export, "EXPORT_CHUNK_SIZE", 4)
+
+    async def run() -> list[int]:
+        async with sessionmaker() as session:
+            return [len(chunk) async for chunk in stream_export(session, ExportTable.sprints, studio_year=2025)]
+
+    assert runner.run(run()) == [4, 4, 4]
+
+
+def test_export_formats(
+    runner: asyncio.Runner, studios: discord.Guild, database: tuple[AsyncEngine, async_sessionmaker]
+) -> None:
+    """CSV and JSON exports have the same rows, and empty exports are still valid."""
+    _, sessionmaker = database
+    rows = list(csv.DictReader(io.StringIO(runner.run(_export(sessionmaker, ExportTable.sprints, ExportFormat.csv)))))
+    assert len(rows) == 12
+    assert rows[0] == {
+        "studio_year": "2025",
+        "studio_number": "1",
+        "team_number": "Team 1",
+        "sprint_number": "1",
+        "description": "Feature 1.1",
+    }
+
+    data = json.loads(runner.run(_export(sessionmaker, ExportTable.sprints, ExportFormat.json)))
+    assert [{key: str(value) for key, value in row.items()} for row in data] == rows
+
+    studio_rows = json.loads(runner.run(_export(sessionmaker, ExportTable.studios, ExportFormat.json)))
+    assert [(row["studio_number"], row["guild_id"]) for row in studio_rows] == [(1, str(studios.id)), (2, "2")]
+
+    assert json.loads(runner.run(_export(sessionmaker, ExportTable.users, ExportFormat.json))) == []
+    assert runner.run(_export(sessionmaker, ExportTable.users, ExportFormat.csv)).splitlines() == [
+        "discord_user_id,gh_id,updated_at"
+    ]
+
+
+def test_studio_export_command(
+    runner: asyncio.Runner,
+    bot: CSSEBot,
+    studios: discord.Guild,
+    database: tuple[AsyncEngine, async_sessionmaker],
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Staff export their own studio, users are limited to the guild's members, and the file is removed once sent."""
+    _, sessionmaker = database
+    monkeypatch.chdir(tmp_path)
+    staff = add_member(studios) | {"permissions": str(discord.Permissions(manage_guild=True).value)}
+    written: list[str] = []
+
+    async def capture(*args: object, **kwargs: object) -> int:
+        rows = await export.export_to_file(*args, **kwargs)  # type: ignore[arg-type]
+        written.append(await asyncio.to_thread(Path(str(args[1])).read_text))
+        return rows
+
+    monkeypatch.setattr("csse3200bot.studio.cog.export_to_file", capture)
+
+    async def run() -> None:
+        async with sessionmaker() as session:
+            await create_or_update_user_model(session, staff["user"]["id"], "1")
+            await create_or_update_user_model(session, "999", "2")  # not in the guild
+
+        await run_command(bot, studios, staff, "studio export", [("table", "SPRINTS")])
+        await run_command(bot, studios, staff, "studio export", [("table", "USERS"), ("format", "JSON")])
+
+    runner.run(run())
+    sprints, users = written
+    assert len(list(csv.DictReader(io.StringIO(sprints)))) == 6
+    assert [row["discord_user_id"] for row in json.loads(users)] == [staff["user"]["id"]]
+    assert list((tmp_path / "exports").iterdir()) == []
+
+
+def test_too_big_studio_export(
+    runner: asyncio.Runner, bot: CSSEBot, studios: discord.Guild, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Exports too big to upload are removed, and only users exports need the guild's members."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(discord.Guild, "filesize_limit", 0)
+    staff = add_member(studios) | {"permissions": str(discord.Permissions(manage_guild=True).value)}
+    responses: list[str] = []
+
+    async def capture(_: discord.Interaction, content: str, **__: object) -> None:
+        responses.append(content)
+
+    monkeypatch.setattr("csse3200bot.studio.cog.respond", capture)
+    with mock.patch.object(bot, "get_guild_members", wraps=bot.get_guild_members) as get_guild_members:
+        runner.run(run_command(bot, studios, staff, "studio export", [("table", "SPRINTS")]))
+        get_guild_members.assert_not_called()
+        runner.run(run_command(bot, studios, staff, "studio export", [("table", "USERS")]))
+        get_guild_members.assert_called_once()
+
+    assert len(responses) == 2
+    assert all("too big" in response for response in responses)
+    assert not any(str(tmp_path) in response for response in responses)
+    assert list((tmp_path / "exports").iterdir()) == []
+
+
+def test_export_paths_are_unique() -> None:
+    """Exports of the same table made at once, by any guild, get their own file."""
+    paths = {export_path(ExportTable.sprints, ExportFormat.csv, guild_id) for guild_id in ("1", "1", "2")}
+    assert len(paths) == 3
+    assert all(path.suffix == ".csv" for path in paths)
@@ -0,0 +1,68 @@
+"""Loading the enabled extensions, and reloading them."""
+
+import asyncio
+from unittest import mock
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+
+from csse3200bot.enums import BotExtension, CommandSyncMode
+from tests.fakes import FakeDiscordHTTP, FakeGithub, make_bot
+
+
+def test_only_enabled_extensions_are_loaded(
+    runner: asyncio.Runner,
+    database: tuple[AsyncEngine, async_sessionmaker],
+    github: FakeGithub,
+    discord_http: FakeDiscordHTTP,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Extensions are loaded together, one failing to load doesn't stop the others."""
+    modules = {extension: extension.module for extension in BotExtension}
+    modules[BotExtension.gh] = "csse3200bot.missing"
+    monkeypatch.setattr(BotExtension, "module", property(lambda extension: modules[extension]))
+    bot = make_bot(*database, github, discord_http, [BotExtension.activity, BotExtension.gh, BotExtension.teams])
+
+    assert runner.run(bot.load_enabled_extensions()) == [BotExtension.gh]
+    assert set(bot.cogs) == {"activity", "team"}
+    assert {command.name for command in bot.tree.get_commands()} == {"activity", "team"}
+
+
+def test_commands_arent_synced_if_an_extension_fails(
+    runner: asyncio.Runner,
+    database: tuple[AsyncEngine, async_sessionmaker],
+    github: FakeGithub,
+    discord_http: FakeDiscordHTTP,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Syncing at startup without a failed extension's commands would delete them from discord."""
+    monkeypatch.setattr(BotExtension, "module", property(lambda _: "csse3200bot.missing"))
+    bot = make_bot(*database, github, discord_http, [BotExtension.gh])
+    bot._command_sync = CommandSyncMode.global_
+    sync = mock.AsyncMock(return_value={})
+
+    async def run() -> None:
+        with mock.patch.object(bot, "sync_commands", sync):
+            await bot.setup_hook()
+        await bot.scheduler.shutdown()
+
+    runner.run(run())
+    sync.assert_not_awaited()
+
+
+def test_reload_extension(
+    runner: asyncio.Runner,
+    database: tuple[AsyncEngine, async_sessionmaker],
+    github: FakeGithub,
+    discord_http: FakeDiscordHTTP,
+) -> None:
+    """Reloading replaces the cog, with its commands and jobs added back once."""
+    bot = make_bot(*database, github, discord_http, [BotExtension.teams])
+    runner.run(bot.load_enabled_extensions())
+    cog = bot.get_cog("team")
+    jobs = set(bot.scheduler.stats())
+
+    runner.run(bot.reload_extension(BotExtension.teams.module))
+    assert bot.get_cog("team") is not cog
+    assert bot.tree.get_command("team") is not None
+    assert set(bot.scheduler.stats()) == jobs
@@ -0,0 +1,67 @@
+"""Linking github accounts, which are shared by every studio."""
+
+import asyncio
+
+import pytest
+
+from csse3200bot.bot import CSSEBot
+from csse3200bot.gh.cog import GitHubCog
+from csse3200bot.gh.service import create_or_update_user_model, get_user_model_by_gh
+from tests.fakes import FakeDiscordHTTP, FakeGithub, FakeNamedUser, add_member, make_guild, next_snowflake, run_command
+
+
+def _holder(runner: asyncio.Runner, bot: CSSEBot, github: FakeGithub, holder_id: int) -> FakeNamedUser:
+    """Link a github user to the holder."""
+    gh_user = github.add_user("student")
+    cog = bot.get_cog("gh")
+    assert isinstance(cog, GitHubCog)
+    runner.run(cog._load_members())
+
+    async def link() -> None:
+        async with bot.get_db() as session:
+            await create_or_update_user_model(session, str(holder_id), str(gh_user.id))
+
+    runner.run(link())
+    return gh_user
+
+
+def _linked_to(runner: asyncio.Runner, bot: CSSEBot, gh_user: FakeNamedUser) -> str | None:
+    async def get() -> str | None:
+        async with bot.get_db() as session:
+            model = await get_user_model_by_gh(session, str(gh_user.id))
+            return model.discord_user_id if model is not None else None
+
+    return runner.run(get())
+
+
+def test_holder_in_another_guild_keeps_link(
+    runner: asyncio.Runner, bot: CSSEBot, github: FakeGithub, discord_http: FakeDiscordHTTP
+) -> None:
+    """A holder who isn't in the requester's guild, but is in another of the bot's guilds, keeps the link."""
+    guild = make_guild(bot)
+    other_guild = make_guild(bot, "Other studio")
+    holder = add_member(other_guild, ["Student"])
+    discord_http.missing_members.add((guild.id, int(holder["user"]["id"])))
+    requester = add_member(guild, ["Student"])
+    gh_user = _holder(runner, bot, github, int(holder["user"]["id"]))
+
+    runner.run(run_command(bot, guild, requester, "gh set", [("gh_username", gh_user.login)]))
+    assert _linked_to(runner, bot, gh_user) == holder["user"]["id"]
+
+
+@pytest.mark.parametrize("deleted", [True, False])
+def test_holder_who_left_is_unlinked(
+    runner: asyncio.Runner, bot: CSSEBot, github: FakeGithub, discord_http: FakeDiscordHTTP, *, deleted: bool
+) -> None:
+    """A holder who deleted their account or left every guild is unlinked."""
+    guild = make_guild(bot)
+    requester = add_member(guild, ["Student"])
+    holder_id = next_snowflake()
+    if deleted:
+        discord_http.missing_users.add(holder_id)
+    else:
+        discord_http.missing_members.update((guild.id, holder_id) for guild in bot.guilds)
+    gh_user = _holder(runner, bot, github, holder_id)
+
+    runner.run(run_command(bot, guild, requester, "gh set", [("gh_username", gh_user.login)]))
+    assert _linked_to(runner, bot, gh_user) is None
@@ -0,0 +1,49 @@
+"""Welcoming members in batches."""
+
+import asyncio
+
+from csse3200bot.bot import CSSEBot
+from csse3200bot.greetings.cog import GreetingsCog
+from csse3200bot.greetings.utils import MESSAGE_LIMIT, render_welcomes
+from tests.fakes import FakeDiscordHTTP, add_member, add_system_channel, make_guild
+
+
+def test_render_welcomes_fits_message_limit() -> None:
+    """Mentions are split over as few messages as fit."""
+    mentions = [f"<@{100000000000000000 + i}>" for i in range(200)]
+    messages = list(render_welcomes("Welcome {mentions}!", mentions))
+    assert len(messages) == 3
+    assert all(len(message) <= MESSAGE_LIMIT for message in messages)
+    assert all(message.startswith("Welcome <@") and message.endswith(">!") for message in messages)
+    assert sum(message.count("<@") for message in messages) == len(mentions)
+    assert list(render_welcomes("Welcome {mentions}.", ["<@1>"])) == ["Welcome <@1>."]
+
+
+def test_joins_are_welcomed_together(runner: asyncio.Runner, bot: CSSEBot, discord_http: FakeDiscordHTTP) -> None:
+    """A burst of joins is welcomed once after the delay, or as soon as the batch is full."""
+    cog = GreetingsCog(bot, welcome_delay=0.05, welcome_batch_size=10)
+    runner.run(bot.add_cog(cog))
+    guild = make_guild(bot)
+    add_system_channel(guild)
+
+    async def join(count: int) -> None:
+        for _ in range(count):
+            add_member(guild)
+            member = guild.get_member(max(guild._members))
+            assert member is not None
+            await cog.on_member_join(member)
+
+    async def run() -> None:
+        await join(3)
+        assert discord_http.messages == []
+        await asyncio.sleep(0.1)
+        assert len(discord_http.messages) == 1
+        assert discord_http.messages[0].count("<@") == 3
+
+        await join(12)  # the first 10 are sent straight away, the rest after the delay
+        assert len(discord_http.messages) == 2
+        await cog.cog_unload()
+        assert len(discord_http.messages) == 3
+        assert discord_http.messages[2].count("<@") == 2
+
+    runner.run(run())
@@ -0,0 +1,53 @@
+"""Deferring slow commands before discord's deadline, and responding either way."""
+
+import asyncio
+
+import discord
+
+from csse3200bot.bot import CSSEBot
+from csse3200bot.interactions import auto_defer, respond
+from tests.fakes import FakeDiscordHTTP, add_member, make_guild, make_interaction
+
+DEFER_AFTER = 0.02
+FOLLOWUP = "POST /webhooks/{webhook_id}/{webhook_token}"
+
+
+class _Commands:
+    """Stand-in for a cog, as auto_defer wraps methods."""
+
+    def __init__(self, delay: float) -> None:
+        self.delay = delay
+
+    @auto_defer(after=DEFER_AFTER, ephemeral=True)
+    async def command(self, interaction: discord.Interaction) -> None:
+        await asyncio.sleep(self.delay)
+        await respond(interaction, "Done")
+
+
+def _run(runner: asyncio.Runner, bot: CSSEBot, delay: float) -> discord.Interaction:
+    guild = make_guild(bot)
+    interaction = make_interaction(bot, guild, add_member(guild))
+    runner.run(_Commands(delay).command(interaction))
+    return interaction
+
+
+def test_fast_command_is_not_deferred(runner: asyncio.Runner, bot: CSSEBot, discord_http: FakeDiscordHTTP) -> None:
+    """Commands responding in time respond directly."""
+    interaction = _run(runner, bot, 0)
+    assert interaction.response.type is discord.InteractionResponseType.channel_message
+    assert discord_http.calls.total[FOLLOWUP] == 0
+
+
+def test_slow_command_is_deferred(runner: asyncio.Runner, bot: CSSEBot, discord_http: FakeDiscordHTTP) -> None:
+    """Commands that haven't responded in time are deferred, then respond with a followup."""
+    interaction = _run(runner, bot, DEFER_AFTER * 3)
+    assert interaction.response.type is discord.InteractionResponseType.deferred_channel_message
+    assert discord_http.calls.total[FOLLOWUP] == 1
+
+
+def test_respond_waits_for_deferral(runner: asyncio.Runner, bot: CSSEBot, discord_http: FakeDiscordHTTP) -> None:
+    """Responding while the deferral is still being sent waits for it, rather than responding twice."""
+    discord_http.latency = DEFER_AFTER * 2
+    interaction = _run(runner, bot, DEFER_AFTER * 1.5)
+    assert interaction.response.type is discord.InteractionResponseType.deferred_channel_message
+    assert discord_http.calls.total[FOLLOWUP] == 1
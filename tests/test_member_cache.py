@@ -0,0 +1,64 @@
+"""Looking up members without relying on them all being cached."""
+
+import asyncio
+
+import discord
+import pytest
+
+from csse3200bot.bot import CSSEBot
+from csse3200bot.enums import MemberCachePolicy
+from tests.fakes import FakeDiscordHTTP, add_member, make_guild, next_snowflake
+
+
+@pytest.mark.parametrize(
+    ("policy", "flags"),
+    [
+        (MemberCachePolicy.all, discord.MemberCacheFlags.all()),
+        (MemberCachePolicy.joined, discord.MemberCacheFlags(voice=False, joined=True)),
+        (MemberCachePolicy.none, discord.MemberCacheFlags.none()),
+    ],
+)
+def test_member_cache_flags(policy: MemberCachePolicy, flags: discord.MemberCacheFlags) -> None:
+    """Each policy keeps the members it says it does."""
+    assert policy.get_flags() == flags
+
+
+def test_find_member(runner: asyncio.Runner, bot: CSSEBot, discord_http: FakeDiscordHTTP) -> None:
+    """Cached members are found without a request, others are fetched."""
+    guild = make_guild(bot)
+    member_id = int(add_member(guild)["user"]["id"])
+    route = "GET /guilds/{guild_id}/members/{member_id}"
+
+    member = runner.run(bot.find_member(guild, member_id))
+    assert member is not None
+    assert member.id == member_id
+    assert discord_http.calls.total[route] == 0
+
+    uncached_id = next_snowflake()
+    member = runner.run(bot.find_member(guild, uncached_id))
+    assert member is not None
+    assert member.id == uncached_id
+    assert discord_http.calls.total[route] == 1
+
+
+@pytest.mark.parametrize("policy", list(MemberCachePolicy))
+def test_get_guild_members(
+    runner: asyncio.Runner, bot: CSSEBot, monkeypatch: pytest.MonkeyPatch, policy: MemberCachePolicy
+) -> None:
+    """Chunked guilds are served from the cache, others are chunked, keeping the members only if the policy does."""
+    bot._connection.member_cache_flags = policy.get_flags()
+    guild = make_guild(bot)
+    add_member(guild)
+    chunks: list[bool] = []
+
+    async def chunk(_: discord.Guild, *, cache: bool = True) -> list[discord.Member]:
+        chunks.append(cache)
+        return []
+
+    monkeypatch.setattr(discord.Guild, "chunk", chunk)
+    assert list(runner.run(bot.get_guild_members(guild))) == list(guild.members)
+    assert chunks == []
+
+    guild._member_count = 10
+    runner.run(bot.get_guild_members(guild))
+    assert chunks == [policy is not MemberCachePolicy.none]
@@ -0,0 +1,97 @@
+"""Query budgets of the commands, run against sqlite (or TEST_DB_URL).
+
+If a change needs more queries, make sure they are needed before bumping the budget.
+"""
+
+import asyncio
+
+import discord
+
+from csse3200bot.bot import CSSEBot
+from tests.fakes import FakeGithub, add_member, make_guild, run_command
+from tests.queries import assert_query_budget
+
+
+def _setup_studio(runner: asyncio.Runner, bot: CSSEBot) -> discord.Guild:
+    guild = make_guild(bot)
+    runner.run(bot.create_or_update_studio(str(guild.id), 1, 2025, "repo"))
+    return guild
+
+
+def test_create_or_update_studio(runner: asyncio.Runner, bot: CSSEBot) -> None:
+    """Creating, joining and updating studios."""
+
+    async def run() -> None:
+        # lookups, the new studio and its refresh, then relinking the guild and reloading the studio's links
+        with assert_query_budget(8):
+            await bot.create_or_update_studio("1", 1, 2025, "repo")
+        with assert_query_budget(5):
+            await bot.create_or_update_studio("2", 1, 2025, "repo")
+        with assert_query_budget(4):
+            await bot.create_or_update_studio("1", 1, 2025, "new-repo")
+
+    runner.run(run())
+
+
+def test_gh_commands(runner: asyncio.Runner, bot: CSSEBot, github: FakeGithub) -> None:
+    """`/gh set` and `/gh get`."""
+    guild = _setup_studio(runner, bot)
+    member = add_member(guild, ["Student"])
+    login = github.add_user("student").login
+    runner.run(bot.get_cog("gh")._load_members())  # type: ignore[union-attr]
+
+    async def run() -> None:
+        with assert_query_budget(4) as stats:
+            interaction = await run_command(bot, guild, member, "gh set", [("gh_username", login)])
+        assert not interaction.command_failed
+        # each interaction's queries are kept with it
+        assert interaction.extras["query_stats"].queries == stats.queries > 0
+
+        # the user was cached by set
+        with assert_query_budget(0):
+            await run_command(bot, guild, member, "gh get")
+
+    runner.run(run())
+
+
+def test_team_commands(runner: asyncio.Runner, bot: CSSEBot) -> None:
+    """`/team assign`, `/team sprint_set` and `/team sprint_get`."""
+    guild = _setup_studio(runner, bot)
+    student = add_member(guild, ["Student"])
+    team_member = add_member(guild, ["Student", "Team 1"])
+
+    async def run() -> None:
+        # roles only
+        with assert_query_budget(0):
+            await run_command(bot, guild, student, "team assign", [("team", "Team 2")])
+
+        with assert_query_budget(4):
+            await run_command(bot, guild, team_member, "team sprint_set", [("sprint_number", 1), ("features", "x")])
+
+        # one query for the whole report, then cached until the next sprint_set
+        with assert_query_budget(1):
+            await run_command(bot, guild, student, "team sprint_get", [("sprint_number", 1)])
+        with assert_query_budget(0):
+            await run_command(bot, guild, student, "team sprint_get", [("sprint_number", 1)])
+
+    runner.run(run())
+
+
+def test_gh_list(runner: asyncio.Runner, bot: CSSEBot, github: FakeGithub) -> None:
+    """`/gh list` resolves every linked account with one query, and org members without calling github."""
+    guild = _setup_studio(runner, bot)
+    students = [add_member(guild, ["Student"]) for _ in range(30)]
+    staff = add_member(guild, ["Tutor"]) | {"permissions": str(discord.Permissions(manage_guild=True).value)}
+    logins = [github.add_user(f"student{i}").login for i in range(20)]
+    runner.run(bot.get_cog("gh")._load_members())  # type: ignore[union-attr]
+    for student, login in zip(students, logins, strict=False):
+        runner.run(run_command(bot, guild, student, "gh set", [("gh_username", login)]))
+
+    async def run() -> None:
+        with assert_query_budget(1):
+            interaction = await run_command(bot, guild, staff, "gh list")
+        assert not interaction.command_failed
+
+    github.calls.total.clear()
+    runner.run(run())
+    assert github.calls.total["get_user_by_id"] == 0
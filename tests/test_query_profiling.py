@@ -0,0 +1,31 @@
+"""Counting and timing queries."""
+
+import asyncio
+import gc
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+
+from csse3200bot.database import profiling
+from csse3200bot.database.profiling import track_queries
+
+
+def test_failed_queries_arent_kept(runner: asyncio.Runner, database: tuple[AsyncEngine, async_sessionmaker]) -> None:
+    """Statements that raise don't leave their start time behind on the (long lived) pooled connection."""
+    _, sessionmaker = database
+
+    async def run() -> None:
+        with track_queries() as stats:
+            for _ in range(3):
+                async with sessionmaker() as session:
+                    with pytest.raises(OperationalError):
+                        await session.execute(text("SELECT * FROM missing_table"))
+            async with sessionmaker() as session:
+                await session.execute(text("SELECT 1"))
+        assert stats.queries == 1
+
+    runner.run(run())
+    gc.collect()
+    assert not profiling._start_times
@@ -0,0 +1,90 @@
+"""Command rate limits, in memory and shared through the database."""
+
+import asyncio
+
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+
+from csse3200bot.bot import CSSEBot
+from csse3200bot.database.ratelimit import DatabaseRateLimiter
+from csse3200bot.utils import Budget, MemoryRateLimiter, RateLimiter
+from tests.fakes import add_member, make_guild, run_command
+
+
+class Clock:
+    """A clock that only moves when told to."""
+
+    now: float
+
+    def __init__(self) -> None:
+        """Starts at an arbitrary time."""
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        """The current time."""
+        return self.now
+
+
+async def _check_token_bucket(limiter: RateLimiter, clock: Clock) -> None:
+    budget = Budget(3, 30.0)  # 3 uses every 30 seconds
+    assert [await limiter.acquire("key", budget) for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert await limiter.acquire("key", budget) == 10.0
+    assert await limiter.acquire("other", budget) == 0.0
+
+    clock.now += 10  # one use refilled
+    assert await limiter.acquire("key", budget) == 0.0
+    assert await limiter.acquire("key", budget) == 10.0
+
+    clock.now += 60  # full again, so forgotten
+    assert await limiter.purge_expired() == 2
+    assert [await limiter.acquire("key", budget) for _ in range(4)] == [0.0, 0.0, 0.0, 10.0]
+
+
+async def _check_inexact_interval(limiter: RateLimiter, clock: Clock) -> None:
+    clock.now = 1_760_000_000.0  # a realistic unix time, as the rounding error grows with it
+    for rate in (3, 5, 10):
+        # `per / rate` isn't exact in binary, but rounding shouldn't cost a use
+        budget = Budget(rate, 1.0)
+        assert [await limiter.acquire(f"key{rate}", budget) for _ in range(rate)] == [0.0] * rate
+        assert await limiter.acquire(f"key{rate}", budget) > 0.0
+
+
+def test_memory_rate_limiter(runner: asyncio.Runner) -> None:
+    """Uses are refilled one every `per / rate` seconds, up to `rate` saved up."""
+    clock = Clock()
+    runner.run(_check_token_bucket(MemoryRateLimiter(clock), clock))
+    runner.run(_check_inexact_interval(MemoryRateLimiter(clock), clock))
+
+
+def test_database_rate_limiter(runner: asyncio.Runner, database: tuple[AsyncEngine, async_sessionmaker]) -> None:
+    """The database limiter behaves the same, and limiters sharing a database share budgets."""
+    engine, _ = database
+    clock = Clock()
+    runner.run(_check_token_bucket(DatabaseRateLimiter(engine, clock), clock))
+    runner.run(_check_inexact_interval(DatabaseRateLimiter(engine, clock), clock))
+
+    async def run() -> None:
+        budget = Budget(1, 5.0)
+        first, second = DatabaseRateLimiter(engine, clock), DatabaseRateLimiter(engine, clock)
+        assert await first.acquire("shared", budget) == 0.0
+        assert await second.acquire("shared", budget) == 5.0
+
+    runner.run(run())
+
+
+def test_command_rate_limit(runner: asyncio.Runner, bot: CSSEBot) -> None:
+    """Commands over their budget respond with the cooldown, without running."""
+    guild = make_guild(bot)
+    runner.run(bot.create_or_update_studio(str(guild.id), 1, 2025, "repo"))
+    member = add_member(guild, ["Student"])
+    other = add_member(guild, ["Student"])
+
+    async def run() -> None:
+        await run_command(bot, guild, member, "gh get")
+        interaction = await run_command(bot, guild, member, "gh get")
+        assert interaction.command_failed
+        interaction = await run_command(bot, guild, other, "gh get")
+        assert not interaction.command_failed
+
+    runner.run(run())
+    assert isinstance(bot.rate_limiter, MemoryRateLimiter)
+    assert len(bot.rate_limiter) == 2
@@ -0,0 +1,52 @@
+"""Team, tutor and student membership checks through the guild role index."""
+
+import asyncio
+
+import discord
+
+from csse3200bot.bot import CSSEBot
+from csse3200bot.teams.utils import GuildRoleIndex
+from tests.fakes import add_member, make_guild
+
+
+def _member(guild: discord.Guild, role_names: list[str]) -> discord.Member:
+    member = guild.get_member(int(add_member(guild, role_names)["user"]["id"]))
+    assert member is not None
+    return member
+
+
+def test_role_index(bot: CSSEBot) -> None:
+    """Members are matched to their team, tutor and student roles, and team numbers come from the role name."""
+    guild = make_guild(bot, num_teams=3)
+    index = GuildRoleIndex(guild)
+    assert [role.name for role in index.team_roles] == ["Team 1", "Team 2", "Team 3"]
+    assert index.student_role is not None
+    assert index.student_role.name == "Student"
+    team_3 = index.get_team_role("Team 3")
+    assert team_3 is not None
+    assert team_3.name == "Team 3"
+    assert index.get_team_role("Team 4") is None
+
+    student = _member(guild, ["Student", "Team 2"])
+    tutor = _member(guild, ["All Tutors"])
+    assert index.get_member_team(student) == index.get_team_role("Team 2")
+    assert index.get_member_team_number(student) == 2
+    assert index.is_in_team(student)
+    assert index.is_student(student)
+    assert not index.is_tutor(student)
+
+    assert index.get_member_team(tutor) is None
+    assert index.get_member_team_number(tutor) is None
+    assert not index.is_in_team(tutor)
+    assert not index.is_student(tutor)
+    assert index.is_tutor(tutor)
+
+
+def test_role_index_is_rebuilt_when_roles_change(runner: asyncio.Runner, bot: CSSEBot) -> None:
+    """The bot keeps one index per guild until one of its roles changes."""
+    guild = make_guild(bot)
+    index = bot.get_role_index(guild)
+    assert bot.get_role_index(guild) is index
+
+    runner.run(bot.on_guild_role_update(guild.roles[1], guild.roles[1]))
+    assert bot.get_role_index(guild) is not index
@@ -0,0 +1,151 @@
+"""Roster imports, linking members to github users and teams in bulk."""
+
+import asyncio
+import io
+
+import discord
+import pytest
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+
+from csse3200bot.bot import CSSEBot
+from csse3200bot.gh.cog import GitHubCog
+from csse3200bot.gh.roster import RosterFormatError, parse_roster
+from csse3200bot.gh.service import create_or_update_user_model, get_user_models, save_user_links
+from csse3200bot.gh.views import RosterImportView
+from tests.fakes import FakeDiscordHTTP, FakeGithub, add_member, click, make_guild
+from tests.queries import assert_query_budget
+
+MEMBER_EDIT = "PATCH /guilds/{guild_id}/members/{user_id}"
+ORIGINAL_RESPONSE_EDIT = "PATCH /webhooks/{webhook_id}/{webhook_token}/messages/@original"
+
+
+def test_parse_roster() -> None:
+    """Rows are parsed with their line numbers, blank cells and rows are skipped, and the header is checked."""
+    roster = "Discord, GitHub ,notes\n123,octocat,hi\n\n,nobody,\nuser456,,\n"
+    assert list(parse_roster(io.StringIO(roster))) == [
+        {"line": 2, "discord": "123", "team": None, "github": "octocat"},
+        {"line": 5, "discord": "user456", "team": None, "github": None},
+    ]
+
+    with pytest.raises(RosterFormatError):
+        list(parse_roster(io.StringIO("discord,notes\n123,hi\n")))
+
+
+def test_import_roster(
+    runner: asyncio.Runner,
+    bot: CSSEBot,
+    github: FakeGithub,
+    discord_http: FakeDiscordHTTP,
+    database: tuple[AsyncEngine, async_sessionmaker],
+) -> None:
+    """The dry run lists the changes and bad rows, and importing links every account at once and assigns teams."""
+    _, sessionmaker = database
+    guild = make_guild(bot)
+    team_1 = next(role for role in guild.roles if role.name == "Team 1")
+    alice, carol, dave, eve, frank = (int(add_member(guild)["user"]["id"]) for _ in range(5))
+    bob = int(add_member(guild, ["Team 1"])["user"]["id"])
+    gh_ids = {
+        login: str(github.add_user(login).id) for login in ("alice-gh", "bob-gh", "carol-gh", "dave-gh", "new-gh")
+    }
+    cog = bot.get_cog("gh")
+    assert isinstance(cog, GitHubCog)
+
+    roster = "\n".join(
+        [
+            "discord,team,github",
+            f"{alice},2,Alice-GH",  # logins are case insensitive
+            f"user{bob},Team 1,bob-gh",  # already in the team
+            f"<@{carol}>,,new-gh",  # moves to a new account
+            f"{bob},3,",
+            "nobody,1,",
+            f"{eve},1,dave-gh",  # dave keeps their account
+            f"{frank},,carol-gh",  # free once carol moves
+            f"{frank},Team X,",
+        ]
+    )
+
+    async def run() -> None:
+        await cog._load_members()
+        async with sessionmaker() as session:
+            await create_or_update_user_model(session, str(carol), gh_ids["carol-gh"])
+            await create_or_update_user_model(session, str(dave), gh_ids["dave-gh"])
+
+        plan = await cog.plan_roster(guild, io.StringIO(roster))
+        assert [error.split(":")[0] for error in plan["errors"]] == ["Line 5", "Line 6", "Line 9", "Line 7"]
+        assert plan["unchanged"] == 0
+        changes = {change["member_id"]: change for change in plan["changes"]}
+        assert set(changes) == {alice, bob, carol, eve, frank}
+        assert changes[bob]["new_team_id"] is None
+        assert changes[eve]["new_team_id"] == team_1.id
+        assert changes[eve]["new_gh_id"] is None
+        assert changes[carol]["old_gh_id"] == gh_ids["carol-gh"]
+
+        result = await cog.apply_roster(guild, plan)
+        assert result == {"linked": 4, "assigned": 2, "failures": []}
+        assert discord_http.calls.total[MEMBER_EDIT] == 2
+
+        async with sessionmaker() as session:
+            models = await get_user_models(session, [str(user) for user in (alice, bob, carol, dave, frank)])
+        assert {model.discord_user_id: model.gh_id for model in models} == {
+            str(alice): gh_ids["alice-gh"],
+            str(bob): gh_ids["bob-gh"],
+            str(carol): gh_ids["new-gh"],
+            str(dave): gh_ids["dave-gh"],
+            str(frank): gh_ids["carol-gh"],
+        }
+
+    runner.run(run())
+
+
+def test_import_roster_swaps_accounts(
+    runner: asyncio.Runner, bot: CSSEBot, github: FakeGithub, database: tuple[AsyncEngine, async_sessionmaker]
+) -> None:
+    """Members can swap github accounts in one import."""
+    _, sessionmaker = database
+    guild = make_guild(bot)
+    first, second = (int(add_member(guild)["user"]["id"]) for _ in range(2))
+    first_gh, second_gh = (str(github.add_user(login).id) for login in ("first-gh", "second-gh"))
+    cog = bot.get_cog("gh")
+    assert isinstance(cog, GitHubCog)
+
+    async def run() -> None:
+        await cog._load_members()
+        async with sessionmaker() as session:
+            await create_or_update_user_model(session, str(first), first_gh)
+            await create_or_update_user_model(session, str(second), second_gh)
+            # the swap is written with two statements, however many members there are
+            with assert_query_budget(2):
+                await save_user_links(session, {str(first): second_gh, str(second): first_gh})
+            await save_user_links(session, {str(first): first_gh, str(second): second_gh})
+
+        plan = await cog.plan_roster(guild, io.StringIO(f"discord,github\n{first},second-gh\n{second},first-gh\n"))
+        assert plan["errors"] == []
+        await cog.apply_roster(guild, plan)
+
+        async with sessionmaker() as session:
+            models = await get_user_models(session, [str(first), str(second)])
+        assert {model.discord_user_id: model.gh_id for model in models} == {
+            str(first): second_gh,
+            str(second): first_gh,
+        }
+
+    runner.run(run())
+
+
+def test_failed_import_is_reported(runner: asyncio.Runner, bot: CSSEBot, discord_http: FakeDiscordHTTP) -> None:
+    """An import that fails replaces the 'Importing roster...' message rather than leaving it stuck."""
+    guild = make_guild(bot)
+    member = add_member(guild)
+    message_id = 1234
+
+    async def apply() -> discord.Embed:
+        raise RuntimeError
+
+    async def run() -> None:
+        view = RosterImportView([discord.Embed(title="Roster")], int(member["user"]["id"]), apply)
+        bot._connection.store_view(view, message_id)
+        assert view.confirm.custom_id is not None
+        await click(bot, guild, member, message_id, view.confirm.custom_id)
+
+    runner.run(run())
+    assert discord_http.calls.total[ORIGINAL_RESPONSE_EDIT] == 1
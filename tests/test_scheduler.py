@@ -0,0 +1,94 @@
+"""Periodic background jobs."""
+
+import asyncio
+
+from csse3200bot.utils.scheduler import Scheduler
+
+INTERVAL = 0.02
+
+
+def test_jobs_run_periodically(runner: asyncio.Runner) -> None:
+    """Jobs run every interval, failures are counted without stopping the job, and removed jobs stop."""
+    scheduler = Scheduler()
+    runs: list[str] = []
+
+    async def job() -> None:
+        runs.append("job")
+
+    async def failing_job() -> None:
+        raise RuntimeError("boom")
+
+    scheduler.add_job("job", job, INTERVAL, jitter=0, run_at_start=True)
+
+    async def run() -> None:
+        scheduler.start()
+        # added after starting
+        scheduler.add_job("failing", failing_job, INTERVAL, jitter=0)
+        await asyncio.sleep(INTERVAL * 3.5)
+        scheduler.remove_job("job")
+        runs_when_removed = len(runs)
+        await asyncio.sleep(INTERVAL * 2)
+        await scheduler.shutdown()
+        assert len(runs) == runs_when_removed
+
+    runner.run(run())
+    assert len(runs) >= 3
+    stats = scheduler.stats()
+    assert set(stats) == {"failing"}
+    assert stats["failing"].runs == stats["failing"].failures >= 2
+    assert stats["failing"].last_error == "RuntimeError('boom')"
+
+
+def test_runs_never_overlap(runner: asyncio.Runner) -> None:
+    """Ticks while the previous run is still going are skipped."""
+    scheduler = Scheduler()
+    running = 0
+    most_running = 0
+
+    async def slow_job() -> None:
+        nonlocal running, most_running
+        running += 1
+        most_running = max(most_running, running)
+        await asyncio.sleep(INTERVAL * 2.5)
+        running -= 1
+
+    scheduler.add_job("slow", slow_job, INTERVAL, jitter=0, run_at_start=True)
+
+    async def run() -> None:
+        scheduler.start()
+        await asyncio.sleep(INTERVAL * 5.5)
+        await scheduler.shutdown()
+
+    runner.run(run())
+    stats = scheduler.stats()["slow"]
+    assert most_running == 1
+    assert stats.runs >= 2
+    assert stats.skipped >= 2
+    assert stats.average_duration is not None
+    assert stats.average_duration >= INTERVAL * 2.5
+
+
+def test_shutdown_waits_for_runs_in_progress(runner: asyncio.Runner) -> None:
+    """Runs finishing in the grace period are waited for, the rest are cancelled."""
+    scheduler = Scheduler()
+    finished: list[str] = []
+
+    def sleeper(name: str, seconds: float):  # noqa: ANN202
+        async def job() -> None:
+            await asyncio.sleep(seconds)
+            finished.append(name)
+
+        return job
+
+    scheduler.add_job("quick", sleeper("quick", INTERVAL), 10, run_at_start=True)
+    scheduler.add_job("stuck", sleeper("stuck", 10), 10, run_at_start=True)
+
+    async def run() -> None:
+        scheduler.start()
+        await asyncio.sleep(0)
+        await scheduler.shutdown(INTERVAL * 3)
+        await asyncio.sleep(0)
+
+    runner.run(run())
+    assert finished == ["quick"]
+    assert scheduler.stats()["stuck"].runs == 1
@@ -0,0 +1,46 @@
+"""Splitting shards between processes, and reporting their health."""
+
+import asyncio
+import json
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import make_mocked_request
+
+from csse3200bot.bot import CSSEBot
+from csse3200bot.launcher import split_shards
+from csse3200bot.server import make_health_handler
+from tests.fakes import make_guild
+
+
+@pytest.mark.parametrize(
+    ("shard_count", "processes", "blocks"),
+    [
+        (10, 3, [[0, 1, 2, 3], [4, 5, 6], [7, 8, 9]]),
+        (4, 2, [[0, 1], [2, 3]]),
+        (2, 4, [[0], [1]]),
+        (1, 1, [[0]]),
+    ],
+)
+def test_split_shards(shard_count: int, processes: int, blocks: list[list[int]]) -> None:
+    """Contiguous blocks, the first ones taking the remainder, with no process left without shards."""
+    assert split_shards(shard_count, processes) == blocks
+
+
+def test_health_check(runner: asyncio.Runner, bot: CSSEBot) -> None:
+    """An unsharded bot reports as shard 0, and is unhealthy until it's connected."""
+    make_guild(bot)
+    make_guild(bot)
+    health = make_health_handler(bot)
+
+    async def check() -> web.StreamResponse:
+        return await health(make_mocked_request("GET", "/healthz"))
+
+    response = runner.run(check())
+    assert isinstance(response, web.Response)
+    assert response.status == 503
+    assert response.text is not None
+    assert json.loads(response.text) == {
+        "ready": False,
+        "shards": [{"shard_id": 0, "latency_ms": None, "closed": True, "guilds": 2}],
+    }
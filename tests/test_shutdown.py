@@ -0,0 +1,144 @@
+"""Shutting down without dropping commands."""
+
+import asyncio
+
+import discord
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+
+from csse3200bot.bot import CSSEBot
+from csse3200bot.gh.views import RosterImportView
+from csse3200bot.teams.service import get_sprint_feature
+from csse3200bot.utils import ShutdownCoordinator
+from tests.fakes import FakeDiscordHTTP, add_member, click, command_data, make_guild, make_interaction, run_command
+
+
+def test_shutdown_drains_commands(
+    runner: asyncio.Runner,
+    bot: CSSEBot,
+    discord_http: FakeDiscordHTTP,
+    database: tuple[AsyncEngine, async_sessionmaker],
+) -> None:
+    """Commands in progress finish before the hooks run, and commands sent once shutting down aren't run."""
+    _, sessionmaker = database
+    guild = make_guild(bot)
+    studio = runner.run(bot.create_or_update_studio(str(guild.id), 1, 2025, "repo"))
+    team_member = add_member(guild, ["Student", "Team 1"])
+    in_flight_at_hook: list[int] = []
+
+    async def hook() -> None:
+        in_flight_at_hook.append(bot.shutdown_coordinator.in_flight)
+
+    bot.shutdown_coordinator.add_hook("test", hook)
+    discord_http.latency = 0.05
+
+    async def sprint_set(sprint_number: int) -> None:
+        await run_command(
+            bot, guild, team_member, "team sprint_set", [("sprint_number", sprint_number), ("features", "x")]
+        )
+
+    async def run() -> None:
+        command = asyncio.create_task(sprint_set(1))
+        await asyncio.sleep(0.01)
+        assert bot.shutdown_coordinator.in_flight == 1
+
+        shutdown = asyncio.create_task(bot.shutdown(1.0))
+        await asyncio.sleep(0)
+        assert not bot.accepting_interactions
+        await sprint_set(2)
+        await shutdown
+        assert command.done()
+        assert in_flight_at_hook == [0]
+
+        async with sessionmaker() as session:
+            assert await get_sprint_feature(session, studio.studio_id, "Team 1", 1) is not None
+            assert await get_sprint_feature(session, studio.studio_id, "Team 1", 2) is None
+
+    runner.run(run())
+
+
+def test_autocompletes_are_answered_while_draining(runner: asyncio.Runner, bot: CSSEBot) -> None:
+    """Autocompletes get no choices rather than a message, which discord doesn't allow for them."""
+    guild = make_guild(bot)
+    member = add_member(guild, ["Student"])
+    data = command_data("team assign", [("team", "Te")])
+    data["options"][0]["options"][0]["focused"] = True
+    interaction = make_interaction(bot, guild, member, data)
+    interaction.type = discord.InteractionType.autocomplete
+
+    async def run() -> None:
+        await bot.shutdown_coordinator.shutdown(0)
+        await bot.tree._call(interaction)
+
+    runner.run(run())
+    assert interaction.response.type is discord.InteractionResponseType.autocomplete_result
+
+
+def test_shutdown_cancels_work_after_grace_period(runner: asyncio.Runner) -> None:
+    """Work that doesn't finish in the grace period is cancelled, and a failing hook doesn't stop the others."""
+    coordinator = ShutdownCoordinator()
+    hooks_run: list[str] = []
+
+    async def failing_hook() -> None:
+        raise RuntimeError
+
+    async def hook() -> None:
+        hooks_run.append("flush")
+
+    coordinator.add_hook("failing", failing_hook)
+    coordinator.add_hook("flush", hook)
+
+    async def stuck() -> None:
+        with coordinator.track():
+            await asyncio.sleep(10)
+
+    async def run() -> None:
+        task = asyncio.create_task(stuck())
+        await asyncio.sleep(0)
+        assert not await coordinator.shutdown(0.01)
+        await asyncio.sleep(0)
+        assert task.cancelled()
+        assert coordinator.in_flight == 0
+
+    runner.run(run())
+    assert hooks_run == ["flush"]
+
+
+def test_shutdown_drains_components(runner: asyncio.Runner, bot: CSSEBot) -> None:
+    """An import started from its button finishes before the hooks run, buttons are refused once shutting down."""
+    guild = make_guild(bot)
+    member = add_member(guild)
+    imports: list[str] = []
+    in_flight_at_hook: list[int] = []
+
+    async def apply() -> discord.Embed:
+        await asyncio.sleep(0.05)
+        imports.append("imported")
+        return discord.Embed(title="Imported")
+
+    async def hook() -> None:
+        in_flight_at_hook.append(bot.shutdown_coordinator.in_flight)
+
+    bot.shutdown_coordinator.add_hook("test", hook)
+
+    def view(message_id: int) -> RosterImportView:
+        import_view = RosterImportView([discord.Embed(title="Roster")], int(member["user"]["id"]), apply)
+        bot._connection.store_view(import_view, message_id)
+        return import_view
+
+    async def run() -> None:
+        first, second = view(1), view(2)
+        assert first.confirm.custom_id is not None
+        assert second.confirm.custom_id is not None
+        clicked = asyncio.create_task(click(bot, guild, member, 1, first.confirm.custom_id))
+        await asyncio.sleep(0.01)
+        assert bot.shutdown_coordinator.in_flight == 1
+
+        shutdown = asyncio.create_task(bot.shutdown(1.0))
+        await asyncio.sleep(0)
+        interaction = await click(bot, guild, member, 2, second.confirm.custom_id)
+        assert interaction.response.type is discord.InteractionResponseType.channel_message
+        await asyncio.gather(clicked, shutdown)
+
+    runner.run(run())
+    assert imports == ["imported"]
+    assert in_flight_at_hook == [0]
@@ -0,0 +1,69 @@
+"""Sprint reports, rendered as pages of embeds within discord's limits."""
+
+import asyncio
+
+from csse3200bot.bot import CSSEBot
+from csse3200bot.teams.models import TeamSprintModel
+from csse3200bot.teams.report import render_sprint_report
+from csse3200bot.teams.views import PaginatorView
+from tests.fakes import add_member, click, make_guild
+
+EMBED_LIMIT = 6000
+FIELD_LIMIT = 25
+FIELD_VALUE_LIMIT = 1024
+
+
+def _features(teams: int, description: str) -> list[TeamSprintModel]:
+    return [
+        TeamSprintModel(team_number=f"Team {team}", sprint_number=1, description=description)
+        for team in range(1, teams + 1)
+    ]
+
+
+def test_short_report_is_one_page() -> None:
+    """A field per team, without page numbers."""
+    pages = render_sprint_report(1, _features(3, "Add the player"))
+    assert len(pages) == 1
+    assert [field.name for field in pages[0].fields] == ["Team 1", "Team 2", "Team 3"]
+    assert pages[0].footer.text is None
+
+
+def test_long_report_is_split_within_limits() -> None:
+    """Long descriptions are split over fields, and fields over numbered pages, losing nothing."""
+    description = "word " * 500
+    pages = render_sprint_report(1, _features(8, description))
+    assert len(pages) > 1
+    for page in pages:
+        assert len(page) <= EMBED_LIMIT
+        assert len(page.fields) <= FIELD_LIMIT
+        assert all(len(field.value or "") <= FIELD_VALUE_LIMIT for field in page.fields)
+    assert [page.footer.text for page in pages] == [f"Page {i}/{len(pages)}" for i in range(1, len(pages) + 1)]
+
+    fields = [field for page in pages for field in page.fields]
+    assert {field.name for field in fields if not (field.name or "").endswith("(cont.)")} == {
+        f"Team {team}" for team in range(1, 9)
+    }
+    team_1 = "".join(
+        field.value or "" for field in fields if (field.name or "").startswith("Team 1 ") or field.name == "Team 1"
+    )
+    assert team_1.split() == description.split()
+
+
+def test_paginator(runner: asyncio.Runner, bot: CSSEBot) -> None:
+    """The buttons move between pages, and are disabled at either end."""
+    guild = make_guild(bot)
+    member = add_member(guild)
+    pages = render_sprint_report(1, _features(8, "word " * 500))
+    message_id = 1234
+
+    async def run() -> PaginatorView:
+        view = PaginatorView(pages)
+        bot._connection.store_view(view, message_id)
+        assert view.previous_page.disabled
+        assert view.next_page.custom_id is not None
+        await click(bot, guild, member, message_id, view.next_page.custom_id)
+        return view
+
+    view = runner.run(run())
+    assert not view.previous_page.disabled
+    assert view.page_counter.label == f"2/{len(pages)}"
@@ -0,0 +1,56 @@
+"""The studio setup wizard, served by persistent views with its answers in the database."""
+
+import asyncio
+from datetime import UTC, datetime
+
+from csse3200bot.bot import CSSEBot
+from csse3200bot.studio.cog import StudioCog
+from tests.fakes import FakeGithub, add_member, click, make_guild, next_snowflake
+
+
+def test_setup_wizard_survives_restart(runner: asyncio.Runner, bot: CSSEBot, github: FakeGithub) -> None:
+    """A wizard started before the cog is reloaded is finished after, by the same few persistent views."""
+    github.add_commit("studio-repo", "Initial commit", datetime.now(UTC))
+    guild = make_guild(bot)
+    staff = add_member(guild, ["Tutor"])
+    guild.owner_id = int(staff["user"]["id"])
+    message_id = next_snowflake()
+    persistent = len(bot.persistent_views)
+
+    async def run() -> None:
+        await click(bot, guild, staff, message_id, "studio_setup:start")
+        await click(bot, guild, staff, message_id, "studio_setup:studio_number", ["3"])
+
+        # a restart, nothing about the wizard is kept in memory
+        await bot.remove_cog("studio")
+        await bot.add_cog(StudioCog(bot))
+        assert len(bot.persistent_views) == persistent
+
+        await click(bot, guild, staff, message_id, "studio_setup:studio_year", ["2025"])
+        await click(bot, guild, staff, message_id, "studio_setup:repo_name", ["studio-repo"])
+        await click(bot, guild, staff, message_id, "studio_setup:confirm")
+
+        studio = await bot.get_studio(guild)
+        assert studio is not None
+        assert (studio.studio_number, studio.studio_year, studio.repo_name) == (3, 2025, "studio-repo")
+
+        # the wizard is forgotten once finished
+        interaction = await click(bot, guild, staff, message_id, "studio_setup:confirm")
+        assert interaction.response.is_done()
+        assert await bot.get_studio(guild) == studio
+
+    runner.run(run())
+
+
+def test_setup_wizard_needs_manage_guild(runner: asyncio.Runner, bot: CSSEBot) -> None:
+    """Members without 'Manage Server' can't answer."""
+    guild = make_guild(bot)
+    student = add_member(guild, ["Student"])
+    message_id = next_snowflake()
+
+    async def run() -> None:
+        await click(bot, guild, student, message_id, "studio_setup:start")
+        await click(bot, guild, student, message_id, "studio_setup:studio_number", ["3"])
+
+    runner.run(run())
+    assert runner.run(bot.get_studio(guild)) is None
@@ -0,0 +1,111 @@
+"""Team contribution stats, fetched incrementally from the fake github and joined against linked users."""
+
+import asyncio
+from datetime import UTC, date, datetime, timedelta
+
+import discord
+
+from csse3200bot.bot import CSSEBot
+from csse3200bot.gh.service import create_or_update_user_model
+from csse3200bot.teams.cog import TeamsCog
+from csse3200bot.teams.service import get_contributor_totals, save_contribution_weeks
+from csse3200bot.teams.stats import NO_TEAM, UNLINKED_TEAM, ContributionWeek
+from tests.fakes import FakeGithub, FakeNamedUser, add_member, make_guild, run_command
+from tests.queries import assert_query_budget
+
+SPRINT_1 = date(2025, 8, 4)  # a monday, like github's weeks (which start on sunday) are a day before
+SPRINT_2 = date(2025, 8, 25)
+
+
+def _week(day: date) -> datetime:
+    return datetime.combine(day, datetime.min.time(), UTC) - timedelta(days=1)
+
+
+def _link(runner: asyncio.Runner, bot: CSSEBot, member: dict, user: FakeNamedUser) -> None:
+    async def link() -> None:
+        async with bot.get_db() as session:
+            await create_or_update_user_model(session, member["user"]["id"], str(user.id))
+
+    runner.run(link())
+
+
+def test_refresh_only_fetches_new_contributions(runner: asyncio.Runner, bot: CSSEBot, github: FakeGithub) -> None:
+    """Unchanged stats respond 304, and pull requests are fetched from the newest already fetched."""
+    cog = bot.get_cog("team")
+    assert isinstance(cog, TeamsCog)
+    student = github.add_user("student")
+    github.add_contributions("repo", student, _week(SPRINT_1), 3)
+    github.add_pull_request("repo", student, _week(SPRINT_1) + timedelta(days=2))
+
+    assert runner.run(cog.refresh_stats("repo"))
+    github.calls.total.clear()
+    assert not runner.run(cog.refresh_stats("repo"))
+    assert github.calls.total["not_modified"] == 1
+
+    merged = _week(SPRINT_1) + timedelta(days=3)
+    github.pulls["repo"][0] |= {"merged_at": merged.isoformat(), "updated_at": merged.isoformat()}
+    assert runner.run(cog.refresh_stats("repo"))
+    assert not runner.run(cog.refresh_stats("repo", max_age=timedelta(hours=1)))
+
+
+def test_team_stats(runner: asyncio.Runner, bot: CSSEBot, github: FakeGithub) -> None:
+    """`/team stats` sums contributions by team in the sprint, then is served from the cache."""
+    bot._sprint_starts = [SPRINT_1, SPRINT_2]
+    guild = make_guild(bot)
+    runner.run(bot.create_or_update_studio(str(guild.id), 1, 2025, "repo"))
+    staff = add_member(guild, ["Tutor"]) | {"permissions": str(discord.Permissions(manage_guild=True).value)}
+
+    team_1 = [add_member(guild, ["Student", "Team 1"]) for _ in range(2)]
+    teamless = add_member(guild, ["Student"])
+    users = [github.add_user(f"student{i}") for i in range(4)]
+    for member, user in zip([*team_1, teamless], users, strict=False):
+        _link(runner, bot, member, user)
+    for user in users:
+        github.add_contributions("repo", user, _week(SPRINT_1), 2)
+        github.add_contributions("repo", user, _week(SPRINT_2), 5)  # not in sprint 1
+    github.add_pull_request("repo", users[0], _week(SPRINT_1) + timedelta(days=2), _week(SPRINT_1) + timedelta(days=3))
+
+    cog = bot.get_cog("team")
+    assert isinstance(cog, TeamsCog)
+
+    async def run() -> None:
+        interaction = await run_command(bot, guild, staff, "team stats", [("sprint_number", 1)])
+        assert not interaction.command_failed
+        embed = await cog._stats_cache.get(("repo", guild.id, 1))
+        assert embed is not None
+        assert embed.description is not None
+        lines = embed.description.splitlines()[2:-1]
+        assert lines[0].split() == ["Team", "1", "4", "1", "(1)", "+40/-8"]
+        assert sorted(line.split("  ")[0] for line in lines[1:]) == [NO_TEAM, UNLINKED_TEAM]
+
+        github.calls.total.clear()
+        with assert_query_budget(0):
+            await run_command(bot, guild, staff, "team stats", [("sprint_number", 1)])
+        assert github.calls.total.total() == 0
+
+        interaction = await run_command(bot, guild, staff, "team stats", [("sprint_number", 3)])
+        assert not interaction.command_failed
+        assert ("repo", guild.id, 3) not in cog._stats_cache
+
+    runner.run(run())
+
+
+def test_past_weeks_are_updated(runner: asyncio.Runner, bot: CSSEBot) -> None:
+    """An older week re-bucketed by github (e.g. once a long lived branch is merged) is saved again."""
+    student = "1"
+    weeks: list[ContributionWeek] = [
+        {"repo_name": "repo", "gh_id": student, "week_start": _week(day), "commits": 1, "additions": 10, "deletions": 2}
+        for day in (SPRINT_1, SPRINT_2)
+    ]
+
+    async def run() -> None:
+        async with bot.get_db() as session:
+            assert await save_contribution_weeks(session, "repo", weeks) == 2
+            assert await save_contribution_weeks(session, "repo", weeks) == 0
+
+            merged: list[ContributionWeek] = [{**weeks[0], "commits": 4, "additions": 40}, weeks[1]]
+            assert await save_contribution_weeks(session, "repo", merged) == 1
+            totals = await get_contributor_totals(session, "repo", None, None)
+        assert [(total["commits"], total["additions"]) for total in totals] == [(5, 50)]
+
+    runner.run(run())
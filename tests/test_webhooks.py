@@ -0,0 +1,54 @@
+"""GitHub webhooks, replayed from the recorded deliveries in tests/data/webhooks."""
+
+import asyncio
+from pathlib import Path
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from csse3200bot.bot import CSSEBot
+from csse3200bot.gh.cog import GitHubCog
+from csse3200bot.gh.webhooks import make_webhook_handler
+from tests.fakes import FakeGithub, add_member, make_guild, run_command
+from tests.replay_webhooks import replay
+
+DELIVERIES = sorted((Path(__file__).parent / "data" / "webhooks").glob("*.json"))
+SECRET = "test-secret"  # noqa: S105
+
+
+async def _replay(cog: GitHubCog, secret: str) -> int:
+    app = web.Application()
+    app.router.add_post("/github/webhook", make_webhook_handler(SECRET, cog.handle_webhook))
+    server = TestServer(app)
+    await server.start_server()
+    try:
+        return await replay(str(server.make_url("/github/webhook")), secret, DELIVERIES, 0)
+    finally:
+        await server.close()
+
+
+def test_bad_signatures_are_rejected(runner: asyncio.Runner, bot: CSSEBot) -> None:
+    """Deliveries signed with the wrong secret don't touch the repo's state."""
+    cog: GitHubCog = bot.get_cog("gh")  # type: ignore[assignment]
+    assert runner.run(_replay(cog, "wrong-secret")) == len(DELIVERIES)
+    assert runner.run(cog._repo_state_cache.refresh("repo")) is None
+
+
+def test_repo_info_served_from_webhooks(runner: asyncio.Runner, bot: CSSEBot, github: FakeGithub) -> None:
+    """Once deliveries have been received for a repo, `/gh repo_info` doesn't call github."""
+    cog: GitHubCog = bot.get_cog("gh")  # type: ignore[assignment]
+    guild = make_guild(bot)
+    runner.run(bot.create_or_update_studio(str(guild.id), 1, 2025, "repo"))
+    member = add_member(guild, ["Student"])
+
+    assert runner.run(_replay(cog, SECRET)) == 0
+    state = runner.run(cog._repo_state_cache.refresh("repo"))
+    assert state is not None
+    # from the last delivery
+    assert state.open_issues_count == 9
+    assert state.stargazers_count == 6
+
+    github.calls.total.clear()
+    interaction = runner.run(run_command(bot, guild, member, "gh repo_info"))
+    assert not interaction.command_failed
+    assert github.calls.total.total() == 0
@@ -0,0 +1,99 @@
+"""Latency measurement helpers shared by the benchmarks and the load test."""
+
+import asyncio
+import math
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Any
+
+
+def percentile(samples: Sequence[float], pct: float) -> float:
+    """Nearest rank percentile of the samples."""
+    if not samples:
+        return math.nan
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+@dataclass
+class Timings:
+    """Latencies (seconds) of a batch of calls."""
+
+    name: str
+    concurrency: int = 1
+    latencies: list[float] = field(default_factory=list)
+    elapsed: float = 0.0  # wall clock time of the whole batch
+
+    @property
+    def throughput(self) -> float:
+        """Calls per second."""
+        return len(self.latencies) / self.elapsed if self.elapsed else math.nan
+
+    @property
+    def p50(self) -> float:
+        """Median latency."""
+        return percentile(self.latencies, 50)
+
+    @property
+    def p99(self) -> float:
+        """99th percentile latency."""
+        return percentile(self.latencies, 99)
+
+    def summary(self) -> dict[str, Any]:
+        """JSON friendly summary, latencies in milliseconds."""
+        return {
+            "name": self.name,
+            "calls": len(self.latencies),
+            "concurrency": self.concurrency,
+            "throughput": round(self.throughput, 1),
+            "p50_ms": round(self.p50 * 1000, 3),
+            "p99_ms": round(self.p99 * 1000, 3),
+            "max_ms": round(max(self.latencies, default=math.nan) * 1000, 3),
+        }
+
+
+async def measure(
+    name: str,
+    func: Callable[[int], Awaitable[object]],
+    iterations: int,
+    concurrency: int = 1,
+) -> Timings:
+    """Call `func` (with the call number) `iterations` times, with up to `concurrency` calls in flight."""
+    timings = Timings(name, concurrency)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def timed(i: int) -> None:
+        async with semaphore:
+            start = perf_counter()
+            await func(i)
+            timings.latencies.append(perf_counter() - start)
+
+    start = perf_counter()
+    await asyncio.gather(*(timed(i) for i in range(iterations)))
+    timings.elapsed = perf_counter() - start
+    return timings
+
+
+def measure_sync(name: str, func: Callable[[int], object], iterations: int) -> Timings:
+    """Call the synchronous `func` (with the call number) `iterations` times."""
+    timings = Timings(name)
+    start = perf_counter()
+    for i in range(iterations):
+        call_start = perf_counter()
+        func(i)
+        timings.latencies.append(perf_counter() - call_start)
+    timings.elapsed = perf_counter() - start
+    return timings
+
+
+def format_table(rows: Sequence[dict[str, Any]]) -> list[str]:
+    """Format timing summaries as aligned lines."""
+    if not rows:
+        return []
+    columns = list(rows[0].keys())
+    widths = {column: max(len(column), *(len(str(row[column])) for row in rows)) for column in columns}
+    lines = ["  ".join(column.ljust(widths[column]) for column in columns)]
+    lines.extend("  ".join(str(row[column]).ljust(widths[column]) for column in columns) for row in rows)
+    return lines